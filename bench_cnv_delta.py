@@ -0,0 +1,162 @@
+# Delta sync against a stand-in source simulating SCN-tagged changes, into a sqlite target
+# python bench_cnv_delta.py --tables 20 --rows 10000 --rounds 5 --changes 0.001 --latency 0.5
+
+import argparse
+import datetime
+import os
+import random
+import re
+import sqlite3
+import tempfile
+import time
+
+from bench_cnv_schema import OWNER, Fake_Server, Fake_Connection, Fake_Pool
+from cnv_oracle_schema import Oracle_Catalog, Oracle_Source, Delta_State, Load_Target
+
+COLUMNS = [ ('C001', 'NUMBER', 22, 10, 0), ('C002', 'VARCHAR2', 30, None, None), ('C003', 'NUMBER', 22, 12, 2), ('C004', 'DATE', 7, None, None) ]
+EPOCH = datetime.datetime(2024, 1, 1)
+
+def make_catalog(args):
+    """ Raw rows of the Oracle_Catalog bulk queries for args.tables tables D0000.. of COLUMNS, primary key C001 """
+    raw = { name: [] for name in Oracle_Catalog.BULK_QUERIES }
+    for number in range(args.tables):
+        TABLE_NAME = 'D%04d' % number
+        for COLUMN_ID, (COLUMN_NAME, DATA_TYPE, DATA_LENGTH, DATA_PRECISION, DATA_SCALE) in enumerate(COLUMNS, 1):
+            raw['TAB_COLS'].append((TABLE_NAME, COLUMN_ID, COLUMN_NAME, DATA_TYPE, DATA_LENGTH, DATA_PRECISION, DATA_SCALE,
+                                    'N' if COLUMN_ID == 1 else 'Y', 'NO', None, None, None, DATA_LENGTH, 'NO', 'YES'))
+        raw['TABLES'].append((OWNER, TABLE_NAME, 'USERS', 'VALID', 64, 64, 'NO', 'NO', 40))
+        raw['TABLE_SIZES'].append((TABLE_NAME, args.rows, 40, args.rows * 40 / 1024, 1))
+        raw['CONSTRAINTS'].append((TABLE_NAME, 'PK_%s' % TABLE_NAME, 'P', None, None, None))
+        raw['CONS_COLUMNS'].append(('PK_%s' % TABLE_NAME, TABLE_NAME, 'C001'))
+    return raw
+
+
+class Scn_Server(Fake_Server):
+    """ Fake_Server holding the rows of the tables as UNL text, every change commits at a new SCN.
+        ORA_ROWSCN is kept per block of rows_per_block rows like a table without ROWDEPENDENCIES,
+        C004 is the last-modified date of the row """
+    def __init__(self, raw, args):
+        super().__init__(raw, {}, args.latency / 1000.0)
+        self.rnd = random.Random(args.seed)
+        self.rows_per_block = args.rows_per_block
+        self.scn = 1000
+        self.tables = {}
+        for OWNER, TABLE_NAME, *_ in raw['TABLES']:
+            self.tables[TABLE_NAME] = { 'rows': [ self.make_row(key) for key in range(args.rows) ], 'blocks': [] }
+            self.tables[TABLE_NAME]['blocks'] = [ self.scn ] * (args.rows // self.rows_per_block + 1)
+        self.rows_read = 0
+
+    def make_row(self, key):
+        return (str(key), 'row %d at %d' % (key, self.scn), '%d.%02d' % (self.rnd.randrange(10 ** 6), self.rnd.randrange(100)),
+                (EPOCH + datetime.timedelta(seconds=self.scn)).strftime('%Y-%m-%d %H:%M:%S'))
+
+    def change(self, share):
+        """ Update share of the rows and insert half as many, each in its own transaction, returns the number of changes """
+        changes = 0
+        for table in self.tables.values():
+            rows, blocks = table['rows'], table['blocks']
+            for position in self.rnd.sample(range(len(rows)), int(len(rows) * share)):
+                self.scn += 1
+                rows[position] = self.make_row(int(rows[position][0]))
+                blocks[position // self.rows_per_block] = self.scn
+                changes += 1
+            for insert in range(int(len(rows) * share / 2)):
+                self.scn += 1
+                rows.append(self.make_row(len(rows)))
+                if len(rows) > len(blocks) * self.rows_per_block:
+                    blocks.append(self.scn)
+                blocks[(len(rows) - 1) // self.rows_per_block] = self.scn
+                changes += 1
+        return changes
+
+    def answer(self, statement, binds):
+        source, kind = self.statements.get(statement, (None, None))
+        if kind == 'current_scn':
+            return [ (str(self.scn),) ]
+        match = re.match(r'\s*SELECT (.*) FROM "%s"\."(\w+)"(?: WHERE (.*?))?\s*$' % OWNER, statement, re.S)
+        if source is not None or match is None:
+            return super().answer(statement, binds)
+        with self.lock:
+            self.executes += 1
+        expressions, TABLE_NAME, where = match.groups()
+        table = self.tables[TABLE_NAME]
+        if expressions.startswith('TO_CHAR(MAX('):
+            return [ (max(row[3] for row in table['rows']) if table['rows'] else None,) ]
+        rows = table['rows']
+        if where is not None and where.startswith('ORA_ROWSCN'):
+            rows = [ row for position, row in enumerate(rows) if table['blocks'][position // self.rows_per_block] > int(binds['watermark']) ]
+        elif where is not None and where.startswith('"C004"'):
+            rows = [ row for row in rows if row[3] >= binds['watermark'] ]
+        with self.lock:
+            self.rows_read += len(rows)
+        return rows
+
+
+def target_rows(target_file, table):
+    with sqlite3.connect(target_file) as conn:
+        return sorted(conn.execute("SELECT c001, c002, c003, c004 FROM %s" % table.lower()))
+
+def check(server, target_file):
+    """ Tables whose target rows differ from the source """
+    return [ TABLE_NAME for TABLE_NAME, table in server.tables.items() if target_rows(target_file, TABLE_NAME) != sorted(table['rows']) ]
+
+def main(args):
+    server = Scn_Server(make_catalog(args), args)
+    oracle = Oracle_Source()
+    oracle.conn = Fake_Connection(server)
+    if args.workers > 1:
+        oracle.pool, oracle.workers = Fake_Pool(server), args.workers
+    oracle.delta_columns = { (None, 'D%04d' % number): 'C004' for number in range(0, args.tables, 2) } if args.last_modified else {}
+    options = { 'delimiter': '|', 'escape': '\\', 'max_bytes': None, 'arraysize': 10000, 'lob_inline': 8192, 'lob_readers': 1,
+                'lob_chunk': 1024 * 1024, 'batch_size': 1000, 'commit_rows': 10000, 'queue_size': 4 }
+    failed = False
+
+    with tempfile.TemporaryDirectory() as work_dir, Delta_State(os.path.join(work_dir, 'delta.db')) as state:
+        target_file = os.path.join(work_dir, 'target.db')
+        with sqlite3.connect(target_file) as conn:
+            for TABLE_NAME in server.tables:
+                conn.execute("CREATE TABLE %s (c001 TEXT PRIMARY KEY, c002 TEXT, c003 TEXT, c004 TEXT)" % TABLE_NAME.lower())
+        target = Load_Target('sqlite3:%s' % target_file, '%(table)s')
+
+        oracle.delta_user_data(OWNER, state, None, target, options)
+        server.change(args.changes)
+        started = time.perf_counter()
+        rows = oracle.load_user_data(OWNER, target, options)
+        full_seconds = time.perf_counter() - started
+        print("full load  %8.3f s  %8d rows" % (full_seconds, rows))
+
+        for number in range(1, args.rounds + 1):
+            changes = server.change(args.changes)
+            server.rows_read = 0
+            started = time.perf_counter()
+            oracle.delta_user_data(OWNER, state, None, target, options)
+            seconds = time.perf_counter() - started
+            mismatched = check(server, target_file)
+            failed = failed or bool(mismatched)
+            print("delta %-4d %8.3f s  %8d changes  %8d rows read  %5.1fx faster  %s" %
+                  (number, seconds, changes, server.rows_read, full_seconds / seconds, 'MISMATCH %s' % ', '.join(mismatched) if mismatched else 'target in sync'))
+
+        changes = server.change(args.changes)
+        server.rows_read = 0
+        run_dir = oracle.delta_user_data(OWNER, state, work_dir, None, options)
+        with open(os.path.join(run_dir, 'upsert.sql'), encoding='utf-8') as upsert_file:
+            merges = sum( line.startswith('MERGE INTO') for line in upsert_file )
+        unl_rows = sum( sum(1 for line in open(os.path.join(run_dir, file_name), encoding='utf-8'))
+                        for file_name in os.listdir(run_dir) if file_name.endswith('.unl') )
+        failed = failed or merges != args.tables or unl_rows != server.rows_read
+        print("delta files %d changes, %d UNL rows, %d MERGE statements in upsert.sql" % (changes, unl_rows, merges))
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tables', type=int, default=20, help=' : Tables of the source')
+    parser.add_argument('--rows', type=int, default=10000, help=' : Rows per table')
+    parser.add_argument('--rows-per-block', type=int, default=50, help=' : Rows sharing one ORA_ROWSCN')
+    parser.add_argument('--rounds', type=int, default=5, help=' : Rounds of changes followed by a delta')
+    parser.add_argument('--changes', type=float, default=0.001, help=' : Share of the rows updated in a round, half as many are inserted')
+    parser.add_argument('--last-modified', action='store_true', help=' : Half of the tables use the C004 date column instead of ORA_ROWSCN')
+    parser.add_argument('--latency', type=float, default=0.0, help=' : Milliseconds of every round trip')
+    parser.add_argument('--workers', type=int, default=1, help=' : Sessions of delta and load')
+    parser.add_argument('--seed', type=int, default=1)
+    main(parser.parse_args())
@@ -0,0 +1,302 @@
+# Benchmark of make_user_schema on a synthetic catalog served by an in-process fake connection
+# python bench_cnv_schema.py --tables 10000 --columns 50 --indexes 5 --latency 0.5 --output bench.json --baseline bench_base.json
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from bench_cnv_types import make_columns
+from cnv_oracle_schema import Oracle_Catalog, Oracle_Source, Ddl_Writer, Run_Metrics
+
+OWNER = 'BENCH'
+
+def make_catalog(args):
+    """ Raw rows of every Oracle_Catalog bulk query for the synthetic owner ( without the CATALOG_OWNER column ),
+        and the key histograms of the RANGE partitioned tables by (TABLE_NAME, COLUMN_NAME) """
+    rnd = random.Random(args.seed)
+    raw = { name: [] for name in Oracle_Catalog.BULK_QUERIES }
+    histograms = {}
+    columns = make_columns(args.tables * (args.columns - 1), args.distinct, args.seed)
+
+    for number in range(args.tables):
+        TABLE_NAME = 'T%06d' % number
+        table_columns = [ ('NUMBER', 22, 10, 0, None, 22) ] + columns[number * (args.columns - 1):(number + 1) * (args.columns - 1)]
+        partitioned = rnd.random() < args.partitioned
+        AVG_ROW_LEN = 0
+        for COLUMN_ID, (DATA_TYPE, DATA_LENGTH, DATA_PRECISION, DATA_SCALE, AVG_COL_LEN, CHAR_LENGTH) in enumerate(table_columns, 1):
+            AVG_ROW_LEN += AVG_COL_LEN or min(DATA_LENGTH, 20)
+            raw['TAB_COLS'].append((TABLE_NAME, COLUMN_ID, 'C%03d' % COLUMN_ID, DATA_TYPE, DATA_LENGTH, DATA_PRECISION, DATA_SCALE,
+                                    'N' if COLUMN_ID == 1 else 'Y', 'NO', None, None, AVG_COL_LEN, CHAR_LENGTH, 'NO', 'YES'))
+        NUM_ROWS = rnd.randint(0, 10 ** 7)
+        raw['TABLES'].append((OWNER, TABLE_NAME, 'USERS', 'VALID', 64, 64, 'YES' if partitioned else 'NO', 'NO', AVG_ROW_LEN))
+        raw['TABLE_SIZES'].append((TABLE_NAME, NUM_ROWS, AVG_ROW_LEN, NUM_ROWS * AVG_ROW_LEN * 1.2 / 1024, args.partitions if partitioned else 1))
+
+        constraints = [ ('PK_%s' % TABLE_NAME, 'P', None, None, None, [ 'C001' ]),
+                        ('SYS_C%06d' % number, 'C', '"C001" IS NOT NULL', None, None, [ 'C001' ]),
+                        ('CK_%s' % TABLE_NAME, 'C', 'C001 > 0', None, None, [ 'C001' ]) ]
+        if number > 0 and rnd.random() < args.foreign_keys:
+            constraints.append(('FK_%s' % TABLE_NAME, 'R', None, OWNER, 'PK_T%06d' % rnd.randrange(number), [ 'C001' ]))
+        for CONSTRAINT_NAME, CONSTRAINT_TYPE, SEARCH_CONDITION, R_OWNER, R_CONSTRAINT_NAME, COLUMNS in constraints:
+            raw['CONSTRAINTS'].append((TABLE_NAME, CONSTRAINT_NAME, CONSTRAINT_TYPE, SEARCH_CONDITION, R_OWNER, R_CONSTRAINT_NAME))
+            raw['CONS_COLUMNS'] += [ (CONSTRAINT_NAME, TABLE_NAME, COLUMN_NAME) for COLUMN_NAME in COLUMNS ]
+
+        for index in range(args.indexes):
+            INDEX_NAME = 'IX_%s_%d' % (TABLE_NAME, index)
+            local = partitioned and index == 0
+            raw['INDEXES'].append((TABLE_NAME, INDEX_NAME, 'INDX', 'YES' if local else 'NO', 'UNIQUE' if index == 0 else ' '))
+            raw['INDEX_SIZES'].append((INDEX_NAME, TABLE_NAME, 'INDX', NUM_ROWS * 0.03))
+            for COLUMN_NAME in [ 'C001' ] if index == 0 else rnd.sample([ 'C%03d' % COLUMN_ID for COLUMN_ID in range(2, len(table_columns) + 1) ], min(3, len(table_columns) - 1)):
+                raw['IND_COLUMNS'].append((INDEX_NAME, TABLE_NAME, COLUMN_NAME, 'DESC' if rnd.random() < 0.1 else 'ASC'))
+            if index > 0 and rnd.random() < args.function_indexes:
+                COLUMN_NAME = 'SYS_NC%05d$' % index
+                raw['TAB_COLS'].append((TABLE_NAME, len(table_columns) + index, COLUMN_NAME, 'VARCHAR2', 100, None, None,
+                                        'Y', 'NO', 20, 'UPPER("C002")', None, 100, 'NO', 'NO'))
+                raw['IND_COLUMNS'].append((INDEX_NAME, TABLE_NAME, COLUMN_NAME, 'ASC'))
+            if local:
+                raw['PART_KEY_COLUMNS'].append(('INDEX', INDEX_NAME, 'C001'))
+                raw['PART_INDEXES'].append((INDEX_NAME, 'RANGE', args.partitions))
+                raw['IND_PARTITIONS'] += [ (INDEX_NAME, 'P%03d' % partition, 'INDX', str((partition + 1) * 1000)) for partition in range(args.partitions) ]
+
+        if partitioned:
+            PARTITIONING_TYPE = 'LIST' if number % 2 else 'RANGE'
+            raw['PART_KEY_COLUMNS'].append(('TABLE', TABLE_NAME, 'C001'))
+            raw['PART_TABLES'].append((TABLE_NAME, PARTITIONING_TYPE, args.partitions))
+            for partition in range(args.partitions):
+                HIGH_VALUE = "%d, %d" % (partition * 2, partition * 2 + 1) if PARTITIONING_TYPE == 'LIST' else str((partition + 1) * 1000)
+                raw['TAB_PARTITIONS'].append((TABLE_NAME, 'P%03d' % partition, 'TS%d' % (partition % 8), HIGH_VALUE))
+            if PARTITIONING_TYPE == 'RANGE':
+                histograms[(TABLE_NAME, 'C001')] = [ ('HYBRID', 'NUMBER', (bucket + 1) * 100, float(bucket * 1000 // 254), None)
+                                                    for bucket in range(254) ]
+                raw['KEY_HISTOGRAMS'] += [ (TABLE_NAME, 'C001') + row for row in histograms[(TABLE_NAME, 'C001')] ]
+
+    body = [ "    v_total := v_total + %d; -- line %d\n" % (line, line) for line in range(args.procedure_lines) ]
+    for number in range(args.procedures):
+        NAME = 'P_%05d' % number
+        if number % 4:
+            sources = [ ('PROCEDURE', [ "PROCEDURE %s IS\n" % NAME, "    v_total NUMBER := 0;\n", "BEGIN\n" ] + body + [ "END;\n" ]) ]
+        else:
+            sources = [ ('PACKAGE', [ "PACKAGE %s IS\n" % NAME, "    PROCEDURE RUN;\n", "END;\n" ]),
+                        ('PACKAGE BODY', [ "PACKAGE BODY %s IS\n" % NAME, "PROCEDURE RUN IS\n", "    v_total NUMBER := 0;\n", "BEGIN\n" ] + body + [ "END;\nEND;\n" ]) ]
+        raw['PROCEDURES'] += [ (TYPE, NAME, LINE, TEXT) for TYPE, lines in sources for LINE, TEXT in enumerate(lines, 1) ]
+    raw['SEQUENCES'] = [ ('SEQ_%05d' % number, 1, 1, 10 ** 12, 'N', 'N', 20, 1000 + number, 'N') for number in range(args.tables // 10) ]
+    raw['SYNONYMS'] = [ ('S_%06d' % number, OWNER, 'T%06d' % number, None, 0) for number in range(0, args.tables, 10) ]
+    raw['VIEWS'] = [ ('V_%06d' % number, 'SELECT C001, C002 FROM T%06d' % number, '"C001","C002"') for number in range(0, args.tables, 20) ]
+    raw['TRIGGERS'] = [ ('TR_%06d' % number, 'ENABLED', 'TR_%06d BEFORE INSERT ON T%06d\nFOR EACH ROW\n' % (number, number),
+                         'BEGIN\n    :NEW.C001 := NVL(:NEW.C001, 0);\nEND;\n') for number in range(0, args.tables, 20) ]
+    return raw, histograms
+
+
+class Fake_Server:
+    """ Answers the statements of Oracle_Source from the raw rows : bulk queries with the rows themselves,
+        the bound per table queries from an Oracle_Catalog built from them. Every round trip sleeps latency seconds """
+    def __init__(self, raw, histograms, latency=0.0):
+        self.raw = raw
+        self.histograms = histograms
+        self.latency = latency
+        self.catalog = Oracle_Catalog(OWNER)
+        self.catalog.raw = raw
+        self.catalog.build()
+        self.expressions = [ (TABLE_NAME, COLUMN_NAME, DATA_DEFAULT) for TABLE_NAME, COLUMN_ID, COLUMN_NAME, *_, DATA_DEFAULT, AVG_COL_LEN, CHAR_LENGTH,
+                             IDENTITY_COLUMN, USER_GENERATED in raw['TAB_COLS'] if USER_GENERATED == 'NO' ]
+        self.statements = { query: ('table', kind) for kind, query in Oracle_Source.TABLE_QUERIES.items() }
+        self.statements.update({ Oracle_Catalog.bulk_query(name, [ OWNER ])[0]: ('bulk', name) for name in Oracle_Catalog.BULK_QUERIES })
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.executes = 0
+        self.round_trips = 0
+
+    def round_trip(self):
+        with self.lock:
+            self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def answer(self, statement, binds):
+        with self.lock:
+            self.executes += 1
+        source, kind = self.statements.get(statement, (None, None))
+        if source == 'bulk':
+            return [ (OWNER,) + tuple(row) for row in self.raw[kind] ]
+        if source is None:
+            if ' '.join(statement.split()).startswith('SELECT MIN(KEY_VALUE)'):
+                return []
+            raise ValueError("unexpected statement : %s" % ' '.join(statement.split())[:200])
+        match kind:
+            case 'tables':
+                return self.catalog.get('tables', OWNER)
+            case 'index_expressions':
+                return self.expressions
+            case 'part_colname':
+                return self.catalog.get('part_colname', (binds['object_type'], binds['name']))
+            case 'key_histogram':
+                return self.histograms.get((binds['name'], binds['column_name']), [])
+            case _:
+                return self.catalog.get(kind, binds['name'])
+
+
+class Fake_Cursor:
+    """ execute/fetchone/fetchall of a python-oracledb cursor : execute brings prefetchrows rows,
+        then every fetch round trip arraysize rows, until one returns less """
+    def __init__(self, server):
+        self.server = server
+        self.arraysize = 100
+        self.prefetchrows = 2
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def execute(self, statement, parameters=None):
+        self.rows = self.server.answer(statement, parameters or {})
+        self.server.round_trip()
+        self.position = 0
+        self.buffered = min(self.prefetchrows, len(self.rows))
+        self.done = len(self.rows) < self.prefetchrows
+        return self
+
+    def fetch(self, count):
+        while self.position + count > self.buffered and not self.done:
+            self.server.round_trip()
+            fetched = min(max(self.arraysize, 1), len(self.rows) - self.buffered)
+            self.buffered += fetched
+            self.done = fetched < max(self.arraysize, 1)
+        rows = self.rows[self.position:min(self.position + count, self.buffered)]
+        self.position += len(rows)
+        return rows
+
+    def fetchone(self):
+        rows = self.fetch(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, count=None):
+        return self.fetch(self.arraysize if count is None else count)
+
+    def fetchall(self):
+        return self.fetch(len(self.rows) + 1)
+
+
+class Fake_Connection:
+    def __init__(self, server):
+        self.server = server
+        self.call_timeout = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def cursor(self):
+        return Fake_Cursor(self.server)
+
+    def close(self):
+        pass
+
+
+class Fake_Pool:
+    def __init__(self, server):
+        self.server = server
+
+    def acquire(self):
+        return Fake_Connection(self.server)
+
+
+def run(server, mode, workers):
+    """ make_user_schema of the synthetic owner into a temporary directory, with the catalog prefetched in prefetch mode """
+    oracle = Oracle_Source()
+    oracle.conn = Fake_Connection(server)
+    if workers > 1:
+        oracle.pool, oracle.workers = Fake_Pool(server), workers
+    server.reset()
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as output_dir:
+        if mode == 'prefetch':
+            oracle.prefetch_catalog([ OWNER ])
+        with Ddl_Writer(output_dir) as writer:
+            oracle.make_user_schema(OWNER, writer)
+    seconds = time.perf_counter() - started
+    return { 'seconds': seconds, 'phases': { name: stats['seconds'] for name, stats in oracle.metrics.phases.items() },
+             'queries': server.executes, 'round_trips': server.round_trips,
+             'slowest_tables': [ (entry['table'], entry['seconds']) for entry in oracle.metrics.slowest_tables()[:5] ] }
+
+def compare(results, baseline, tolerance, min_seconds):
+    """ (mode, timing, seconds, baseline seconds) of every timing more than tolerance slower than the baseline,
+        timings under min_seconds in the baseline are too noisy to compare """
+    regressions = []
+    for mode, result in results.items():
+        base = baseline['results'].get(mode)
+        if base is None:
+            continue
+        timings = [ ('total', result['seconds'], base['seconds']) ]
+        timings += [ (phase, seconds, base['phases'][phase]) for phase, seconds in result['phases'].items() if phase in base['phases'] ]
+        for name, seconds, base_seconds in timings:
+            if base_seconds >= min_seconds and seconds > base_seconds * (1 + tolerance):
+                regressions.append((mode, name, seconds, base_seconds))
+    return regressions
+
+def main(args):
+    started = time.perf_counter()
+    raw, histograms = make_catalog(args)
+    server = Fake_Server(raw, histograms, args.latency / 1000.0)
+    print("%d tables, %d columns, %d indexes, %d partitions, %d procedures of %d lines, generated in %.1f s" %
+          (len(raw['TABLES']), len(raw['TAB_COLS']), len(raw['INDEXES']), len(raw['TAB_PARTITIONS']) + len(raw['IND_PARTITIONS']),
+           args.procedures, args.procedure_lines, time.perf_counter() - started))
+
+    results = {}
+    for mode in args.modes.split(','):
+        runs = [ run(server, mode, args.workers) for repeat in range(args.repeat) ]
+        results[mode] = min(runs, key=lambda result: result['seconds'])
+        result = results[mode]
+        print("%-10s %8.3f s  %7d queries  %7d round trips" % (mode, result['seconds'], result['queries'], result['round_trips']))
+        for phase, seconds in sorted(result['phases'].items(), key=lambda item: item[1], reverse=True):
+            print("    %-20s %8.3f s" % (phase, seconds))
+
+    config = { key: value for key, value in vars(args).items() if key not in ('output', 'baseline', 'repeat', 'tolerance', 'min_seconds') }
+    report = { 'config': config, 'python': sys.version.split()[0], 'results': results }
+    if args.output:
+        with open(args.output, 'w') as out:
+            json.dump(report, out, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as base_file:
+            baseline = json.load(base_file)
+        if baseline['config'] != config:
+            print("baseline %s was measured with another configuration : %s" % (args.baseline, baseline['config']))
+        regressions = compare(results, baseline, args.tolerance, args.min_seconds)
+        for mode, name, seconds, base_seconds in regressions:
+            print("REGRESSION %s %s : %.3f s, baseline %.3f s (+%.0f%%)" % (mode, name, seconds, base_seconds, (seconds / base_seconds - 1) * 100))
+        if regressions:
+            sys.exit(1)
+        print("no regression against %s (tolerance %.0f%%)" % (args.baseline, args.tolerance * 100))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tables', type=int, default=10000, help=' : Synthetic tables')
+    parser.add_argument('--columns', type=int, default=50, help=' : Columns per table')
+    parser.add_argument('--distinct', type=int, default=300, help=' : Distinct column type combinations')
+    parser.add_argument('--indexes', type=int, default=5, help=' : Indexes per table')
+    parser.add_argument('--function-indexes', type=float, default=0.1, help=' : Share of the indexes on an expression')
+    parser.add_argument('--foreign-keys', type=float, default=0.5, help=' : Share of the tables with a foreign key')
+    parser.add_argument('--partitioned', type=float, default=0.05, help=' : Share of partitioned tables, half LIST and half RANGE')
+    parser.add_argument('--partitions', type=int, default=24, help=' : Partitions of a partitioned table')
+    parser.add_argument('--procedures', type=int, default=200, help=' : PL/SQL procedures, every fourth one a package with its body')
+    parser.add_argument('--procedure-lines', type=int, default=2000, help=' : Lines of a procedure')
+    parser.add_argument('--latency', type=float, default=0.0, help=' : Milliseconds of every round trip')
+    parser.add_argument('--workers', type=int, default=1, help=' : Sessions converting tables in parallel')
+    parser.add_argument('--modes', default='query,prefetch', help=' : query ( per table queries ) and/or prefetch ( bulk catalog )')
+    parser.add_argument('--repeat', type=int, default=1, help=' : Runs of every mode, the fastest is kept')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help=' : Write the results to this JSON file')
+    parser.add_argument('--baseline', help=' : Results JSON of an earlier run, exit 1 when a timing is slower by more than --tolerance')
+    parser.add_argument('--tolerance', type=float, default=0.2, help=' : Allowed slowdown against --baseline')
+    parser.add_argument('--min-seconds', type=float, default=0.05, help=' : Timings shorter than this in the baseline are not compared')
+    main(parser.parse_args())
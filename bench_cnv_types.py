@@ -0,0 +1,56 @@
+# Benchmark of the Oracle -> Informix type conversion rules
+# python bench_cnv_types.py --columns 1000000
+
+import argparse
+import random
+import time
+
+from cnv_oracle_schema import Oracle_Source
+
+TYPES = [ ('NUMBER', 22), ('VARCHAR2', None), ('CHAR', None), ('NVARCHAR2', None), ('DATE', 7), ('TIMESTAMP(6)', 11),
+          ('TIMESTAMP(3)', 11), ('CLOB', 4000), ('BLOB', 4000), ('RAW', 16), ('FLOAT', 22), ('BINARY_DOUBLE', 8),
+          ('INTERVAL DAY(2) TO SECOND(6)', 11), ('LONG', 0), ('XMLTYPE', 2000) ]
+
+def make_columns(count, distinct, seed=1):
+    """ count column descriptors (coltype,length,precision,scale,avg_col_length,char_length)
+        drawn from distinct combinations, the first ones much more often like in a real catalog """
+    rnd = random.Random(seed)
+    combinations = {}
+    while len(combinations) < distinct:
+        coltype, length = rnd.choice(TYPES)
+        precision, scale = None, None
+        if coltype == 'NUMBER':
+            precision, scale = rnd.choice([ (None, 0), (None, None), (4, 0), (9, 0), (18, 0), (10, 2), (15, 4), (38, 0) ])
+        elif coltype.startswith('TIMESTAMP') or coltype.startswith('INTERVAL'):
+            scale = int(coltype[coltype.rindex('(') + 1])
+        if length is None:
+            length = rnd.choice([1, 2, 10, 20, 30, 50, 100, 200, 255, 500, 1000, 4000]) if rnd.random() < 0.5 else rnd.randint(1, 4000)
+        avg_col_length = rnd.choice([None, 0, 1, length // 2, length // 3]) if coltype in ('VARCHAR2', 'NVARCHAR2') else None
+        combinations[(coltype, length, precision, scale, avg_col_length, length)] = None
+    weights = [ 1.0 / (rank + 1) for rank in range(distinct) ]
+    return rnd.choices(list(combinations), weights, k=count)
+
+def measure(name, count, convert):
+    start = time.perf_counter()
+    result = convert()
+    elapsed = time.perf_counter() - start
+    print("%-22s %8.3f s  %8.1f ns/column" % (name, elapsed, elapsed * 1e9 / count))
+    return result
+
+def main(args):
+    columns = make_columns(args.columns, args.distinct)
+    print("%d columns, %d distinct (type, length, precision, scale) combinations" % (len(columns), len(set(columns))))
+
+    rule_type = Oracle_Source.__dict__['get_cnv_rule_type'].__func__.__wrapped__
+    uncached = measure('rules, no cache', len(columns), lambda: [ rule_type(Oracle_Source, *column) for column in columns ])
+    Oracle_Source.get_cnv_rule_type.cache_clear()
+    cached = measure('memoized per column', len(columns), lambda: [ Oracle_Source.get_cnv_rule_type(*column) for column in columns ])
+    batch = measure('memoized batch', len(columns), lambda: Oracle_Source.get_cnv_rule_types(columns))
+    assert uncached == cached == batch
+    print(Oracle_Source.get_cnv_rule_type.cache_info())
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--columns', type=int, default=1000000, help=' : Number of synthetic columns')
+    parser.add_argument('--distinct', type=int, default=300, help=' : Distinct column type combinations')
+    main(parser.parse_args())
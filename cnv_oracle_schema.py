@@ -4,69 +4,1685 @@
 import os, sys
 import argparse,configparser 
 import csv,re
+import gzip,json
+import copy,shutil,tempfile,contextlib
+import sqlite3
+import threading,queue
+import importlib,functools,itertools,collections,math,time
+import datetime,decimal
+import hashlib,bisect
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 import getpass
-import oracledb
+
+class Oracle_Catalog:
+    """ Owner-wide copy of the dictionary rows used by Oracle_Source.
+        Every ALL_* view is read once for all the owners and grouped by owner and table (or index),
+        so the number of queries does not depend on the number of tables or owners.
+        The first column of every bulk query is the owner the row belongs to """
+    BULK_QUERIES = {
+        'TAB_COLS' : """
+                SELECT OWNER AS CATALOG_OWNER, TABLE_NAME, COLUMN_ID, COLUMN_NAME, DATA_TYPE, DATA_LENGTH, DATA_PRECISION, DATA_SCALE,
+                       NULLABLE, DEFAULT_ON_NULL, DEFAULT_LENGTH, DATA_DEFAULT, AVG_COL_LEN, CHAR_LENGTH, IDENTITY_COLUMN,
+                       USER_GENERATED
+                  FROM ALL_TAB_COLS
+                 WHERE OWNER IN (%(owners)s)
+                 ORDER BY TABLE_NAME, COLUMN_ID
+             """,
+        'CONSTRAINTS' : """
+                SELECT OWNER AS CATALOG_OWNER, TABLE_NAME, CONSTRAINT_NAME, CONSTRAINT_TYPE, SEARCH_CONDITION_VC, R_OWNER, R_CONSTRAINT_NAME
+                  FROM ALL_CONSTRAINTS
+                 WHERE OWNER IN (%(owners)s)
+                   AND CONSTRAINT_TYPE IN ('C','U','P','R')
+                 ORDER BY TABLE_NAME, CONSTRAINT_NAME
+             """,
+        'CONS_COLUMNS' : """
+                SELECT OWNER AS CATALOG_OWNER, CONSTRAINT_NAME, TABLE_NAME, COLUMN_NAME
+                  FROM ALL_CONS_COLUMNS
+                 WHERE OWNER IN (%(owners)s)
+                 ORDER BY CONSTRAINT_NAME, POSITION
+             """,
+        'INDEXES' : """
+                SELECT OWNER AS CATALOG_OWNER, TABLE_NAME, INDEX_NAME, TABLESPACE_NAME, PARTITIONED,
+                       DECODE(UNIQUENESS,'NONUNIQUE',' ', UNIQUENESS) AS UNIQUENESS
+                  FROM ALL_INDEXES
+                 WHERE OWNER IN (%(owners)s)
+                 ORDER BY TABLE_NAME, INDEX_NAME
+             """,
+        'IND_COLUMNS' : """
+                SELECT INDEX_OWNER AS CATALOG_OWNER, INDEX_NAME, TABLE_NAME, COLUMN_NAME, DESCEND
+                  FROM ALL_IND_COLUMNS
+                 WHERE INDEX_OWNER IN (%(owners)s)
+                 ORDER BY INDEX_NAME, COLUMN_POSITION
+             """,
+        'PART_KEY_COLUMNS' : """
+                SELECT OWNER AS CATALOG_OWNER, OBJECT_TYPE, NAME, COLUMN_NAME
+                  FROM ALL_PART_KEY_COLUMNS
+                 WHERE OWNER IN (%(owners)s)
+                 ORDER BY OBJECT_TYPE, NAME, COLUMN_POSITION
+             """,
+        # histograms of the partition key columns of tables and of the tables of partitioned indexes
+        'KEY_HISTOGRAMS' : """
+                SELECT C.OWNER AS CATALOG_OWNER, C.TABLE_NAME, C.COLUMN_NAME,
+                       C.HISTOGRAM, C.DATA_TYPE, H.ENDPOINT_NUMBER, H.ENDPOINT_VALUE, H.ENDPOINT_ACTUAL_VALUE
+                  FROM ALL_TAB_COLUMNS C, ALL_TAB_HISTOGRAMS H
+                 WHERE C.OWNER IN (%(owners)s)
+                   AND H.OWNER = C.OWNER
+                   AND H.TABLE_NAME = C.TABLE_NAME
+                   AND H.COLUMN_NAME = C.COLUMN_NAME
+                   AND (C.TABLE_NAME, C.COLUMN_NAME) IN ( SELECT K.NAME, K.COLUMN_NAME
+                                                            FROM ALL_PART_KEY_COLUMNS K
+                                                           WHERE K.OWNER = C.OWNER
+                                                             AND TRIM(K.OBJECT_TYPE) = 'TABLE'
+                                                          UNION ALL
+                                                          SELECT I.TABLE_NAME, K.COLUMN_NAME
+                                                            FROM ALL_PART_KEY_COLUMNS K, ALL_INDEXES I
+                                                           WHERE K.OWNER = C.OWNER
+                                                             AND TRIM(K.OBJECT_TYPE) = 'INDEX'
+                                                             AND I.OWNER = K.OWNER
+                                                             AND I.INDEX_NAME = K.NAME )
+                 ORDER BY C.TABLE_NAME, C.COLUMN_NAME, H.ENDPOINT_NUMBER
+             """,
+        'PART_TABLES' : """
+                SELECT OWNER AS CATALOG_OWNER, TABLE_NAME, PARTITIONING_TYPE, PARTITION_COUNT
+                  FROM ALL_PART_TABLES
+                 WHERE OWNER IN (%(owners)s)
+             """,
+        'TAB_PARTITIONS' : """
+                SELECT TABLE_OWNER AS CATALOG_OWNER, TABLE_NAME, PARTITION_NAME, TABLESPACE_NAME, HIGH_VALUE
+                  FROM ALL_TAB_PARTITIONS
+                 WHERE TABLE_OWNER IN (%(owners)s)
+                 ORDER BY TABLE_NAME, PARTITION_POSITION
+             """,
+        'PART_INDEXES' : """
+                SELECT OWNER AS CATALOG_OWNER, INDEX_NAME, PARTITIONING_TYPE, PARTITION_COUNT
+                  FROM ALL_PART_INDEXES
+                 WHERE OWNER IN (%(owners)s)
+             """,
+        'IND_PARTITIONS' : """
+                SELECT INDEX_OWNER AS CATALOG_OWNER, INDEX_NAME, PARTITION_NAME, TABLESPACE_NAME, HIGH_VALUE
+                  FROM ALL_IND_PARTITIONS
+                 WHERE INDEX_OWNER IN (%(owners)s)
+                 ORDER BY INDEX_NAME, PARTITION_POSITION
+             """,
+        'TABLES' : """
+                SELECT OWNER AS CATALOG_OWNER, OWNER, TABLE_NAME,TABLESPACE_NAME,STATUS, NVL(INITIAL_EXTENT,0)/1024 AS INITIAL_EXTENT, NVL(NEXT_EXTENT,0)/1024 AS NEXT_EXTENT, PARTITIONED, READ_ONLY,AVG_ROW_LEN
+                  FROM ALL_TABLES
+                 WHERE OWNER IN (%(owners)s)
+                 ORDER BY OWNER, TABLE_NAME
+             """,
+        # statistics and allocated bytes of every table for the extent sizes ( DBA_SEGMENTS needs SELECT_CATALOG_ROLE )
+        'TABLE_SIZES' : """
+                SELECT T.OWNER AS CATALOG_OWNER, T.TABLE_NAME, NVL(T.NUM_ROWS,0) AS NUM_ROWS, NVL(T.AVG_ROW_LEN,0) AS AVG_ROW_LEN,
+                       NVL(S.BYTES,0)/1024 AS SEGMENT_KB, NVL(P.PARTITION_COUNT,1) AS FRAGMENTS
+                  FROM ALL_TABLES T
+                  LEFT JOIN ( SELECT OWNER, SEGMENT_NAME, SUM(BYTES) AS BYTES
+                                FROM DBA_SEGMENTS
+                               WHERE OWNER IN (%(owners)s)
+                                 AND SEGMENT_TYPE IN ('TABLE','TABLE PARTITION','TABLE SUBPARTITION')
+                               GROUP BY OWNER, SEGMENT_NAME ) S ON ( S.OWNER = T.OWNER AND S.SEGMENT_NAME = T.TABLE_NAME )
+                  LEFT JOIN ALL_PART_TABLES P ON ( P.OWNER = T.OWNER AND P.TABLE_NAME = T.TABLE_NAME )
+                 WHERE T.OWNER IN (%(owners)s)
+             """,
+        # allocated bytes of every index for the post-load build plan
+        'INDEX_SIZES' : """
+                SELECT I.OWNER AS CATALOG_OWNER, I.INDEX_NAME, I.TABLE_NAME, I.TABLESPACE_NAME,
+                       NVL(S.BYTES, NVL(I.LEAF_BLOCKS,0) * 8192)/1024 AS INDEX_KB
+                  FROM ALL_INDEXES I
+                  LEFT JOIN ( SELECT OWNER, SEGMENT_NAME, SUM(BYTES) AS BYTES
+                                FROM DBA_SEGMENTS
+                               WHERE OWNER IN (%(owners)s)
+                                 AND SEGMENT_TYPE IN ('INDEX','INDEX PARTITION','INDEX SUBPARTITION')
+                               GROUP BY OWNER, SEGMENT_NAME ) S ON ( S.OWNER = I.OWNER AND S.SEGMENT_NAME = I.INDEX_NAME )
+                 WHERE I.OWNER IN (%(owners)s)
+             """,
+        'SEQUENCES' : """
+                SELECT SEQUENCE_OWNER AS CATALOG_OWNER, SEQUENCE_NAME, INCREMENT_BY, MIN_VALUE, MAX_VALUE, CYCLE_FLAG, ORDER_FLAG, CACHE_SIZE, LAST_NUMBER, SCALE_FLAG
+                  FROM ALL_SEQUENCES
+                 WHERE SEQUENCE_OWNER IN (%(owners)s)
+             """,
+        'SYNONYMS' : """
+                SELECT OWNER AS CATALOG_OWNER, SYNONYM_NAME, TABLE_OWNER, TABLE_NAME, DB_LINK, ORIGIN_CON_ID
+                  FROM ALL_SYNONYMS
+                 WHERE OWNER IN (%(owners)s)
+             """,
+        # source lines in object order, joined by sources() : LISTAGG on the server stops at 4000 bytes
+        'PROCEDURES' : """
+                SELECT OWNER AS CATALOG_OWNER, TYPE, NAME, LINE, TEXT
+                  FROM ALL_SOURCE
+                 WHERE OWNER IN (%(owners)s)
+                   AND TYPE IN ('PROCEDURE', 'FUNCTION', 'PACKAGE', 'PACKAGE BODY')
+                 ORDER BY OWNER, NAME, TYPE, LINE
+             """,
+        'VIEWS' : """
+                SELECT A.OWNER AS CATALOG_OWNER, A.VIEW_NAME, A.TEXT_VC,
+                       LISTAGG('"'||B.COLUMN_NAME||'"',',') WITHIN GROUP (ORDER BY  B.COLUMN_ID) AS COLUMNS
+                  FROM ALL_VIEWS A, ALL_TAB_COLS B
+                 WHERE A.OWNER IN (%(owners)s)
+                   AND A.OWNER = B.OWNER
+                   AND A.VIEW_NAME = B.TABLE_NAME
+                 GROUP BY A.OWNER, A.VIEW_NAME, A.TEXT_VC
+             """,
+        'TRIGGERS' : """
+                SELECT OWNER AS CATALOG_OWNER, TRIGGER_NAME, STATUS, DESCRIPTION, TRIGGER_BODY
+                  FROM ALL_TRIGGERS
+                 WHERE OWNER IN (%(owners)s)
+             """,
+        # LAST_DDL_TIME of every converted object, indexes are counted with their table
+        # and sequences also change with LAST_NUMBER ( used for restart with )
+        'DDL_VERSIONS' : """
+                SELECT O.OWNER AS CATALOG_OWNER, DECODE(O.OBJECT_TYPE,'FUNCTION','PROCEDURE','PACKAGE','PROCEDURE','PACKAGE BODY','PROCEDURE',O.OBJECT_TYPE) AS OBJECT_TYPE, O.OBJECT_NAME,
+                       TO_CHAR(O.LAST_DDL_TIME,'YYYY-MM-DD HH24:MI:SS') || DECODE(O.OBJECT_TYPE,'SEQUENCE','/'||S.LAST_NUMBER) AS DDL_VERSION
+                  FROM ALL_OBJECTS O
+                  LEFT JOIN ALL_SEQUENCES S ON ( S.SEQUENCE_OWNER = O.OWNER AND S.SEQUENCE_NAME = O.OBJECT_NAME )
+                 WHERE O.OWNER IN (%(owners)s)
+                   AND O.OBJECT_TYPE IN ('TABLE','VIEW','PROCEDURE','FUNCTION','PACKAGE','PACKAGE BODY','SEQUENCE','TRIGGER','SYNONYM')
+                UNION ALL
+                SELECT O.OWNER AS CATALOG_OWNER, 'TABLE', I.TABLE_NAME, TO_CHAR(O.LAST_DDL_TIME,'YYYY-MM-DD HH24:MI:SS')
+                  FROM ALL_OBJECTS O, ALL_INDEXES I
+                 WHERE O.OWNER IN (%(owners)s)
+                   AND O.OBJECT_TYPE = 'INDEX'
+                   AND I.OWNER = O.OWNER
+                   AND I.INDEX_NAME = O.OBJECT_NAME
+             """,
+    }
+    # bulk queries without DBA_SEGMENTS for a user without SELECT_CATALOG_ROLE : the blocks of the statistics ( 8K blocks )
+    SEGMENT_FALLBACKS = {
+        'TABLE_SIZES' : """
+                SELECT T.OWNER AS CATALOG_OWNER, T.TABLE_NAME, NVL(T.NUM_ROWS,0) AS NUM_ROWS, NVL(T.AVG_ROW_LEN,0) AS AVG_ROW_LEN,
+                       NVL(T.BLOCKS,0) * 8192/1024 AS SEGMENT_KB, NVL(P.PARTITION_COUNT,1) AS FRAGMENTS
+                  FROM ALL_TABLES T
+                  LEFT JOIN ALL_PART_TABLES P ON ( P.OWNER = T.OWNER AND P.TABLE_NAME = T.TABLE_NAME )
+                 WHERE T.OWNER IN (%(owners)s)
+             """,
+        'INDEX_SIZES' : """
+                SELECT I.OWNER AS CATALOG_OWNER, I.INDEX_NAME, I.TABLE_NAME, I.TABLESPACE_NAME,
+                       NVL(I.LEAF_BLOCKS,0) * 8192/1024 AS INDEX_KB
+                  FROM ALL_INDEXES I
+                 WHERE I.OWNER IN (%(owners)s)
+             """,
+    }
+    # bulk queries only read when asked for ( INDEX_SIZES is used by --post-load-dir alone )
+    OPTIONAL_BULK = ('INDEX_SIZES',)
+    OWNER_KINDS = { 'TABLES':'tables', 'TABLE_SIZES':'table_sizes', 'INDEX_SIZES':'index_sizes', 'SEQUENCES':'sequences', 'SYNONYMS':'synonyms',
+                    'PROCEDURES':'procedures', 'VIEWS':'views', 'TRIGGERS':'triggers', 'DDL_VERSIONS':'ddl_versions',
+                    'KEY_HISTOGRAMS':'key_histograms' }
+    GROUP_KINDS = ('columns','checks','uniques','primaries','foreignkeys','indexes',
+                   'index_cols','table_partition','index_partition','part_colname')
+    # views with the LONG columns ( DATA_DEFAULT of function-based index columns, HIGH_VALUE of partitions ),
+    # read for one owner when it is not prefetched and assembled by long_groups()
+    LONG_VIEWS = ('IND_COLUMNS', 'PART_TABLES', 'TAB_PARTITIONS', 'PART_INDEXES', 'IND_PARTITIONS')
+    SNAPSHOT_FORMAT = 'cnv_oracle_snapshot'
+    SNAPSHOT_VERSION = 3
+
+    @classmethod
+    def listagg(cls, values):
+        """ Same result as LISTAGG(...,',') : NULLs are skipped, no rows gives NULL """
+        values = [ "%s" % value for value in values if value is not None ]
+        return ','.join(values) if values else None
+
+    @classmethod
+    def sources(cls, lines):
+        """ (TYPE, NAME, SOURCE) of every object of PROCEDURES rows (TYPE, NAME, LINE, TEXT) in object and line order,
+            only the lines of one object are held at a time """
+        for (TYPE, NAME), rows in itertools.groupby(lines, key=lambda row: (row[0], row[1])):
+            yield TYPE, NAME, ''.join( TEXT for *_, TEXT in rows if TEXT is not None )
+
+    def __init__(self, owner):
+        self.owner = owner.upper()
+        self.raw = {}
+        self.groups = { kind: {} for kind in self.GROUP_KINDS + tuple(self.OWNER_KINDS.values()) }
+        self.foreign_refs = []
+        self.constraint_columns = {}
+
+    @classmethod
+    def fetch(cls, owners, fetch_bulk, skip=()):
+        """ Read every bulk query but skip with one execute per dictionary view for all owners,
+            fetch_bulk(name, owners) returns the rows of one, returns { OWNER: Oracle_Catalog } """
+        catalogs = { owner.upper(): cls(owner) for owner in owners }
+        for name in cls.BULK_QUERIES:
+            if name in skip:
+                continue
+            for catalog in catalogs.values():
+                catalog.raw[name] = []
+            for row in fetch_bulk(name, catalogs):
+                catalogs[row[0]].raw[name].append(tuple(row[1:]))
+        for catalog in catalogs.values():
+            catalog.build()
+        cls.link(catalogs)
+        return catalogs
+
+    @classmethod
+    def bulk_query(cls, name, owners, fallback=False):
+        """ (text, binds) of the bulk query name for owners bound as :o1, :o2, ..., its SEGMENT_FALLBACKS version with fallback """
+        binds = { 'o%d' % number: owner.upper() for number, owner in enumerate(owners, 1) }
+        return (cls.SEGMENT_FALLBACKS if fallback else cls.BULK_QUERIES)[name] % { 'owners': ','.join( ':%s' % bind for bind in binds ) }, binds
+
+    @classmethod
+    def link(cls, catalogs):
+        """ Resolve foreign keys referencing another owner from that owner's catalog """
+        for catalog in catalogs.values():
+            for TABLE_NAME, CONSTRAINT_NAME, COLUMNS, R_OWNER, R_CONSTRAINT_NAME in catalog.foreign_refs:
+                ref_catalog = catalogs.get(R_OWNER)
+                if ref_catalog is None or R_CONSTRAINT_NAME not in ref_catalog.constraint_columns:
+                    continue
+                REF_TABLE, REF_COLUMNS = ref_catalog.constraint_columns[R_CONSTRAINT_NAME]
+                catalog.groups['foreignkeys'].setdefault(TABLE_NAME, []).append(
+                    (CONSTRAINT_NAME, R_CONSTRAINT_NAME, COLUMNS, "%s.%s" % (R_OWNER, REF_TABLE), REF_COLUMNS))
+
+    def get(self, kind, key):
+        return self.groups[kind].get(key, [])
+
+    def add(self, kind, key, rows):
+        """ Keep rows of a per-object query, for catalogs filled without the bulk queries """
+        self.groups[kind][key] = rows
+
+    @classmethod
+    def save(cls, catalogs, snapshot_file):
+        """ Write the raw rows of catalogs to a gzip JSON-lines snapshot :
+            a header line, then one [owner, view, row] line per dictionary row """
+        with gzip.open(snapshot_file, 'wt', encoding='utf-8') as snap:
+            header = { 'format': cls.SNAPSHOT_FORMAT, 'version': cls.SNAPSHOT_VERSION, 'owners': list(catalogs) }
+            snap.write(json.dumps(header) + "\n")
+            for owner, catalog in catalogs.items():
+                for name, rows in catalog.raw.items():
+                    for row in rows:
+                        snap.write(json.dumps([owner, name, list(row)], default=str) + "\n")
+
+    @classmethod
+    def load(cls, snapshot_file):
+        """ Read a snapshot written by save(), no database connection is needed.
+            Version 1 snapshots ( one owner, [view, row] lines ) are read as well,
+            the PROCEDURES rows (NAME, SOURCE) of versions 1 and 2 become one source line """
+        with gzip.open(snapshot_file, 'rt', encoding='utf-8') as snap:
+            header = json.loads(next(snap))
+            if header.get('format') != cls.SNAPSHOT_FORMAT or header.get('version') not in (1, 2, cls.SNAPSHOT_VERSION):
+                raise ValueError("%s is not a catalog snapshot (version %s)" % (snapshot_file, cls.SNAPSHOT_VERSION))
+            owners = header['owners'] if header['version'] > 1 else [ header['owner'] ]
+            catalogs = { owner: cls(owner) for owner in owners }
+            for catalog in catalogs.values():
+                catalog.raw = { name: [] for name in cls.BULK_QUERIES }
+            for line in snap:
+                if header['version'] > 1:
+                    owner, name, row = json.loads(line)
+                else:
+                    (name, row), owner = json.loads(line), owners[0]
+                if name == 'PROCEDURES' and header['version'] < 3:
+                    row = [ 'PROCEDURE', row[0], 1, row[1] ]
+                catalogs[owner].raw[name].append(tuple(row))
+        for catalog in catalogs.values():
+            catalog.build()
+        cls.link(catalogs)
+        return catalogs
+
+    def build(self):
+        """ Group the raw rows by table/index, in the same row shape as the per-table queries """
+        groups = { kind: {} for kind in self.GROUP_KINDS }
+        for name, kind in self.OWNER_KINDS.items():
+            groups[kind] = { self.owner: self.raw[name] } if name in self.raw else {}
+
+        tab_cols = {}
+        for (TABLE_NAME, COLUMN_ID, COLUMN_NAME, DATA_TYPE, DATA_LENGTH, DATA_PRECISION, DATA_SCALE, NULLABLE, DEFAULT_ON_NULL,
+                DEFAULT_LENGTH, DATA_DEFAULT, AVG_COL_LEN, CHAR_LENGTH, IDENTITY_COLUMN, USER_GENERATED) in self.raw['TAB_COLS']:
+            tab_cols[(TABLE_NAME, COLUMN_NAME)] = (USER_GENERATED, DATA_DEFAULT)
+            if USER_GENERATED == 'YES':
+                groups['columns'].setdefault(TABLE_NAME, []).append(
+                    (COLUMN_ID, COLUMN_NAME, DATA_TYPE, DATA_LENGTH, DATA_PRECISION, DATA_SCALE, NULLABLE, DEFAULT_ON_NULL,
+                     DEFAULT_LENGTH, DATA_DEFAULT, AVG_COL_LEN, CHAR_LENGTH, IDENTITY_COLUMN))
+
+        cons_cols = {}
+        for CONSTRAINT_NAME, TABLE_NAME, COLUMN_NAME in self.raw['CONS_COLUMNS']:
+            cons_cols.setdefault(CONSTRAINT_NAME, []).append(COLUMN_NAME)
+
+        cons_tables = { CONSTRAINT_NAME: TABLE_NAME for TABLE_NAME, CONSTRAINT_NAME, *_ in self.raw['CONSTRAINTS'] }
+        self.constraint_columns = { CONSTRAINT_NAME: (TABLE_NAME, self.listagg(cons_cols.get(CONSTRAINT_NAME, [])))
+                                    for CONSTRAINT_NAME, TABLE_NAME in cons_tables.items() }
+        self.foreign_refs = []
+        unique_names = set()
+        for TABLE_NAME, CONSTRAINT_NAME, CONSTRAINT_TYPE, SEARCH_CONDITION, R_OWNER, R_CONSTRAINT_NAME in self.raw['CONSTRAINTS']:
+            COLUMNS = self.listagg(cons_cols.get(CONSTRAINT_NAME, []))
+            match CONSTRAINT_TYPE:
+                case 'C':
+                    if SEARCH_CONDITION is not None and not SEARCH_CONDITION.endswith(' IS NOT NULL'):
+                        groups['checks'].setdefault(TABLE_NAME, []).append((CONSTRAINT_NAME, SEARCH_CONDITION))
+                case 'U':
+                    unique_names.add((TABLE_NAME, CONSTRAINT_NAME))
+                    if COLUMNS is not None:
+                        groups['uniques'].setdefault(TABLE_NAME, []).append((CONSTRAINT_NAME, COLUMNS))
+                case 'P':
+                    if COLUMNS is not None:
+                        groups['primaries'].setdefault(TABLE_NAME, []).append((CONSTRAINT_NAME, COLUMNS))
+                case 'R':
+                    if R_OWNER != self.owner:
+                        self.foreign_refs.append((TABLE_NAME, CONSTRAINT_NAME, COLUMNS, R_OWNER, R_CONSTRAINT_NAME))
+                    elif R_CONSTRAINT_NAME in cons_tables:
+                        REF_COLUMNS = self.listagg(cons_cols.get(R_CONSTRAINT_NAME, []))
+                        groups['foreignkeys'].setdefault(TABLE_NAME, []).append(
+                            (CONSTRAINT_NAME, R_CONSTRAINT_NAME, COLUMNS, cons_tables[R_CONSTRAINT_NAME], REF_COLUMNS))
+
+        for TABLE_NAME, INDEX_NAME, TBLSPACE_NAME, PARTITIONED, UNIQUENESS in self.raw['INDEXES']:
+            if (TABLE_NAME, INDEX_NAME) not in unique_names:
+                groups['indexes'].setdefault(TABLE_NAME, []).append((INDEX_NAME, TBLSPACE_NAME, PARTITIONED, UNIQUENESS))
+
+        raw = dict(self.raw, IND_COLUMNS=[ row for row in self.raw['IND_COLUMNS'] if (row[1], row[2]) in tab_cols ])
+        expressions = { key: DATA_DEFAULT for key, (USER_GENERATED, DATA_DEFAULT) in tab_cols.items() if USER_GENERATED != 'YES' }
+        groups.update(self.long_groups(raw, expressions))
+
+        part_cols = {}
+        for OBJECT_TYPE, NAME, COLUMN_NAME in self.raw['PART_KEY_COLUMNS']:
+            part_cols.setdefault((OBJECT_TYPE.strip(), NAME), []).append(COLUMN_NAME)
+        for (OBJECT_TYPE, NAME), COLUMNS in part_cols.items():
+            groups['part_colname'][(OBJECT_TYPE, NAME)] = [(NAME, self.listagg(COLUMNS))]
+
+        self.groups = groups
+
+    @classmethod
+    def long_groups(cls, raw, expressions):
+        """ index_cols, table_partition and index_partition groups of the LONG_VIEWS rows in raw.
+            expressions is the DATA_DEFAULT of the hidden column of a function-based index by (TABLE_NAME, COLUMN_NAME).
+            The LONG values are fetched as str and joined here, not with dbms_xmlgen and LISTAGG on the server :
+            a partition row is (NAME, PARTITIONING_TYPE, PARTITION_COUNT, [PARTITION_NAME], [TABLESPACE_NAME], [HIGH_VALUE]) """
+        groups = { 'index_cols': {}, 'table_partition': {}, 'index_partition': {} }
+        for INDEX_NAME, TABLE_NAME, COLUMN_NAME, DESCEND in raw['IND_COLUMNS']:
+            INDEX_COLNAME = expressions.get((TABLE_NAME, COLUMN_NAME), COLUMN_NAME)
+            INDEX_COLNAME = "%s %s" % (INDEX_COLNAME, '' if DESCEND == 'ASC' else DESCEND)
+            groups['index_cols'].setdefault(INDEX_NAME, []).append((INDEX_COLNAME,))
+
+        for kind, part_objects, partitions in (('table_partition', 'PART_TABLES', 'TAB_PARTITIONS'),
+                                               ('index_partition', 'PART_INDEXES', 'IND_PARTITIONS')):
+            part_rows = {}
+            for NAME, PARTITION_NAME, TABLESPACE_NAME, HIGH_VALUE in raw[partitions]:
+                part_rows.setdefault(NAME, []).append((PARTITION_NAME, TABLESPACE_NAME, HIGH_VALUE))
+            for NAME, PARTITIONING_TYPE, PARTITION_COUNT in raw[part_objects]:
+                if NAME not in part_rows:
+                    continue
+                PARTITIONS, TBLSPACES, HIGH_VALUES = map(list, zip(*part_rows[NAME]))
+                groups[kind][NAME] = [(NAME, PARTITIONING_TYPE, PARTITION_COUNT, PARTITIONS, TBLSPACES, HIGH_VALUES)]
+        return groups
+
+
+class Ddl_Writer:
+    """ Writes the generated statements as they come, one buffered file per object type
+        ( tables.sql, indexes.sql, ... ) so every file can be loaded with dbaccess by itself.
+        Without output_dir the statements go to stdout : table level statements at once,
+        the others are spooled to temporary files and copied after the tables.
+        offsets ( see checkpoint ) continue the files of an interrupted run, cut back to those sizes """
+    KINDS = ('tables','indexes','constraints','foreignkeys','sequences','synonyms','procedures','views','triggers')
+    TABLE_KINDS = ('tables','indexes','constraints')
+    BUFFER_SIZE = 1024 * 1024
+
+    def __init__(self, output_dir=None, offsets=None):
+        self.output_dir = output_dir
+        self.files = {}
+        self.offsets = {}
+        self.dirty = set()
+        if output_dir is not None:
+            os.makedirs(output_dir, exist_ok=True)
+        for kind in self.KINDS:
+            if output_dir is not None:
+                ddl_file = os.path.join(output_dir, "%s.sql" % kind)
+                offset = 0 if offsets is None else offsets.get(kind, 0)
+                if offset > 0:
+                    if (os.path.getsize(ddl_file) if os.path.exists(ddl_file) else 0) < offset:
+                        raise ValueError("%s is shorter than the %d bytes of the journal" % (ddl_file, offset))
+                    os.truncate(ddl_file, offset)
+                self.offsets[kind] = offset
+                self.files[kind] = open(ddl_file, 'a' if offset > 0 else 'w', encoding='utf-8', buffering=self.BUFFER_SIZE)
+            elif kind in self.TABLE_KINDS:
+                self.files[kind] = sys.stdout
+            else:
+                self.files[kind] = tempfile.TemporaryFile('w+', encoding='utf-8', buffering=self.BUFFER_SIZE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, kind, statement):
+        self.files[kind].write(statement)
+        self.dirty.add(kind)
+
+    def checkpoint(self):
+        """ Flush the files of output_dir written since the last checkpoint to disk, returns the sizes of all {kind: bytes} """
+        for kind in self.dirty:
+            ddl_file = self.files[kind]
+            ddl_file.flush()
+            os.fsync(ddl_file.fileno())
+            self.offsets[kind] = os.fstat(ddl_file.fileno()).st_size
+        self.dirty.clear()
+        return dict(self.offsets)
+
+    def close(self):
+        for kind in self.KINDS:
+            ddl_file = self.files[kind]
+            if ddl_file is sys.stdout:
+                continue
+            if self.output_dir is None:
+                ddl_file.seek(0)
+                sys.stdout.write("\n")
+                shutil.copyfileobj(ddl_file, sys.stdout)
+            ddl_file.close()
+        sys.stdout.flush()
+
+
+class Post_Load_Writer:
+    """ Index and constraint statements kept out of the table DDL, to be run after the data is loaded.
+        The statements of a table run in one session one after the other, tables are grouped in batches
+        of at most sessions tables run at the same time with at most per_dbspace of them building in one dbspace.
+        Foreign keys come in batches after all the others. Written to output_dir as batch_NNN_S.sql files,
+        the post_load.sh driver and the plan.txt report of the estimated build size ( KB ) of every batch """
+    KINDS = ('indexes', 'constraints', 'foreignkeys')
+    NAME_PATTERN = re.compile(r'index\s+"[^"]*"\.(\w+)|constraint\s+(\w+)\s*;\s*$', re.IGNORECASE)
+
+    def __init__(self, output_dir, sessions=4, pdqpriority=50, per_dbspace=1):
+        self.output_dir = output_dir
+        self.sessions = sessions
+        self.pdqpriority = pdqpriority
+        self.per_dbspace = per_dbspace
+        self.groups = {}
+        os.makedirs(output_dir, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @classmethod
+    def statement_name(cls, statement):
+        """ Index or constraint name of a generated statement """
+        match = cls.NAME_PATTERN.search(statement.strip())
+        return None if match is None else (match.group(1) or match.group(2)).upper()
+
+    def add(self, owner, table, kind, statement, index_sizes):
+        """ Keep a statement of table, index_sizes { INDEX_NAME: (TABLE_NAME, TABLESPACE_NAME, INDEX_KB) } gives its dbspace and size """
+        name = self.statement_name(statement)
+        TABLE_NAME, TABLESPACE_NAME, INDEX_KB = index_sizes.get(name, (table, None, 0))
+        phase = 1 if kind == 'foreignkeys' else 0
+        group = self.groups.setdefault((phase, owner, table), { 'statements': [], 'names': set(), 'dbspaces': set(), 'size': 0 })
+        group['statements'].append(statement)
+        if TABLESPACE_NAME is not None:
+            group['dbspaces'].add(TABLESPACE_NAME)
+        # a constraint reuses the index of the same name built before it
+        if name not in group['names']:
+            group['size'] += INDEX_KB
+            group['names'].add(name)
+
+    def batches(self):
+        """ [ [ (phase, owner, table) ] ] the largest tables first, each batch filled with the largest ones fitting it """
+        batches = []
+        for phase in (0, 1):
+            remaining = sorted( (key for key in self.groups if key[0] == phase), key=lambda key: (-self.groups[key]['size'], key) )
+            while remaining:
+                batch = []
+                used = {}
+                for key in remaining:
+                    dbspaces = self.groups[key]['dbspaces']
+                    if batch and any( used.get(dbspace, 0) >= self.per_dbspace for dbspace in dbspaces ):
+                        continue
+                    batch.append(key)
+                    for dbspace in dbspaces:
+                        used[dbspace] = used.get(dbspace, 0) + 1
+                    if len(batch) == self.sessions:
+                        break
+                remaining = [ key for key in remaining if key not in batch ]
+                batches.append(batch)
+        return batches
+
+    def close(self):
+        batches = self.batches()
+        with open(os.path.join(self.output_dir, 'plan.txt'), 'w', encoding='utf-8') as plan, \
+             open(os.path.join(self.output_dir, 'post_load.sh'), 'w', encoding='utf-8') as driver:
+            driver.write("#!/bin/sh\n# usage : post_load.sh DATABASE\ncd \"$(dirname \"$0\")\"\n")
+            for number, batch in enumerate(batches, 1):
+                size = sum( self.groups[key]['size'] for key in batch )
+                plan.write("batch %03d : %d sessions, %d KB\n" % (number, len(batch), size))
+                driver.write("echo batch %03d\n" % number)
+                for session, key in enumerate(batch, 1):
+                    phase, owner, table = key
+                    group = self.groups[key]
+                    file_name = "batch_%03d_%d.sql" % (number, session)
+                    plan.write("    %s  %s.%s  %d KB  %s\n" % (file_name, owner, table, group['size'], ','.join(sorted(group['dbspaces']))))
+                    with open(os.path.join(self.output_dir, file_name), 'w', encoding='utf-8') as batch_file:
+                        batch_file.write("SET PDQPRIORITY %s;\n" % self.pdqpriority)
+                        for statement in group['statements']:
+                            batch_file.write(statement)
+                    driver.write("dbaccess \"$1\" %s > %s.log 2>&1 &\n" % (file_name, file_name[:-4]))
+                driver.write("wait\n")
+                print("post load batch %03d : %d tables, %d KB" % (number, len(batch), size), file=sys.stderr)
+        os.chmod(os.path.join(self.output_dir, 'post_load.sh'), 0o755)
+
+
+class Load_Waves:
+    """ Load order of the tables of an owner from its foreign keys : waves of tables whose referenced tables
+        are all in earlier waves, so the tables of a wave can be loaded at the same time.
+        Self references do not order anything, the tables of a reference cycle are loaded in the same wave
+        and references to other owners ( or unknown tables ) are only reported. Foreign keys are enabled after the last wave """
+
+    def __init__(self, tables, references):
+        """ tables [ TABLE_NAME ], references { TABLE_NAME: set of referenced REF_TABLE } """
+        self.tables = list(tables)
+        known = set(self.tables)
+        self.self_references = sorted( table for table in self.tables if table in references.get(table, ()) )
+        self.external = { table: sorted( ref for ref in refs if ref not in known ) for table, refs in references.items()
+                          if any( ref not in known for ref in refs ) }
+        self.references = { table: sorted( ref for ref in references.get(table, ()) if ref in known and ref != table ) for table in self.tables }
+
+    def components(self):
+        """ Strongly connected components of the reference graph ( Tarjan, without recursion ), referenced ones first """
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        components = []
+        for root in self.tables:
+            if root in index:
+                continue
+            work = [ (root, iter(self.references[root])) ]
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                table, refs = work[-1]
+                for ref in refs:
+                    if ref not in index:
+                        index[ref] = lowlink[ref] = len(index)
+                        stack.append(ref)
+                        on_stack.add(ref)
+                        work.append((ref, iter(self.references[ref])))
+                        break
+                    if ref in on_stack:
+                        lowlink[table] = min(lowlink[table], index[ref])
+                else:
+                    work.pop()
+                    if work:
+                        lowlink[work[-1][0]] = min(lowlink[work[-1][0]], lowlink[table])
+                    if lowlink[table] == index[table]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == table:
+                                break
+                        components.append(sorted(component))
+        return components
+
+    def cycles(self):
+        return [ component for component in self.components() if len(component) > 1 ]
+
+    def waves(self, sizes=None):
+        """ [ [ TABLE_NAME ] ] the largest tables of a wave first when sizes { TABLE_NAME: bytes } are given """
+        sizes = sizes or {}
+        wave_of = {}
+        waves = []
+        # components come referenced first, so the waves of the references are known
+        for component in self.components():
+            members = set(component)
+            wave = max( (wave_of[ref] + 1 for table in component for ref in self.references[table] if ref not in members), default=0 )
+            for table in component:
+                wave_of[table] = wave
+            while len(waves) <= wave:
+                waves.append([])
+            waves[wave].extend(component)
+        return [ sorted(wave, key=lambda table: (-sizes.get(table, 0), table)) for wave in waves ]
+
+    def write(self, owner, output_dir, sizes=None):
+        """ load_plan.json, wave_NNN.sh loading the tables of a wave at the same time and load_waves.sh running them in order """
+        os.makedirs(output_dir, exist_ok=True)
+        waves = self.waves(sizes)
+        plan = { 'owner': owner, 'waves': waves, 'references': { table: refs for table, refs in self.references.items() if refs },
+                 'self_references': self.self_references, 'cycles': self.cycles(), 'external': self.external }
+        with open(os.path.join(output_dir, 'load_plan.json'), 'w', encoding='utf-8') as plan_file:
+            json.dump(plan, plan_file, indent=2)
+            plan_file.write("\n")
+
+        scripts = []
+        for number, wave in enumerate(waves, 1):
+            script = "wave_%03d.sh" % number
+            scripts.append(script)
+            with open(os.path.join(output_dir, script), 'w', encoding='utf-8') as wave_file:
+                wave_file.write("#!/bin/sh\n# wave %d of %s : %d tables loaded at the same time\n" % (number, owner, len(wave)))
+                wave_file.write("load_table() {\n")
+                wave_file.write("    if [ -n \"$LOADER\" ]; then $LOADER \"$1\" \"$2\"\n")
+                wave_file.write("    else python \"${CNV_ORACLE_SCHEMA:-cnv_oracle_schema.py}\" load -u \"$1\" --tables \"$2\" --target \"$TARGET\"; fi\n}\n")
+                wave_file.write("pids=\"\"\n")
+                for table in wave:
+                    wave_file.write("load_table %s %s > %s.%s.log 2>&1 &\npids=\"$pids $!\"\n" % (owner, table, owner, table))
+                wave_file.write("status=0\nfor pid in $pids; do wait $pid || status=1; done\nexit $status\n")
+            os.chmod(os.path.join(output_dir, script), 0o755)
+
+        with open(os.path.join(output_dir, 'load_waves.sh'), 'w', encoding='utf-8') as driver:
+            driver.write("#!/bin/sh\n# load of %s in %d waves, LOADER OWNER TABLE loads one table ( default : the load command into $TARGET ).\n" % (owner, len(waves)))
+            driver.write("# With DATABASE and CONSTRAINTS ( foreignkeys.sql ) set, the constraints are run by dbaccess after the last wave\n")
+            driver.write("cd \"$(dirname \"$0\")\"\n")
+            for script in scripts:
+                driver.write("echo %s\n./%s || exit 1\n" % (script, script))
+            driver.write("if [ -n \"$CONSTRAINTS\" ]; then dbaccess \"$DATABASE\" \"$CONSTRAINTS\"; fi\n")
+        os.chmod(os.path.join(output_dir, 'load_waves.sh'), 0o755)
+        return waves
+
+
+class Extent_Advisor:
+    """ Informix page size and extent sizes ( KB ) of a table from the Oracle statistics ( NUM_ROWS, AVG_ROW_LEN ),
+        the allocated segment and the row size projected from the converted column types.
+        The first extent holds the projected data with growth, the next ones next_ratio of it """
+    PAGE_SIZES = (2, 4, 8, 16)
+    PAGE_OVERHEAD = 28          # page header and timestamp
+    SLOT_SIZE = 4               # slot table entry of every row
+    MAX_PAGE_ROWS = 255
+    MIN_PAGES = 4               # smallest Informix extent
+    MAX_WASTE = 0.10
+    FIXED_WIDTHS = { 'smallint': 2, 'integer': 4, 'int': 4, 'serial': 4, 'bigint': 8, 'bigserial': 8, 'int8': 10, 'serial8': 10,
+                     'date': 4, 'smallfloat': 4, 'real': 4, 'float': 8, 'double': 8, 'boolean': 1,
+                     'text': 56, 'byte': 56, 'blob': 72, 'clob': 72 }
+
+    def __init__(self, growth=0.2, next_ratio=0.1, page_size=2):
+        self.growth = growth
+        self.next_ratio = next_ratio
+        self.page_size = page_size
+
+    @classmethod
+    def column_width(cls, col_type, avg_col_len):
+        """ Bytes of an Informix column in the row, the variable ones from AVG_COL_LEN """
+        name, _, args = col_type.lower().partition('(')
+        name = name.strip()
+        sizes = [ int(size) for size in re.findall(r'\d+', args) ]
+        if name in cls.FIXED_WIDTHS:
+            return cls.FIXED_WIDTHS[name]
+        if name in ('char', 'nchar'):
+            return sizes[0] if sizes else 1
+        if name in ('varchar', 'nvarchar'):
+            return min(sizes[0] if sizes else 1, avg_col_len or 0) + 1
+        if name == 'lvarchar':
+            return min(sizes[0] if sizes else 2048, avg_col_len or 0) + 3
+        if name in ('decimal', 'numeric', 'money'):
+            return ((sizes[0] if sizes else 16) + 3) // 2
+        if name.startswith('datetime') or name.startswith('interval'):
+            return 11 if 'fraction' in col_type.lower() else 8
+        return avg_col_len or 8
+
+    def row_size(self, columns):
+        """ Projected Informix row size of [ (col_type, AVG_COL_LEN) ] """
+        return sum( self.column_width(col_type, avg_col_len) for col_type, avg_col_len in columns )
+
+    def choose_page_size(self, row_size):
+        """ Smallest page size ( not below page_size ) leaving less than MAX_WASTE of a page unused,
+            else the one with the least unused space. Rows longer than every page get the largest one """
+        best = None
+        for page_size in self.PAGE_SIZES:
+            if page_size < self.page_size:
+                continue
+            usable = page_size * 1024 - self.PAGE_OVERHEAD
+            if row_size + self.SLOT_SIZE > usable:
+                continue
+            page_rows = min(self.MAX_PAGE_ROWS, usable // (row_size + self.SLOT_SIZE))
+            waste = (usable - page_rows * (row_size + self.SLOT_SIZE)) / usable
+            if waste <= self.MAX_WASTE:
+                return page_size
+            if best is None or waste < best[0]:
+                best = (waste, page_size)
+        return max(self.PAGE_SIZES[-1], self.page_size) if best is None else best[1]
+
+    def extents(self, num_rows, avg_row_len, segment_kb, fragments, row_size):
+        """ (page size, first extent, next extent) of one fragment, None without statistics nor segment.
+            The segment scaled to the Informix row size is a floor for stale statistics """
+        if not num_rows and not segment_kb:
+            return None
+        page_size = self.choose_page_size(row_size)
+        usable = page_size * 1024 - self.PAGE_OVERHEAD
+        if row_size + self.SLOT_SIZE <= usable:
+            pages = math.ceil(num_rows / min(self.MAX_PAGE_ROWS, usable // (row_size + self.SLOT_SIZE)))
+        else:
+            pages = num_rows * math.ceil((row_size + self.SLOT_SIZE) / usable)
+        data_kb = max(pages * page_size, segment_kb * row_size / avg_row_len if avg_row_len else segment_kb)
+        data_kb /= max(fragments, 1)
+        min_kb = self.MIN_PAGES * page_size
+        first = max(min_kb, math.ceil(data_kb * (1 + self.growth) / page_size) * page_size)
+        next_kb = max(min_kb, math.ceil(first * self.next_ratio / page_size) * page_size)
+        return page_size, first, next_kb
+
+
+class Fragment_Planner:
+    """ Balanced Informix fragmentation from the distribution of a partition key column :
+        [ (value, rows) ] sorted bucket upper bounds of a histogram or a sample, exact when every value is one key value.
+        Exact distributions become fragment by list, the others fragment by expression ranges of even size.
+        The last fragment is always the remainder, without a distribution a table is fragmented by round robin """
+    BUCKETS = 254
+
+    def __init__(self, dbspaces=None, fragments=None, sample=1, parallel=4):
+        self.dbspaces = dbspaces
+        self.fragments = fragments
+        self.sample = sample
+        self.parallel = parallel
+
+    @classmethod
+    def literal(cls, value):
+        """ Informix SQL literal of a key value """
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        if isinstance(value, datetime.datetime):
+            if value.microsecond:
+                return "DATETIME(%s) YEAR TO FRACTION(5)" % value.strftime('%Y-%m-%d %H:%M:%S.%f')[:-1]
+            return "DATETIME(%s) YEAR TO SECOND" % value.strftime('%Y-%m-%d %H:%M:%S')
+        if isinstance(value, datetime.date):
+            return "DATETIME(%s) YEAR TO DAY" % value.isoformat()
+        if isinstance(value, str):
+            return "'%s'" % value.replace("'", "''")
+        return str(value)
+
+    @classmethod
+    def merge(cls, distribution):
+        """ One (value, rows) per value, sorted by value """
+        merged = {}
+        for value, rows in distribution:
+            merged[value] = merged.get(value, 0) + rows
+        return sorted(merged.items())
+
+    @classmethod
+    def range_bounds(cls, distribution, count):
+        """ Upper bounds of count - 1 fragments holding the same number of rows, the rest goes to the remainder """
+        total = sum( rows for value, rows in distribution )
+        bounds = []
+        covered = 0
+        target = 1
+        for value, rows in distribution[:-1]:
+            covered += rows
+            if target < count and covered >= total * target / count:
+                bounds.append(value)
+                while target < count and covered >= total * target / count:
+                    target += 1
+        return bounds
+
+    @classmethod
+    def list_values(cls, distribution, count):
+        """ Values of count fragments, the most frequent first into the emptiest fragment """
+        fragments = [ [0, []] for _ in range(min(count, len(distribution))) ]
+        for value, rows in sorted(distribution, key=lambda value_rows: -value_rows[1]):
+            fragment = min(fragments, key=lambda fragment: fragment[0])
+            fragment[0] += rows
+            fragment[1].append(value)
+        return [ sorted(values) for rows, values in fragments ]
+
+    def fragment_clause(self, name, column, distribution, exact, dbspaces, count, table=True):
+        """ fragment by clause of table ( or index ) name over dbspaces, '' when an index can not be fragmented """
+        dbspaces = self.dbspaces or dbspaces
+        count = self.fragments or len(self.dbspaces or []) or count
+        column = column.lower()
+        dbspace = lambda position: dbspaces[position % len(dbspaces)]
+        partition = lambda position: "%s_p%d" % (name.lower(), position + 1)
+
+        if not distribution:
+            if not table:
+                return "  in %s " % dbspace(0)
+            return "  fragment by round robin in %s \n" % ", ".join( dbspace(position) for position in range(count) )
+
+        fragments = []
+        if exact:
+            partition_string = "  fragment by  list ( %s )\n" % column
+            for position, values in enumerate(self.list_values(distribution, count - 1 if count > 1 else 1)):
+                fragments.append("partition  %s values (%s) in  %s  \n" % (partition(position), ", ".join(map(self.literal, values)), dbspace(position)))
+        else:
+            partition_string = "  fragment by  expression \n"
+            lower = None
+            for position, bound in enumerate(self.range_bounds(distribution, count)):
+                expression = "%s <= %s" % (column, self.literal(bound))
+                if lower is not None:
+                    expression = "%s > %s and %s" % (column, self.literal(lower), expression)
+                fragments.append("partition  %s (%s) in  %s  \n" % (partition(position), expression, dbspace(position)))
+                lower = bound
+        fragments.append("partition  %s remainder in  %s  \n" % (partition(len(fragments)), dbspace(len(fragments))))
+        for position, fragment in enumerate(fragments):
+            partition_string += ('    ' if position == 0 else '   ,') + fragment
+        return partition_string
+
+
+class Unl_Writer:
+    """ Informix UNL file(s) of one table. With max_bytes a new <name>_NNN.unl file is started
+        before a batch that would not fit, else everything goes to <name>.unl.
+        With sync every file and at last output_dir are on disk when close() returns ( before a journal record ) """
+
+    def __init__(self, output_dir, name, max_bytes=None, encoding='utf-8', sync=False):
+        self.output_dir = output_dir
+        self.name = name
+        self.max_bytes = max_bytes
+        self.encoding = encoding
+        self.sync = sync
+        self.files = []
+        self.unl_file = None
+        self.size = 0
+        self.rows = 0
+        os.makedirs(output_dir, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close_file(self):
+        if self.sync:
+            self.unl_file.flush()
+            os.fsync(self.unl_file.fileno())
+        self.unl_file.close()
+
+    def open_next(self):
+        if self.unl_file is not None:
+            self.close_file()
+        if self.max_bytes is None:
+            file_name = "%s.unl" % self.name
+        else:
+            file_name = "%s_%03d.unl" % (self.name, len(self.files) + 1)
+        self.files.append(file_name)
+        self.unl_file = open(os.path.join(self.output_dir, file_name), 'wb', buffering=Ddl_Writer.BUFFER_SIZE)
+        self.size = 0
+
+    def write(self, data, rows):
+        data = data.encode(self.encoding)
+        if self.unl_file is None or (self.max_bytes is not None and self.size > 0 and self.size + len(data) > self.max_bytes):
+            self.open_next()
+        self.unl_file.write(data)
+        self.size += len(data)
+        self.rows += rows
+
+    def close(self):
+        if self.unl_file is None:
+            self.open_next()
+        self.close_file()
+        if self.sync:
+            directory = os.open(self.output_dir, os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+
+
+class Unl_Digest:
+    """ Order independent digest of the rows of a table by key range chunk : [rows, sum of a 60 bit hash of every row].
+        Oracle computes it over the unload expressions ( sql ), read() over the fields of the UNL files.
+        A row hash is the MD5 of the MD5 of its fields ( '-' for NULL / an empty field ), by groups of GROUP
+        to stay under the 4000 bytes of VARCHAR2. Fields are hashed as UTF-8, the text of an AL32UTF8 database """
+    GROUP = 100
+
+    @classmethod
+    def sql(cls, expressions):
+        """ Row hash of the text expressions as a NUMBER, 0 without any """
+        if not expressions:
+            return "0"
+        digests = [ "NVL2(%s, RAWTOHEX(STANDARD_HASH(%s, 'MD5')), '-')" % (expression, expression) for expression in expressions ]
+        while True:
+            digests = [ "RAWTOHEX(STANDARD_HASH(%s, 'MD5'))" % " || ".join(digests[start:start + cls.GROUP])
+                        for start in range(0, len(digests), cls.GROUP) ]
+            if len(digests) == 1:
+                return "TO_NUMBER(SUBSTR(%s, 1, 15), 'XXXXXXXXXXXXXXX')" % digests[0]
+
+    @classmethod
+    def row(cls, fields):
+        """ Same hash as sql() of the field texts """
+        if not fields:
+            return 0
+        digests = [ hashlib.md5(field.encode('utf-8')).hexdigest().upper() if field else '-' for field in fields ]
+        while True:
+            digests = [ hashlib.md5("".join(digests[start:start + cls.GROUP]).encode('ascii')).hexdigest().upper()
+                        for start in range(0, len(digests), cls.GROUP) ]
+            if len(digests) == 1:
+                return int(digests[0][:15], 16)
+
+    @classmethod
+    def records(cls, unl_file, delimiter='|', escape='\\', encoding='utf-8'):
+        """ Unescaped fields of every record of a UNL file of Unl_Writer, a record ends with delimiter and newline """
+        with open(unl_file, encoding=encoding, newline='\n') as unl:
+            pending = ''
+            for line in unl:
+                line = pending + line
+                if escape not in line:
+                    pending = ''
+                    yield line[:-2].split(delimiter)
+                    continue
+                if (len(line) - 1 - len(line[:-1].rstrip(escape))) % 2:
+                    pending = line
+                    continue
+                pending = ''
+                fields, field, chars = [], [], iter(line[:-1])
+                for char in chars:
+                    if char == escape:
+                        field.append(next(chars))
+                    elif char == delimiter:
+                        fields.append(''.join(field))
+                        field = []
+                    else:
+                        field.append(char)
+                yield fields
+
+    @classmethod
+    def key_value(cls, kind, text):
+        return decimal.Decimal(text) if kind == 'number' else text
+
+    @classmethod
+    def read(cls, unl_file, delimiter, escape, positions, key_position=None, kind=None, bounds=()):
+        """ [rows, digest] of every chunk of the records of unl_file : the hash of the fields at positions,
+            chunk n holds the keys above bound n-1 up to bound n ( the key field at key_position compared as kind ).
+            Run in a worker process, one UNL file at a time """
+        bounds = [ cls.key_value(kind, bound) for bound in bounds ]
+        chunks = [ [0, 0] for bound in range(len(bounds) + 1) ]
+        for fields in cls.records(unl_file, delimiter, escape):
+            chunk = chunks[bisect.bisect_left(bounds, cls.key_value(kind, fields[key_position])) if bounds else 0]
+            chunk[0] += 1
+            chunk[1] += cls.row([ fields[position] for position in positions ])
+        return chunks
+
+
+class Lob_Reader:
+    """ LOBs larger than the inline size of an unload. Each one is selected again by ROWID ( bound as :rid ) on a session of acquire(),
+        read in chunks and appended to the side file of the reader thread ( <name>.<n>.lob ).
+        The UNL field is the Informix file reference start,length,file with hexadecimal offsets.
+        With sync the side files are on disk when close() returns """
+
+    def __init__(self, acquire, output_dir, name, readers=4, chunk_size=1024 * 1024, sync=False):
+        self.acquire = acquire
+        self.sync = sync
+        self.output_dir = output_dir
+        self.name = name
+        self.chunk_size = chunk_size
+        self.executor = ThreadPoolExecutor(max_workers=readers)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.side_files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def side_file(self):
+        if not hasattr(self.local, 'side_file'):
+            with self.lock:
+                file_name = "%s.%d.lob" % (self.name, len(self.side_files) + 1)
+                self.local.side_file = (file_name, open(os.path.join(self.output_dir, file_name), 'wb', buffering=Ddl_Writer.BUFFER_SIZE))
+                self.side_files.append(self.local.side_file)
+        return self.local.side_file
+
+    def submit(self, query, rowid):
+        return self.executor.submit(self.read, query, rowid)
+
+    def read(self, query, rowid):
+        """ Stream the LOB that query selects for the bind :rid = rowid into the side file of this thread, returns its file reference """
+        file_name, side_file = self.side_file()
+        start = side_file.tell()
+        with self.acquire() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, { 'rid': rowid })
+                (lob,) = cur.fetchone()
+                amount = max(self.chunk_size // lob.getchunksize(), 1) * lob.getchunksize()
+                offset = 1
+                while data := lob.read(offset, amount):
+                    offset += len(data)
+                    side_file.write(data.encode('utf-8') if isinstance(data, str) else data)
+        return "%x,%x,%s" % (start, side_file.tell() - start, file_name)
+
+    def close(self):
+        self.executor.shutdown()
+        for file_name, side_file in self.side_files:
+            if self.sync:
+                side_file.flush()
+                os.fsync(side_file.fileno())
+            side_file.close()
+
+
+class Load_Target:
+    """ DB-API 2 connection the load command inserts into, given as module:dsn
+        ( sqlite3:/tmp/stage.db for a local stand-in, IfxPyDbi:<connection string> for Informix ).
+        The placeholders of the INSERT follow the paramstyle of the module """
+    PLACEHOLDERS = { 'qmark': lambda position: "?", 'numeric': lambda position: ":%d" % position,
+                     'named': lambda position: ":%d" % position, 'format': lambda position: "%s",
+                     'pyformat': lambda position: "%s" }
+
+    def __init__(self, target, table_name='"%(owner)s".%(table)s'):
+        module_name, _, self.dsn = target.partition(':')
+        self.module = importlib.import_module(module_name)
+        self.table_name = table_name
+        if self.module.paramstyle not in self.PLACEHOLDERS:
+            raise ValueError("%s : paramstyle %s is not supported" % (module_name, self.module.paramstyle))
+
+    def connect(self):
+        return self.module.connect(self.dsn)
+
+    def insert_statement(self, owner, table, columns):
+        placeholder = self.PLACEHOLDERS[self.module.paramstyle]
+        return "INSERT INTO %s (%s) VALUES (%s)" % (self.table_name % { 'owner': owner.lower(), 'table': table.lower() },
+                                                    ", ".join( column.lower() for column in columns ),
+                                                    ", ".join( placeholder(position + 1) for position in range(len(columns)) ))
+
+    def delete_statement(self, owner, table, key_columns):
+        placeholder = self.PLACEHOLDERS[self.module.paramstyle]
+        return "DELETE FROM %s WHERE %s" % (self.table_name % { 'owner': owner.lower(), 'table': table.lower() },
+                                            " AND ".join( "%s = %s" % (column.lower(), placeholder(position + 1)) for position, column in enumerate(key_columns) ))
+
+
+class Ddl_Cache:
+    """ Rendered statements of every object kept in a sqlite file between runs.
+        An object is rendered again only when its DDL version ( LAST_DDL_TIME ) or the digest of the
+        conversion inputs it was rendered with ( Oracle_Source.conversion_inputs ) changed.
+        The owners converted concurrently share one cache, so every access holds the lock """
+
+    def __init__(self, cache_file):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(cache_file, check_same_thread=False)
+        self.db.execute("""
+                CREATE TABLE IF NOT EXISTS ddl_cache (
+                       owner TEXT, object_type TEXT, object_name TEXT, ddl_version TEXT, statements TEXT, inputs TEXT,
+                       PRIMARY KEY (owner, object_type, object_name) )
+             """)
+        if 'inputs' not in [ column[1] for column in self.db.execute("PRAGMA table_info(ddl_cache)") ]:
+            self.db.execute("ALTER TABLE ddl_cache ADD COLUMN inputs TEXT")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def versions(self, owner):
+        """ {(object_type, object_name): (ddl_version, inputs)} of the cached objects of owner """
+        with self.lock:
+            rows = self.db.execute("SELECT object_type, object_name, ddl_version, inputs FROM ddl_cache WHERE owner = ?", (owner,)).fetchall()
+        return { (object_type, object_name): (ddl_version, inputs) for object_type, object_name, ddl_version, inputs in rows }
+
+    def statements(self, owner, object_type, object_name):
+        with self.lock:
+            (statements,) = self.db.execute("SELECT statements FROM ddl_cache WHERE owner = ? AND object_type = ? AND object_name = ?",
+                                            (owner, object_type, object_name)).fetchone()
+        return [ tuple(statement) for statement in json.loads(statements) ]
+
+    def put(self, owner, object_type, object_name, ddl_version, statements, inputs=None):
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO ddl_cache (owner, object_type, object_name, ddl_version, statements, inputs) VALUES (?, ?, ?, ?, ?, ?)",
+                            (owner, object_type, object_name, ddl_version, json.dumps(statements), inputs))
+
+    def delete(self, owner, object_type, object_name):
+        with self.lock:
+            self.db.execute("DELETE FROM ddl_cache WHERE owner = ? AND object_type = ? AND object_name = ?",
+                            (owner, object_type, object_name))
+
+    def close(self):
+        with self.lock:
+            self.db.commit()
+            self.db.close()
+
+
+class Delta_State:
+    """ Watermark of every table between delta runs in a sqlite file : the column it is taken from
+        ( ORA_ROWSCN or a last-modified column ) and its value as text, NULL for an empty table.
+        Committed at every change, the tables of the pool sessions share it so every access holds the lock """
+
+    def __init__(self, state_file):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(state_file, check_same_thread=False)
+        self.db.execute("""
+                CREATE TABLE IF NOT EXISTS delta_state (
+                       owner TEXT, table_name TEXT, column_name TEXT, watermark TEXT, updated TEXT,
+                       PRIMARY KEY (owner, table_name) )
+             """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, owner, table):
+        """ (column, watermark) of a table, None before its first run """
+        with self.lock:
+            return self.db.execute("SELECT column_name, watermark FROM delta_state WHERE owner = ? AND table_name = ?", (owner, table)).fetchone()
+
+    def put(self, owner, table, column, watermark):
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO delta_state VALUES (?, ?, ?, ?, ?)",
+                            (owner, table, column, watermark, time.strftime('%Y-%m-%d %H:%M:%S')))
+            self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+class Run_Journal:
+    """ Progress of schema and unload runs in an append-only JSON-lines file, written to disk after every entry.
+        An entry is a finished table or phase of a step ( schema, unload ) of an owner, with the sizes of the
+        Ddl_Writer files at that point and the result to replay ( post-load or LOAD statements ).
+        A restarted run with the same journal skips the finished entries and continues the files from the last sizes.
+        The torn last line of a crashed run is cut off. The owners converted concurrently share one journal """
+
+    def __init__(self, journal_file):
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.offsets = {}
+        size = 0
+        if os.path.exists(journal_file):
+            with open(journal_file, 'rb') as journal:
+                for line in journal:
+                    try:
+                        entry = json.loads(line) if line.endswith(b"\n") else None
+                    except ValueError:
+                        entry = None
+                    if entry is None:
+                        break
+                    self.add(entry)
+                    size += len(line)
+            os.truncate(journal_file, size)
+        self.journal = open(journal_file, 'a', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, entry):
+        self.entries[(entry['step'], entry['owner'], entry['kind'], entry['name'])] = entry
+        if entry['offsets'] is not None:
+            self.offsets[(entry['step'], entry['owner'])] = entry['offsets']
+
+    def done(self, step, owner, kind, name):
+        return (step, owner, kind, name) in self.entries
+
+    def result(self, step, owner, kind, name):
+        return self.entries[(step, owner, kind, name)]['result']
+
+    def count(self, step, owner):
+        return sum( 1 for key in self.entries if key[:2] == (step, owner) )
+
+    def record(self, step, owner, kind, name, offsets=None, result=None):
+        """ Append one finished entry and wait until it is on disk """
+        entry = { 'step': step, 'owner': owner, 'kind': kind, 'name': name, 'offsets': offsets, 'result': result,
+                  'time': time.strftime('%Y-%m-%d %H:%M:%S') }
+        with self.lock:
+            self.journal.write(json.dumps(entry) + "\n")
+            self.journal.flush()
+            os.fsync(self.journal.fileno())
+            self.add(entry)
+
+    def close(self):
+        with self.lock:
+            self.journal.close()
+
+
+class Name_Index:
+    """ Values keyed by a name, an exact name or a pattern ( see Type_Overrides ).
+        Exact names are hashed, wildcards are bucketed by their literal prefix ( or suffix ),
+        so a lookup only tries the patterns sharing a start or an end with the name """
+
+    def __init__(self):
+        self.entries = {}
+        self.exact = {}
+        self.prefixes = {}
+        self.suffixes = {}
+        self.others = []
+
+    @staticmethod
+    def compile(name):
+        """ None for an exact name, else a compiled pattern matching the whole upper-cased name """
+        if name.startswith('re:'):
+            return re.compile(name[3:], re.IGNORECASE)
+        if not any( wildcard in name for wildcard in '*%?' ):
+            return None
+        return re.compile(''.join( '.*' if char in '*%' else '.' if char == '?' else re.escape(char) for char in name.upper() ))
+
+    def setdefault(self, name, factory):
+        """ Value of name, created by factory() for a new name """
+        entry = self.entries.get(name)
+        if entry is None:
+            pattern = self.compile(name)
+            entry = self.entries[name] = (pattern, factory())
+            literal = re.match(r'[^*%?]*', name.upper()).group() if not name.startswith('re:') else ''
+            if pattern is None:
+                self.exact[name.upper()] = entry
+            elif literal:
+                self.prefixes.setdefault(literal, []).append(entry)
+            elif not name.startswith('re:') and (literal := re.search(r'[^*%?]*$', name.upper()).group()):
+                self.suffixes.setdefault(literal, []).append(entry)
+            else:
+                self.others.append(entry)
+        return entry[1]
+
+    def lookup(self, name):
+        """ (0 for the exact name or 1 for a pattern, value) of every entry matching name """
+        found = []
+        entry = self.exact.get(name)
+        if entry is not None:
+            found.append((0, entry[1]))
+        candidates = list(self.others)
+        if self.prefixes or self.suffixes:
+            for length in range(1, len(name) + 1):
+                candidates += self.prefixes.get(name[:length], [])
+                candidates += self.suffixes.get(name[-length:], [])
+        found += [ (1, value) for pattern, value in candidates if pattern.fullmatch(name) is not None ]
+        return found
+
+
+class Type_Overrides:
+    """ Column type overrides of TYPE_CONV_FORCE_TABLE ( OWNER,TABNAME,COLUMN,TYPE ).
+        A name is exact, a wildcard with * or % ( any characters ) and ? ( one character ), or a regular expression after re:.
+        Among the rules matching a column the one with an exact owner wins, then an exact table, then an exact column,
+        then the first in the file. The same OWNER,TABNAME,COLUMN given again replaces the type """
+
+    def __init__(self):
+        self.owners = Name_Index()
+        self.table_rules_cache = {}
+        self.count = 0
+
+    @classmethod
+    def load(cls, conv_file):
+        overrides = cls()
+        with open(conv_file) as csvfile:
+            reader = csv.reader(csvfile, delimiter=',')
+            headers = next(reader,None)
+            for row in reader:
+                if row and not row[0].startswith('#'):
+                    owner,table,colname,newtype = row
+                    overrides.add(owner.strip(), table.strip(), colname.strip(), newtype.strip())
+        return overrides
+
+    def add(self, owner, table, column, newtype):
+        self.table_rules_cache.clear()
+        rule = self.owners.setdefault(owner, Name_Index).setdefault(table, Name_Index).setdefault(column, lambda: [newtype, self.count])
+        rule[0] = newtype
+        self.count += 1
+
+    def table_rules(self, owner, table):
+        """ (owner rank, table rank, column Name_Index) of the rules applying to owner.table, built once per table """
+        key = (owner, table)
+        rules = self.table_rules_cache.get(key)
+        if rules is None:
+            rules = [ (owner_rank, table_rank, columns) for owner_rank, tables in self.owners.lookup(owner)
+                                                        for table_rank, columns in tables.lookup(table) ]
+            self.table_rules_cache[key] = rules
+        return rules
+
+    def get(self, owner, table, column):
+        owner, table, column = owner.upper(), table.upper(), column.upper()
+        best = None
+        for owner_rank, table_rank, columns in self.table_rules(owner, table):
+            for column_rank, (newtype, sequence) in columns.lookup(column):
+                rank = (owner_rank, table_rank, column_rank, sequence)
+                if best is None or rank < best[0]:
+                    best = (rank, newtype)
+        return None if best is None else best[1]
+
+
+class Run_Metrics:
+    """ Timings of a run for --metrics : wall time, rows and round trips of every dictionary query kind,
+        the render time of every table with the queries it issued, and the total of every phase.
+        Round trips are estimated from the rows and the arraysize/prefetchrows of the cursor.
+        write() keeps a JSON report and a Prometheus textfile beside it """
+    PREFIX = 'cnv_oracle'
+
+    def __init__(self, slowest=20):
+        self.slowest = slowest
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.queries = {}
+        self.phases = {}
+        self.tables = []
+
+    @classmethod
+    def round_trips(cls, rows, arraysize, prefetchrows):
+        """ Round trips of execute and fetch of rows : prefetchrows come with the execute,
+            then arraysize rows per fetch until a fetch returns less """
+        if rows < prefetchrows:
+            return 1
+        return 2 + (rows - prefetchrows) // max(arraysize, 1)
+
+    def query(self, kind, seconds, rows, arraysize, prefetchrows):
+        round_trips = self.round_trips(rows, arraysize, prefetchrows)
+        with self.lock:
+            stats = self.queries.setdefault(kind, { 'count': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'rows': 0, 'round_trips': 0 })
+            stats['count'] += 1
+            stats['seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            stats['rows'] += rows
+            stats['round_trips'] += round_trips
+        table = getattr(self.local, 'table', None)
+        if table is not None:
+            table['queries'] += 1
+            table['query_seconds'] += seconds
+            table['rows'] += rows
+            table['round_trips'] += round_trips
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """ Add the wall time of the block to phase name, phases run by the workers add up their threads """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            with self.lock:
+                stats = self.phases.setdefault(name, { 'count': 0, 'seconds': 0.0 })
+                stats['count'] += 1
+                stats['seconds'] += seconds
+
+    @contextlib.contextmanager
+    def table(self, owner, table):
+        """ Render time of one table, the queries of the thread are counted for it meanwhile """
+        entry = { 'owner': owner, 'table': table, 'seconds': 0.0, 'queries': 0, 'query_seconds': 0.0, 'rows': 0, 'round_trips': 0,
+                  'fragments': 1, 'statements': {} }
+        self.local.table = entry
+        started = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry['seconds'] = time.perf_counter() - started
+            self.local.table = None
+            with self.lock:
+                self.tables.append(entry)
+
+    def slowest_tables(self):
+        return sorted(self.tables, key=lambda entry: entry['seconds'], reverse=True)[:self.slowest]
+
+    def report(self):
+        return { 'seconds': time.perf_counter() - self.started, 'phases': self.phases, 'queries': self.queries,
+                 'slowest_tables': self.slowest_tables(), 'tables': self.tables }
+
+    def prometheus(self):
+        """ Text exposition format of report(), only the slowest tables get a per table series """
+        def label(value):
+            return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+        lines = []
+        def metric(name, kind, help, samples):
+            lines.append("# HELP %s_%s %s" % (self.PREFIX, name, help))
+            lines.append("# TYPE %s_%s %s" % (self.PREFIX, name, kind))
+            for labels, value in samples:
+                labels = ",".join( '%s="%s"' % (key, label(text)) for key, text in labels )
+                lines.append("%s_%s%s %s" % (self.PREFIX, name, "{%s}" % labels if labels else '', repr(float(value))))
+
+        metric('run_seconds', 'gauge', 'Wall time of the run', [ ((), time.perf_counter() - self.started) ])
+        metric('phase_seconds', 'gauge', 'Wall time of a phase', [ ((('phase', name),), stats['seconds']) for name, stats in self.phases.items() ])
+        for field, help in (('count', 'Executions'), ('seconds', 'Wall time'), ('rows', 'Rows fetched'), ('round_trips', 'Estimated round trips')):
+            name = 'queries_total' if field == 'count' else 'query_%s_total' % field
+            metric(name, 'counter', '%s of the dictionary queries' % help,
+                   [ ((('query', kind),), stats[field]) for kind, stats in self.queries.items() ])
+        metric('tables_rendered_total', 'counter', 'Tables rendered', [ ((), len(self.tables)) ])
+        metric('table_render_seconds', 'gauge', 'Render time of the slowest tables',
+               [ ((('owner', entry['owner']), ('table', entry['table'])), entry['seconds']) for entry in self.slowest_tables() ])
+        return "\n".join(lines) + "\n"
+
+    def write(self, report_file):
+        """ report() as JSON into report_file and prometheus() into report_file with a .prom extension,
+            renamed into place so a textfile collector never reads half a file """
+        prom_file = os.path.splitext(report_file)[0] + '.prom'
+        for file_name, text in ((report_file, json.dumps(self.report(), indent=1, default=str)), (prom_file, self.prometheus())):
+            with open(file_name + '.tmp', 'w') as out:
+                out.write(text)
+            os.replace(file_name + '.tmp', file_name)
+        return prom_file
+
+    def summary(self):
+        """ Slowest tables and query kinds as text """
+        lines = [ "%-40s %9s %8s %9s %8s %8s %9s" % ('slowest tables', 'seconds', 'queries', 'db secs', 'rows', 'indexes', 'fragments') ]
+        for entry in self.slowest_tables():
+            lines.append("%-40s %9.3f %8d %9.3f %8d %8d %9d" % ("%s.%s" % (entry['owner'], entry['table']), entry['seconds'],
+                                                                entry['queries'], entry['query_seconds'], entry['rows'],
+                                                                entry['statements'].get('indexes', 0), entry['fragments']))
+        lines.append("%-40s %9s %8s %9s %8s" % ('queries', 'seconds', 'count', 'max secs', 'rows'))
+        for kind, stats in sorted(self.queries.items(), key=lambda item: item[1]['seconds'], reverse=True):
+            lines.append("%-40s %9.3f %8d %9.3f %8d" % (kind, stats['seconds'], stats['count'], stats['max_seconds'], stats['rows']))
+        return "\n".join(lines) + "\n"
+
 
 class Oracle_Source:
     CFG_FILE="oracle.cfg"
-    TYPE_CONV_DICT = {}
-    DEVICE_PARTITIONS = ['p_device_part_1','p_device_part_2','p_device_part_3','p_device_part_4','p_device_part_5','p_device_part_n']
-    DEVICE_TBLSPACES  = ['statdbs1','statdbs2','statdbs3','statdbs4','statdbs5','statdbs6']
-    DEVICE_HVALUES    = ["devicenum < 'N'","devicenum >= 'N' and devicenum < 'NR03'","devicenum >= 'NR03' and devicenum < 'P'",
-                         "devicenum >= 'P' and devicenum < 'PL03'","devicenum >= 'PL03'","devicenum is  NULL"]
-    GENDATE_PARTITIONS = ['p_gendate_part_1','p_gendate_part_2','p_gendate_part_3','p_gendate_part_4','p_gendate_part_5',
-                              'p_gendate_part_n','p_gendate_part_r']
-    GENDATE_TBLSPACES  = ['statdbs6','statdbs5','statdbs4','statdbs3','statdbs2','statdbs1','statdbs1']
-    GENDATE_HVALUES    = ["'2029','2024','2019'","'2028','2023','2018'","'2027','2022','2017'","'2026','2021','2016'",
-                          "'2025','2020','2015'",'NULL','REMAINDER']
+    TYPE_OVERRIDES = Type_Overrides()
+    CNV_RULES = {}
+    # per table (or per index) dictionary queries, bound with :owner and the object :name.
+    # The text never changes, every execute after the first one is a statement cache hit
+    TABLE_QUERIES = {
+        'columns' : """
+         SELECT COLUMN_ID,	COLUMN_NAME,	DATA_TYPE,  	DATA_LENGTH,	DATA_PRECISION,	DATA_SCALE,	
+                NULLABLE,	DEFAULT_ON_NULL	,  DEFAULT_LENGTH,	DATA_DEFAULT ,AVG_COL_LEN,CHAR_LENGTH,IDENTITY_COLUMN 
+                --,	NUM_DISTINCT,	
+                -- LOW_VALUE,	HIGH_VALUE	,DENSITY, NUM_NULLS	,
+                -- CHARACTER_SET_NAME	,CHAR_LENGTH, CHAR_USED	,IDENTITY_COLUMN,
+                -- EVALUATION_EDITION
+          FROM ALL_TAB_COLS	 
+         WHERE OWNER = :owner AND TABLE_NAME = :name
+           AND USER_GENERATED = 'YES' 
+         ORDER BY COLUMN_ID
+        """,
+        'checks' : """
+          SELECT A.CONSTRAINT_NAME, A.SEARCH_CONDITION_VC
+            FROM ALL_CONSTRAINTS A  -- , ALL_CONS_COLUMNS B 
+           WHERE A.OWNER  = :owner
+             AND A.TABLE_NAME = :name
+             AND A.CONSTRAINT_TYPE='C'
+             --  AND A.OWNER = B.OWNER
+             AND A.SEARCH_CONDITION_VC  NOT LIKE '% IS NOT NULL'   
+             -- AND A.CONSTRAINT_NAME  = B.CONSTRAINT_NAME       
+             """,
+        'uniques' : """
+              SELECT A.CONSTRAINT_NAME, LISTAGG(B.COLUMN_NAME, ',') WITHIN GROUP (ORDER BY B.POSITION) AS COLUMNS
+                FROM ALL_CONSTRAINTS A, ALL_CONS_COLUMNS B 
+               WHERE A.OWNER  = :owner
+                 AND A.TABLE_NAME = :name
+                 AND A.CONSTRAINT_TYPE='U'
+                 AND A.OWNER = B.OWNER  
+                 AND A.CONSTRAINT_NAME  = B.CONSTRAINT_NAME   
+            GROUP BY A.CONSTRAINT_NAME     
+             """,
+        'primaries' : """
+              SELECT A.CONSTRAINT_NAME, LISTAGG(B.COLUMN_NAME, ',') WITHIN GROUP (ORDER BY B.POSITION) AS COLUMNS
+                FROM ALL_CONSTRAINTS A, ALL_CONS_COLUMNS B 
+               WHERE A.OWNER  = :owner
+                 AND A.TABLE_NAME = :name
+                 AND A.CONSTRAINT_TYPE='P'
+                 AND A.OWNER = B.OWNER  
+                 AND A.CONSTRAINT_NAME  = B.CONSTRAINT_NAME   
+            GROUP BY A.CONSTRAINT_NAME     
+             """,
+        'foreignkeys' : """
+                          SELECT A.CONSTRAINT_NAME   					AS CONSTRAINT_NAME,
+                                 A.R_CONSTRAINT_NAME 					AS REF_NAME,
+                                 (SELECT LISTAGG(B.COLUMN_NAME,',') WITHIN GROUP (ORDER BY B.POSITION) 
+                                         FROM ALL_CONS_COLUMNS B   
+                                        WHERE A.OWNER = B.OWNER
+                                          AND A.TABLE_NAME = B.TABLE_NAME
+                                          AND B.CONSTRAINT_NAME = A.CONSTRAINT_NAME)	 AS FK_COLUMNS,
+                                	R.TABLE_NAME ,
+                                 (SELECT LISTAGG(B.COLUMN_NAME,',') WITHIN GROUP (ORDER BY B.POSITION) 
+                                         FROM ALL_CONS_COLUMNS B   
+                                        WHERE A.OWNER = B.OWNER
+                                          AND R.TABLE_NAME = B.TABLE_NAME
+                                          AND B.CONSTRAINT_NAME = A.R_CONSTRAINT_NAME)	 AS REF_COLUMNS         
+                             FROM ALL_CONSTRAINTS A, ALL_CONSTRAINTS R
+                            WHERE   A.OWNER  = :owner
+                                AND A.OWNER = R.OWNER
+                                AND A.TABLE_NAME = :name
+                                AND A.CONSTRAINT_TYPE='R'
+                                AND A.R_CONSTRAINT_NAME = R.CONSTRAINT_NAME
+            """,
+        'indexes' : """
+                    SELECT A.INDEX_NAME AS INDEX_NAME,
+                           A.TABLESPACE_NAME AS TBLSPACE_NAME,
+                           A.PARTITIONED AS PARTITIONED,
+                           DECODE(A.UNIQUENESS,'NONUNIQUE',' ', A.UNIQUENESS) AS UNIQUENESS
+                      FROM ALL_INDEXES A
+                     WHERE A.OWNER=:owner
+                       AND A.TABLE_NAME = :name
+                       AND A.INDEX_NAME NOT IN
+                      (
+                          SELECT CONSTRAINT_NAME
+                            FROM ALL_CONSTRAINTS
+                           WHERE OWNER=A.OWNER
+                             AND TABLE_NAME=:name
+                             AND CONSTRAINT_TYPE='U'
+                      )
+        """,
+        # owner level : expressions of the function-based index columns ( LONG, fetched as str )
+        'index_expressions' : """
+            SELECT C.TABLE_NAME, C.COLUMN_NAME, C.DATA_DEFAULT
+              FROM ALL_TAB_COLS C
+             WHERE C.OWNER = :owner
+               AND C.USER_GENERATED = 'NO'
+               AND EXISTS ( SELECT 1
+                              FROM ALL_IND_COLUMNS B
+                             WHERE B.TABLE_OWNER = C.OWNER
+                               AND B.TABLE_NAME = C.TABLE_NAME
+                               AND B.COLUMN_NAME = C.COLUMN_NAME )
+        """,
+        'part_colname' : """
+                    SELECT NAME,LISTAGG(COLUMN_NAME,',') WITHIN GROUP (ORDER BY COLUMN_POSITION) AS PARTCOLS 
+                      FROM ALL_PART_KEY_COLUMNS
+                     WHERE OWNER=:owner 
+                       AND OBJECT_TYPE = :object_type
+                       AND NAME = :name
+                     GROUP BY NAME
+             """,
+        # distribution of a partition key column
+        'key_histogram' : """
+                    SELECT C.HISTOGRAM, C.DATA_TYPE, H.ENDPOINT_NUMBER, H.ENDPOINT_VALUE, H.ENDPOINT_ACTUAL_VALUE
+                      FROM ALL_TAB_COLUMNS C, ALL_TAB_HISTOGRAMS H
+                     WHERE C.OWNER = :owner
+                       AND C.TABLE_NAME = :name
+                       AND C.COLUMN_NAME = :column_name
+                       AND H.OWNER = C.OWNER
+                       AND H.TABLE_NAME = C.TABLE_NAME
+                       AND H.COLUMN_NAME = C.COLUMN_NAME
+                     ORDER BY H.ENDPOINT_NUMBER
+             """,
+        'tables' : """
+        SELECT OWNER, TABLE_NAME,TABLESPACE_NAME,STATUS, NVL(INITIAL_EXTENT,0)/1024 AS INITIAL_EXTENT, NVL(NEXT_EXTENT,0)/1024 AS NEXT_EXTENT, PARTITIONED, READ_ONLY,AVG_ROW_LEN
+        FROM all_tables 
+        WHERE OWNER = NVL(:owner, OWNER)
+          -- AND tablespace_name is not NULL AND NUM_ROWS IS NOT NULL 
+        ORDER BY  OWNER, TABLE_NAME
+        """,
+        'table_info' : """
+         SELECT table_name, owner, Tablespace_name, Num_Rows 
+         FROM all_tables 
+         WHERE tablespace_name is not NULL 
+           AND NUM_ROWS IS NOT NULL 
+           AND OWNER = :owner AND TABLE_NAME = :name
+        """,
+        'notnull' : """
+          SELECT A.CONSTRAINT_NAME 
+            FROM ALL_CONSTRAINTS A, ALL_CONS_COLUMNS B 
+           WHERE A.OWNER  = :owner
+             AND A.TABLE_NAME = :name
+             AND A.CONSTRAINT_TYPE='N'
+             AND A.OWNER = B.OWNER
+             AND B.COLUMN_NAME = :column_name
+             AND A.CONSTRAINT_NAME  = B.CONSTRAINT_NAME               
+        """,
+        'users' : """
+          SELECT USERNAME FROM ALL_USERS WHERE USERNAME LIKE :name ORDER BY USERNAME
+        """,
+        # formatted with parallel degree, column, buckets, column, owner, table, sample percent, column :
+        # identifiers and the SAMPLE percent cannot be bind variables
+        'key_sample' : """
+                    SELECT MIN(KEY_VALUE), MAX(KEY_VALUE), COUNT(*)
+                      FROM ( SELECT /*+ PARALLEL(%s) */ "%s" AS KEY_VALUE, NTILE(%s) OVER (ORDER BY "%s") AS BUCKET
+                               FROM "%s"."%s" SAMPLE BLOCK (%s)
+                              WHERE "%s" IS NOT NULL )
+                     GROUP BY BUCKET
+                     ORDER BY BUCKET
+             """,
+        # formatted with the bound text expression of KEY_VALUE ( CHUNK_KEYS ), column, buckets, column, owner, table, sample percent, column
+        'chunk_bounds' : """
+                    SELECT %s
+                      FROM ( SELECT MAX(KEY_VALUE) AS KEY_VALUE
+                               FROM ( SELECT "%s" AS KEY_VALUE, NTILE(%s) OVER (ORDER BY "%s") AS BUCKET
+                                        FROM "%s"."%s" SAMPLE BLOCK (%s)
+                                       WHERE "%s" IS NOT NULL )
+                              GROUP BY BUCKET )
+                     ORDER BY KEY_VALUE
+             """,
+        # formatted with the row hash of Unl_Digest.sql, owner, table and the key range of the chunk bound with :low and :high
+        'verify_chunk' : """
+                    SELECT COUNT(*), TO_CHAR(SUM(%s))
+                      FROM "%s"."%s"
+                     WHERE %s
+             """,
+        'current_scn' : """
+                    SELECT TO_CHAR(CURRENT_SCN) FROM V$DATABASE
+             """,
+        # formatted with the watermark text expression of the column ( WATERMARKS ), owner, table
+        'delta_mark' : """
+                    SELECT %s FROM "%s"."%s"
+             """,
+    }
+    # leading primary key column types verify chunks a table by : the text of a bound as in the UNL file, its bind variable
+    CHUNK_KEYS = { 'NUMBER': ("TO_CHAR(KEY_VALUE, 'TM9')", "TO_NUMBER(:%s)"), 'FLOAT': ("TO_CHAR(KEY_VALUE, 'TM9')", "TO_NUMBER(:%s)"),
+                   'DATE': ("TO_CHAR(KEY_VALUE, 'YYYY-MM-DD HH24:MI:SS')", "TO_DATE(:%s, 'YYYY-MM-DD HH24:MI:SS')"),
+                   'CHAR': ("KEY_VALUE", ":%s"), 'VARCHAR': ("KEY_VALUE", ":%s"), 'VARCHAR2': ("KEY_VALUE", ":%s") }
+    # last-modified column types delta reads a table by : the text of the watermark, the condition of the rows changed since
+    WATERMARKS = { 'NUMBER': ("TO_CHAR(MAX(%s), 'TM9')", "%s >= TO_NUMBER(:watermark)"),
+                   'DATE': ("TO_CHAR(MAX(%s), 'YYYY-MM-DD HH24:MI:SS')", "%s >= TO_DATE(:watermark, 'YYYY-MM-DD HH24:MI:SS')"),
+                   'TIMESTAMP': ("TO_CHAR(MAX(%s), 'YYYY-MM-DD HH24:MI:SS.FF9')", "%s >= TO_TIMESTAMP(:watermark, 'YYYY-MM-DD HH24:MI:SS.FF9')") }
+    # fetch class of every query : single row lookups, per table lists, owner level bulk reads
+    QUERY_FETCH = { 'part_colname': 'single', 'table_info': 'single', 'notnull': 'single',
+                    'tables': 'bulk', 'index_expressions': 'bulk', 'key_sample': 'table',
+                    'chunk_bounds': 'table', 'verify_chunk': 'single', 'current_scn': 'single', 'delta_mark': 'single' }
+    # (arraysize, prefetchrows) of a fetch class, prefetchrows of one row past the result saves the round trip for end of fetch
+    FETCH_SIZES = { 'single': (1, 2), 'table': (100, 100), 'bulk': (10000, 10000) }
+    STMT_CACHE_SIZE = 100
+    # tables of table_schemas in flight per worker
+    TABLE_WINDOW = 2
     
 
     @classmethod
     def make_cnv_dict(cls,conv_file):
-        #print(conv_file)
-        with open(conv_file) as csvfile:
-            reader = csv.reader(csvfile, delimiter=',')
-            headers = next(reader,None)
-            #print(headers)
-            for owner,table,colname,newtype in reader:
-                cols=(owner,table,colname)
-                tab_col_name =':'.join(cols).upper()
-                cls.TYPE_CONV_DICT[tab_col_name] = newtype
+        cls.TYPE_OVERRIDES = Type_Overrides.load(conv_file)
                 
     @classmethod
     def get_cnv_dict_type(cls, owner,table,column):
-        cols=(owner,table,column)
-        tab_col_name =':'.join(cols).upper()
-        if tab_col_name in cls.TYPE_CONV_DICT:
-            return cls.TYPE_CONV_DICT[tab_col_name]
-        else:
-            return None
+        return cls.TYPE_OVERRIDES.get(owner, table, column)
                        
     @classmethod
+    def compile_cnv_rules(cls):
+        """ Oracle data type -> rule(coltype,length,precision,scale,avg_col_length,char_length) of get_cnv_rule_type """
+        def fixed(informix_type):
+            return lambda coltype,length,precision,scale,avg_col_length,char_length: informix_type
+
+        rules = { 'NUMBER': lambda coltype,length,precision,scale,avg_col_length,char_length: cls.cnv_number_type(length, precision, scale),
+                  'DATE': fixed("datetime year to second"),
+                  'XMLTYPE': fixed('lvarchar(8192)'),
+                  'MDSYS.SDO_GEOMETRY': fixed('geometry') }
+        rules.update(dict.fromkeys(('CHAR','NCHAR','VARCHAR','VARCHAR2','NVARCHAR2'), cls.cnv_char_type))
+        rules.update(dict.fromkeys(('CLOB','LONG','BLOB','RAW','BFILE','LONG RAW'), cls.cnv_blob_type))
+        rules.update(dict.fromkeys(('FLOAT','BINARY_FLOAT','BINARY_DOUBLE'), cls.cnv_float_type))
+        return rules
+
+    @classmethod
+    def get_cnv_rule(cls, coltype):
+        """ Rule of coltype from CNV_RULES, TIMESTAMP(n) and INTERVAL types are resolved by prefix once and added """
+        if not cls.CNV_RULES:
+            cls.CNV_RULES.update(cls.compile_cnv_rules())
+        rule = cls.CNV_RULES.get(coltype)
+        if rule is None:
+            if coltype.startswith('TIMESTAMP'):
+                rule = cls.cnv_timestamp_type
+            elif coltype.startswith('INTERVAL'):
+                rule = cls.cnv_interval_type
+            else:
+                rule = lambda coltype,length,precision,scale,avg_col_length,char_length: "%s" % coltype
+            cls.CNV_RULES[coltype] = rule
+        return rule
+
+    @classmethod
+    @functools.lru_cache(maxsize=65536)
     def get_cnv_rule_type(cls,coltype,length,precision,scale,avg_col_length,char_length):
-        if coltype.startswith('TIMESTAMP'): 
-                return cls.cnv_timestamp_type(coltype,length,precision,scale,avg_col_length,char_length)
-        elif coltype.startswith('INTERVAL'): 
-                return cls.cnv_interval_type(coltype,length,precision,scale,avg_col_length,char_length)
-        else:
-            match coltype:
-                case 'NUMBER':
-                    return cls.cnv_number_type(length, precision, scale)
-                case 'CHAR'|'NCHAR'|'VARCHAR'|'VARCHAR2'|'NVARCHAR2':
-                    return cls.cnv_char_type(coltype,length,precision,scale,avg_col_length,char_length)
-                case 'CLOB'|'LONG'|'BLOB'|'RAW'|'BFILE'|'LONG RAW': 
-                    return cls.cnv_blob_type(coltype,length,precision,scale,avg_col_length,char_length)
-                case 'FLOAT'|'BINARY_FLOAT'|'BINARY_DOUBLE':
-                    return cls.cnv_float_type(coltype,length,precision,scale,avg_col_length,char_length)
-                case 'DATE':
-                    return "datetime year to second"
-                case 'XMLTYPE':
-                    return 'lvarchar(8192)'
-                case 'MDSYS.SDO_GEOMETRY':
-                    return 'geometry'
-                case _:
-                    return "%s" % coltype
+        """ Informix type of an Oracle column, memoized on the whole argument tuple """
+        return cls.get_cnv_rule(coltype)(coltype,length,precision,scale,avg_col_length,char_length)
+
+    @classmethod
+    def get_cnv_rule_types(cls, columns):
+        """ get_cnv_rule_type of every (coltype,length,precision,scale,avg_col_length,char_length) of columns """
+        return list(itertools.starmap(cls.get_cnv_rule_type, columns))
 
     @classmethod
     def cnv_interval_type(cls,coltype,length,precision,scale,avg_col_length,char_length):      
@@ -145,7 +1761,7 @@ class Oracle_Source:
                 if length > 122:
                     return "lvarchar(%s)" % length
                 else:
-                    return "nvarchar(%s,%s)" % ("%s,%s" % (length, avg_col_length) if avg_col_length is not None and avg_col_length > 1 else length) 
+                    return "nvarchar(%s)" % ("%s,%s" % (length, avg_col_length) if avg_col_length is not None and avg_col_length > 1 else length) 
             case _:
                 return "CHARACTER(?)"
                 
@@ -184,6 +1800,24 @@ class Oracle_Source:
         
     def __init__(self, ):
         self.conn = None
+        self.pool = None
+        self.lob_pool = None
+        self.profiles = {}
+        self.table_sizes = {}
+        self.extent_advisor = Extent_Advisor()
+        self.fragment_planner = Fragment_Planner()
+        self.only_tables = None
+        self.profile_options = None
+        self.workers = 1
+        self.catalogs = {}
+        self.long_catalogs = {}
+        self.long_lock = threading.Lock()
+        self.metrics = Run_Metrics()
+        self.journal = None
+        self.delta_columns = {}
+        self.key_histograms = {}
+        self.fetch_sizes = dict(self.FETCH_SIZES)
+        self.stmtcachesize = self.STMT_CACHE_SIZE
 
         properties = configparser.ConfigParser()
         properties.read(Oracle_Source.CFG_FILE)
@@ -195,11 +1829,24 @@ class Oracle_Source:
         Oracle_Source.make_cnv_dict(self.conf['TYPE_CONV_FORCE_TABLE'])
         ##print(conf['CONNECT_STRING'])
 
-    def connect(self):
+    def connect(self, workers=1, lob_readers=0):
         """ Connect to oracle database swith username and password
-            Oracle Connection info was saved in oracle.cfg """
+            Oracle Connection info was saved in oracle.cfg
+            With workers > 1 a session pool of workers + 1 sessions is created : self.conn of the main thread
+            and one for each worker thread of table_schemas / map_tables, with lob_readers a second pool for the Lob_Reader of unload """
+        import oracledb
 
-        self.conn= oracledb.connect(user=self.username, password=self.password, dsn=self.conf['CONNECT_STRING'])
+        self.workers = workers
+        if lob_readers > 0:
+            self.lob_pool = oracledb.create_pool(user=self.username, password=self.password, dsn=self.conf['CONNECT_STRING'],
+                                                 min=1, max=lob_readers, increment=1, stmtcachesize=self.stmtcachesize)
+        if workers > 1:
+            self.pool = oracledb.create_pool(user=self.username, password=self.password, dsn=self.conf['CONNECT_STRING'],
+                                             min=1, max=workers + 1, increment=1, stmtcachesize=self.stmtcachesize)
+            self.conn = self.pool.acquire()
+        else:
+            self.conn= oracledb.connect(user=self.username, password=self.password, dsn=self.conf['CONNECT_STRING'],
+                                        stmtcachesize=self.stmtcachesize)
         if self.conn is None:
             print("Cananot connect to Oracle") 
             sys.exit(-1)
@@ -207,55 +1854,148 @@ class Oracle_Source:
     def get_cursor():
         return self.conn.cursor()
 
+    def prefetch_catalog(self, owners, optional=True):
+        """ Load the dictionary rows of owners in one bulk pass ( see Oracle_Catalog ).
+            get_* methods of these owners are answered from memory afterwards,
+            the OPTIONAL_BULK queries are left to the first get_* without optional """
+        with self.metrics.phase('prefetch'):
+            catalogs = Oracle_Catalog.fetch(owners, self.fetch_bulk, skip=() if optional else Oracle_Catalog.OPTIONAL_BULK)
+        self.catalogs.update(catalogs)
+        return catalogs
 
-    def get_tables(self, filter=None):
-       table_query="""
-        SELECT OWNER, TABLE_NAME,TABLESPACE_NAME,STATUS, NVL(INITIAL_EXTENT,0)/1024 AS INITIAL_EXTENT, NVL(NEXT_EXTENT,0)/1024 AS NEXT_EXTENT, PARTITIONED, READ_ONLY,AVG_ROW_LEN
-        FROM all_tables 
-        WHERE %s
-          -- AND tablespace_name is not NULL AND NUM_ROWS IS NOT NULL 
-        ORDER BY  OWNER, TABLE_NAME
-       """
-       if filter is None:
-           query = table_query % ( "1=1" )
-       else:
-           query = table_query % filter
-       with self.conn.cursor() as cur:
-           cur.execute(query)
-           res = cur.fetchall()
-           return res
+    def load_snapshot(self, snapshot_file):
+        """ Use a snapshot written by extract_snapshot() instead of a live connection """
+        catalogs = Oracle_Catalog.load(snapshot_file)
+        self.catalogs.update(catalogs)
+        return catalogs
 
-    def get_table_info(self, owner, table):
-        table_query = """
-         SELECT table_name, owner, Tablespace_name, Num_Rows 
-         FROM all_tables 
-         WHERE tablespace_name is not NULL 
-           AND NUM_ROWS IS NOT NULL 
-           AND OWNER = '%s' AND TABLE_NAME = '%s'
-        """
-        query = table_query % (owner.upper(), table.upper())
-        #print (query)
+    def extract_snapshot(self, owners, snapshot_file):
+        """ Prefetch every dictionary row of owners and keep them in snapshot_file """
+        catalogs = self.prefetch_catalog(owners)
+        Oracle_Catalog.save(catalogs, snapshot_file)
+        return catalogs
+
+    def resolve_owners(self, owner_spec):
+        """ Owners of -u : a comma separated list, items with % are LIKE patterns.
+            Patterns are matched against ALL_USERS, or against the loaded catalogs without a connection """
+        owners = []
+        for item in owner_spec.upper().split(','):
+            item = item.strip()
+            if '%' not in item:
+                matches = [ item ] if item else []
+            elif self.conn is None:
+                pattern = re.compile(re.escape(item).replace('%', '.*').replace('_', '.') + '$')
+                matches = sorted( owner for owner in self.catalogs if pattern.match(owner) )
+            else:
+                matches = [ USERNAME for USERNAME, in self.fetch_all('users', name=item) ]
+            owners += [ owner for owner in matches if owner not in owners ]
+        return owners
+
+    def long_rows(self, kind, owner, key):
+        """ Rows of the index_cols, table_partition or index_partition kind for key.
+            Without a prefetched catalog the LONG_VIEWS of owner are read in bulk once ( see Oracle_Catalog.long_groups ) """
+        rows = self.catalog_rows(kind, owner, key)
+        if rows is not None:
+            return rows
+        owner = owner.upper()
+        with self.long_lock:
+            if owner not in self.long_catalogs:
+                raw = { name: [ tuple(row[1:]) for row in self.fetch_bulk(name, [owner]) ] for name in Oracle_Catalog.LONG_VIEWS }
+                expressions = { (TABLE_NAME, COLUMN_NAME): DATA_DEFAULT
+                                for TABLE_NAME, COLUMN_NAME, DATA_DEFAULT in self.fetch_all('index_expressions', owner=owner) }
+                self.long_catalogs[owner] = Oracle_Catalog.long_groups(raw, expressions)
+        return self.long_catalogs[owner][kind].get(key, [])
+
+    def catalog_rows(self, kind, owner, key):
+        """ Prefetched rows of kind for key, or None if owner was not prefetched """
+        catalog = self.catalogs.get(owner.upper())
+        if catalog is None:
+            return None
+        return catalog.get(kind, key)
+
+    def fetch_size(self, kind):
+        """ (arraysize, prefetchrows) of the query kind, Oracle_Catalog bulk queries are bulk """
+        return self.fetch_sizes[self.QUERY_FETCH.get(kind, 'bulk' if kind in Oracle_Catalog.BULK_QUERIES else 'table')]
+
+    def fetch_rows(self, cur, kind, binds=None, query=None, one=False):
+        """ Rows of TABLE_QUERIES[kind] ( or query ) executed on cur with binds and the fetch sizes of kind,
+            the first row or None with one. Execute and fetch are timed into self.metrics """
+        cur.arraysize, cur.prefetchrows = self.fetch_size(kind)
+        started = time.perf_counter()
+        cur.execute(self.TABLE_QUERIES[kind] if query is None else query, binds)
+        if one:
+            row = cur.fetchone()
+            rows = [] if row is None else [ row ]
+        else:
+            rows = cur.fetchall()
+        self.metrics.query(kind, time.perf_counter() - started, len(rows), cur.arraysize, cur.prefetchrows)
+        if one:
+            return row
+        return rows
+
+    def fetch_one(self, kind, **binds):
+        """ First row of TABLE_QUERIES[kind], None without one """
         with self.conn.cursor() as cur:
-            cur.execute(query)
-            res = cur.fetchone()
-            return res
+            return self.fetch_rows(cur, kind, binds, one=True)
 
-    def get_notnull_constraint(self, owner, table, column):
-        constraint_query = """
-          SELECT A.CONSTRAINT_NAME 
-            FROM ALL_CONSTRAINTS A, ALL_CONS_COLUMNS B 
-           WHERE A.OWNER  = '%s'
-             AND A.TABLE_NAME = '%s'
-             AND A.CONSTRAINT_TYPE='N'
-             AND A.OWNER = B.OWNER
-             AND B.COLUMN_NAME ='%s'
-             AND A.CONSTRAINT_NAME  = B.CONSTRAINT_NAME               
-        """
-        query = constraint_query % (owner.upper(), table.upper(), column.upper())
-        #print (query)
+    def fetch_all(self, kind, **binds):
+        """ Every row of TABLE_QUERIES[kind] """
         with self.conn.cursor() as cur:
-            cur.execute(query)
-            res = cur.fetchone()
+            return self.fetch_rows(cur, kind, binds)
+
+    def fetch_bulk(self, name, owners):
+        """ Every row of the Oracle_Catalog bulk query name for owners.
+            The sizes read from DBA_SEGMENTS come from the statistics of ALL_TABLES when it can not be read """
+        with self.conn.cursor() as cur:
+            try:
+                query, binds = Oracle_Catalog.bulk_query(name, owners)
+                return self.fetch_rows(cur, name, binds, query=query)
+            except Exception as error:
+                import oracledb
+                if name not in Oracle_Catalog.SEGMENT_FALLBACKS or not isinstance(error, oracledb.Error):
+                    raise
+                print("%s : DBA_SEGMENTS not read, sizes from the statistics, %s" % (name, str(error).splitlines()[0]), file=sys.stderr)
+                query, binds = Oracle_Catalog.bulk_query(name, owners, fallback=True)
+                return self.fetch_rows(cur, name, binds, query=query)
+
+    def stream_bulk(self, name, owner):
+        """ Rows of the bulk query name for owner alone without CATALOG_OWNER, fetched arraysize rows at a time """
+        with self.conn.cursor() as cur:
+            cur.arraysize, cur.prefetchrows = self.fetch_size(name)
+            started, count = time.perf_counter(), 0
+            cur.execute(*Oracle_Catalog.bulk_query(name, [owner]))
+            for rows in self.iter_batches(cur):
+                count += len(rows)
+                for row in rows:
+                    yield row[1:]
+            self.metrics.query(name, time.perf_counter() - started, count, cur.arraysize, cur.prefetchrows)
+
+    def iter_rows(self, kind, owner, key, **binds):
+        """ Rows of kind for key from the catalog, else from TABLE_QUERIES[kind] bound with owner and binds """
+        rows = self.catalog_rows(kind, owner, key)
+        if rows is None:
+            rows = self.fetch_all(kind, owner=owner.upper(), **binds)
+        yield from rows
+
+    def iter_owner_rows(self, name, owner):
+        """ Rows of the owner level bulk query name from the catalog, else queried for owner alone """
+        catalog = self.catalogs.get(owner.upper())
+        if catalog is not None and owner.upper() in catalog.groups[Oracle_Catalog.OWNER_KINDS[name]]:
+            yield from catalog.get(Oracle_Catalog.OWNER_KINDS[name], owner.upper())
+            return
+        for row in self.fetch_bulk(name, [owner]):
+            yield row[1:]
+
+
+    def get_tables(self, owner=None):
+       """ ALL_TABLES rows of owner, of every owner without one """
+       return self.fetch_all('tables', owner=None if owner is None else owner.upper())
+
+    def get_table_info(self, owner, table):
+        return self.fetch_one('table_info', owner=owner.upper(), name=table.upper())
+
+    def get_notnull_constraint(self, owner, table, column):
+        res = self.fetch_one('notnull', owner=owner.upper(), name=table.upper(), column_name=column.upper())
         if res is None:
             return None
         else:
@@ -264,76 +2004,16 @@ class Oracle_Source:
 
             
     def get_check_constraints(self, owner, table):
-        check_query = """
-          SELECT A.CONSTRAINT_NAME, A.SEARCH_CONDITION_VC
-            FROM ALL_CONSTRAINTS A  -- , ALL_CONS_COLUMNS B 
-           WHERE A.OWNER  = '%s'
-             AND A.TABLE_NAME = '%s'
-             AND A.CONSTRAINT_TYPE='C'
-             --  AND A.OWNER = B.OWNER
-             AND A.SEARCH_CONDITION_VC  NOT LIKE '%% IS NOT NULL'   
-             -- AND A.CONSTRAINT_NAME  = B.CONSTRAINT_NAME       
-             """        
-        check_string = ""
-        query = check_query % (owner.upper(), table.upper())
-        #print (query)
-        with self.conn.cursor() as cur:
-            cur.execute(query)
-            res = cur.fetchall()
-        if res is None:
-            return None
-        else:
-            for CONSTRAINT_NAME, SEARCH_CONDITION in res:
-                check_string += "alter table %s.%s add constraint  CHECK ( %s ) constraint %s ;\n" % (owner.lower(),table.lower(),SEARCH_CONDITION,CONSTRAINT_NAME.lower() )
-            return check_string
+        for CONSTRAINT_NAME, SEARCH_CONDITION in self.iter_rows('checks', owner, table.upper(), name=table.upper()):
+            yield "alter table %s.%s add constraint  CHECK ( %s ) constraint %s ;\n" % (owner.lower(),table.lower(),SEARCH_CONDITION,CONSTRAINT_NAME.lower() )
         
     def get_unique_constraints(self, owner, table):
-        unqiue_query = """
-              SELECT A.CONSTRAINT_NAME, LISTAGG(B.COLUMN_NAME, ',') WITHIN GROUP (ORDER BY B.POSITION) AS COLUMNS
-                FROM ALL_CONSTRAINTS A, ALL_CONS_COLUMNS B 
-               WHERE A.OWNER  = '%s'
-                 AND A.TABLE_NAME = '%s'
-                 AND A.CONSTRAINT_TYPE='U'
-                 AND A.OWNER = B.OWNER  
-                 AND A.CONSTRAINT_NAME  = B.CONSTRAINT_NAME   
-            GROUP BY A.CONSTRAINT_NAME     
-             """        
-        unique_string = ""
-        query = unqiue_query % (owner.upper(), table.upper())
-        #print (query)
-        with self.conn.cursor() as cur:
-            cur.execute(query)
-            res = cur.fetchall()
-        if res is None:
-            return None
-        else:
-            for CONSTRAINT_NAME, COLUMNS in res:
-                unique_string += "ALTER TABLE %s.%s ADD CONSTRAINT  UNIQUE ( %s ) CONSTRAINT %s ;\n" % (owner.lower(),table.lower(), COLUMNS.lower(), CONSTRAINT_NAME.lower())
-            return unique_string
+        for CONSTRAINT_NAME, COLUMNS in self.iter_rows('uniques', owner, table.upper(), name=table.upper()):
+            yield "ALTER TABLE %s.%s ADD CONSTRAINT  UNIQUE ( %s ) CONSTRAINT %s ;\n" % (owner.lower(),table.lower(), COLUMNS.lower(), CONSTRAINT_NAME.lower())
 
     def get_primary_constraints(self, owner, table):
-        primary_query = """
-              SELECT A.CONSTRAINT_NAME, LISTAGG(B.COLUMN_NAME, ',') WITHIN GROUP (ORDER BY B.POSITION) AS COLUMNS
-                FROM ALL_CONSTRAINTS A, ALL_CONS_COLUMNS B 
-               WHERE A.OWNER  = '%s'
-                 AND A.TABLE_NAME = '%s'
-                 AND A.CONSTRAINT_TYPE='P'
-                 AND A.OWNER = B.OWNER  
-                 AND A.CONSTRAINT_NAME  = B.CONSTRAINT_NAME   
-            GROUP BY A.CONSTRAINT_NAME     
-             """        
-        primary_string = ""
-        query = primary_query % (owner.upper(), table.upper())
-        #print (query)
-        with self.conn.cursor() as cur:
-            cur.execute(query)
-            res = cur.fetchall()
-        if res is None:
-            return None
-        else:
-            for CONSTRAINT_NAME, COLUMNS in res:
-                primary_string += "ALTER TABLE  %s.%s ADD  CONSTRAINT  PRIMARY KEY  ( %s ) CONSTRAINT  %s ;\n" % (owner,table,COLUMNS, CONSTRAINT_NAME.lower())
-            return primary_string   
+        for CONSTRAINT_NAME, COLUMNS in self.iter_rows('primaries', owner, table.upper(), name=table.upper()):
+            yield "ALTER TABLE  %s.%s ADD  CONSTRAINT  PRIMARY KEY  ( %s ) CONSTRAINT  %s ;\n" % (owner,table,COLUMNS, CONSTRAINT_NAME.lower())
         
    
     
@@ -348,227 +2028,144 @@ class Oracle_Source:
                                 FROM ALL_CONSTRAINTS A, ALL_CONS_COLUMNS B 
                             WHERE A.OWNER  = '%s'
                                 AND A.TABLE_NAME = '%s'
-                                AND A.CONSTRAINT_TYPE='R'
-                                AND A.OWNER = B.OWNER  
-                                AND A.CONSTRAINT_NAME  = B.CONSTRAINT_NAME   
-                            GROUP BY A.OWNER,A.CONSTRAINT_NAME,A.R_CONSTRAINT_NAME
-                    ) FK,  ALL_CONS_COLUMNS R
-                WHERE FK.OWNER = R.OWNER
-                    AND FK.REF_NAME = R.CONSTRAINT_NAME
-                GROUP BY FK.CONSTRAINT_NAME, FK.REF_NAME,  R.TABLE_NAME, FK.FK_COLUMNS  
-             """        
-        fk_query = """
-                          SELECT A.CONSTRAINT_NAME   					AS CONSTRAINT_NAME,
-                                 A.R_CONSTRAINT_NAME 					AS REF_NAME,
-                                 (SELECT LISTAGG(B.COLUMN_NAME,',') WITHIN GROUP (ORDER BY B.POSITION) 
-                                         FROM ALL_CONS_COLUMNS B   
-                                        WHERE A.OWNER = B.OWNER
-                                          AND A.TABLE_NAME = B.TABLE_NAME
-                                          AND B.CONSTRAINT_NAME = A.CONSTRAINT_NAME)	 AS FK_COLUMNS,
-                                	R.TABLE_NAME ,
-                                 (SELECT LISTAGG(B.COLUMN_NAME,',') WITHIN GROUP (ORDER BY B.POSITION) 
-                                         FROM ALL_CONS_COLUMNS B   
-                                        WHERE A.OWNER = B.OWNER
-                                          AND R.TABLE_NAME = B.TABLE_NAME
-                                          AND B.CONSTRAINT_NAME = A.R_CONSTRAINT_NAME)	 AS REF_COLUMNS         
-                             FROM ALL_CONSTRAINTS A, ALL_CONSTRAINTS R
-                            WHERE   A.OWNER  = '%s'
-                                AND A.OWNER = R.OWNER
-                                AND A.TABLE_NAME = '%s'
-                                AND A.CONSTRAINT_TYPE='R'
-                                AND A.R_CONSTRAINT_NAME = R.CONSTRAINT_NAME
-            """
-        fk_string = ""
-        query = fk_query % (owner.upper(), table.upper())
-        #print (query)
-        with self.conn.cursor() as cur:
-            cur.execute(query)
-            res = cur.fetchall()
-        if res is None:
-            return None
-        else:
-            for CONSTRAINT_NAME, REF_NAME, FK_COLUMNS, REF_TABLE,REF_COLUMNS in res:
-                fk_string += "ALTER TABLE %s.%s ADD  CONSTRAINT  FOREIGN KEY ( %s ) REFERENCES %s " % (owner,table,  FK_COLUMNS, REF_TABLE)
-                if FK_COLUMNS != REF_COLUMNS:
-                    fk_string += " (%s) CONSTRAINT %s ;\n" % (REF_COLUMNS, CONSTRAINT_NAME.lower())
-                else:
-                    fk_string += " CONSTRAINT %s ;\n" % (CONSTRAINT_NAME.lower())
-            return fk_string   
+                                AND A.CONSTRAINT_TYPE='R'
+                                AND A.OWNER = B.OWNER  
+                                AND A.CONSTRAINT_NAME  = B.CONSTRAINT_NAME   
+                            GROUP BY A.OWNER,A.CONSTRAINT_NAME,A.R_CONSTRAINT_NAME
+                    ) FK,  ALL_CONS_COLUMNS R
+                WHERE FK.OWNER = R.OWNER
+                    AND FK.REF_NAME = R.CONSTRAINT_NAME
+                GROUP BY FK.CONSTRAINT_NAME, FK.REF_NAME,  R.TABLE_NAME, FK.FK_COLUMNS  
+             """        
+        for CONSTRAINT_NAME, REF_NAME, FK_COLUMNS, REF_TABLE,REF_COLUMNS in self.iter_rows('foreignkeys', owner, table.upper(), name=table.upper()):
+            fk_string = "ALTER TABLE %s.%s ADD  CONSTRAINT  FOREIGN KEY ( %s ) REFERENCES %s " % (owner,table,  FK_COLUMNS, REF_TABLE)
+            if FK_COLUMNS != REF_COLUMNS:
+                fk_string += " (%s) CONSTRAINT %s ;\n" % (REF_COLUMNS, CONSTRAINT_NAME.lower())
+            else:
+                fk_string += " CONSTRAINT %s ;\n" % (CONSTRAINT_NAME.lower())
+            yield fk_string
          
                 
-    def get_columns(self,owner,table):
-        column_query = """
-         SELECT COLUMN_ID,	COLUMN_NAME,	DATA_TYPE,  	DATA_LENGTH,	DATA_PRECISION,	DATA_SCALE,	
-                NULLABLE,	DEFAULT_ON_NULL	,  DEFAULT_LENGTH,	DATA_DEFAULT ,AVG_COL_LEN,CHAR_LENGTH,IDENTITY_COLUMN 
-                --,	NUM_DISTINCT,	
-                -- LOW_VALUE,	HIGH_VALUE	,DENSITY, NUM_NULLS	,
-                -- CHARACTER_SET_NAME	,CHAR_LENGTH, CHAR_USED	,IDENTITY_COLUMN,
-                -- EVALUATION_EDITION
-          FROM ALL_TAB_COLS	 
-         WHERE OWNER = '%s' AND TABLE_NAME = '%s'
-           AND USER_GENERATED = 'YES' 
-         ORDER BY COLUMN_ID
-        """
+    def get_column_rows(self,owner,table):
+        """ ALL_TAB_COLS rows of the user columns of table in COLUMN_ID order """
+        res = self.catalog_rows('columns', owner, table.upper())
+        if res is None:
+            res = self.fetch_all('columns', owner=owner.upper(), name=table.upper())
+        return res
+
+    def get_column_types(self, owner, table, res):
+        """ Informix type of every get_column_rows row : TYPE_OVERRIDES first, else the rules in one batch """
+        rule_types = self.get_cnv_rule_types([ (DATA_TYPE,DATA_LENGTH,DATA_PRECISION,DATA_SCALE,AVG_COL_LEN,CHAR_LENGTH)
+                                               for COLUMN_ID, COLUMN_NAME, DATA_TYPE, DATA_LENGTH, DATA_PRECISION, DATA_SCALE, *_, AVG_COL_LEN, CHAR_LENGTH, IDENTITY_COLUMN in res ])
+        profile = self.profiles.get((owner.upper(), table.upper()))
+        col_types = []
+        for (COLUMN_ID, COLUMN_NAME, DATA_TYPE, DATA_LENGTH, DATA_PRECISION, DATA_SCALE, *_, AVG_COL_LEN, CHAR_LENGTH, IDENTITY_COLUMN), rule_type in zip(res, rule_types):
+            col_type = self.get_cnv_dict_type(owner,table,COLUMN_NAME)
+            if col_type is None and profile is not None:
+                col_type = self.cnv_profiled_type(DATA_TYPE, DATA_LENGTH, AVG_COL_LEN, rule_type, profile.get(COLUMN_NAME), self.profile_options,
+                                                  precision=DATA_PRECISION, scale=DATA_SCALE)
+            col_types.append(rule_type if col_type is None else col_type)
+        return col_types
+
+    @classmethod
+    def cnv_profiled_type(cls, coltype, length, avg_col_length, rule_type, profile, options, precision=None, scale=None):
+        """ Tightest type holding the sampled values of a column, None to keep rule_type.
+            Character columns get options['headroom'] times the sampled length, at least options['min_varchar'] and never
+            above the declared length. NUMBER without precision or above 18 digits get one more integer digit than the sampled
+            range, never more than the declared precision - scale : an integer type only when the declared scale is 0, negative
+            or NULL and no fraction was sampled, else decimal with the declared scale ( the sampled fraction digits for NULL ) """
+        if profile is None:
+            return None
+        if coltype in ('VARCHAR', 'VARCHAR2', 'NVARCHAR2'):
+            if profile['max_bytes'] is None:
+                return None
+            size = min(length, max(options['min_varchar'], math.ceil(profile['max_bytes'] * options['headroom'])))
+            if size > 255:
+                return "lvarchar(%s)" % size
+            reserve = "%s,%s" % (size, avg_col_length) if avg_col_length is not None and 1 < avg_col_length < size else size
+            return "%s(%s)" % ('nvarchar' if coltype == 'NVARCHAR2' else 'varchar', reserve)
+        if coltype == 'NUMBER':
+            if profile['max_value'] is None:
+                return None
+            digits = len(str(int(max(abs(profile['min_value']), abs(profile['max_value']))))) + 1
+            if precision is not None:
+                digits = min(digits, precision - max(scale or 0, 0))
+            fraction = profile['fraction_digits'] if scale is None else max(scale, 0)
+            if fraction == 0:
+                for informix_type, limit in (('smallint', 32767), ('integer', 2147483647), ('bigint', 9223372036854775807)):
+                    if 10 ** digits - 1 <= limit:
+                        return informix_type
+            if digits + fraction > 32:
+                return None
+            return "decimal(%s,%s)" % (digits + fraction, fraction) if fraction else "decimal(%s)" % digits
+        return None
+
+    def get_columns(self,owner,table,res=None,col_types=None):
         column_string = ""
-        query = column_query % (owner.upper(), table.upper())
-        #print (query)
-    
-    
-        with self.conn.cursor() as cur:
-            cur.execute(query)
-            res = cur.fetchall()
-            for COLUMN_ID, COLUMN_NAME,	DATA_TYPE,  DATA_LENGTH,	DATA_PRECISION,	DATA_SCALE,	NULLABLE,  DEFAULT_ON_NULL,  DEFAULT_LENGTH,	DATA_DEFAULT, AVG_COL_LEN, CHAR_LENGTH, IDENTITY_COLUMN in res:  
-                column_string += '     ' if column_string == '' else '    ,'
-                column_string += " %s " % COLUMN_NAME.lower()
-                
-                col_type = self.get_cnv_dict_type(owner,table,COLUMN_NAME)
-                if col_type is None:
-                   col_type = self.get_cnv_rule_type(DATA_TYPE,DATA_LENGTH,DATA_PRECISION,DATA_SCALE,AVG_COL_LEN,CHAR_LENGTH)
-                
-                column_string += "\t\t" if len(COLUMN_NAME) < 9 else "\t"
-                column_string += col_type
-                
-                if DATA_DEFAULT is not None:
-                    column_string += " default '%s' " % DATA_DEFAULT   
-                
-                if NULLABLE == 'N':
-                    #constr_string = self.get_notnull_constraint(owner,table,COLUMN_NAME)
-                    #if constr_string is None:
-                    #    column_string += " NOT NULL "
-                    #else:
-                    #    column_string += constr_string  
-                    column_string += " NOT NULL "
-                column_string += "\n"
-            return column_string                
-
-            #print(column_string)
+        res = self.get_column_rows(owner, table) if res is None else res
+        col_types = self.get_column_types(owner, table, res) if col_types is None else col_types
+        for (COLUMN_ID, COLUMN_NAME,	DATA_TYPE,  DATA_LENGTH,	DATA_PRECISION,	DATA_SCALE,	NULLABLE,  DEFAULT_ON_NULL,  DEFAULT_LENGTH,	DATA_DEFAULT, AVG_COL_LEN, CHAR_LENGTH, IDENTITY_COLUMN), col_type in zip(res, col_types):  
+            column_string += '     ' if column_string == '' else '    ,'
+            column_string += " %s " % COLUMN_NAME.lower()
+            
+            column_string += "\t\t" if len(COLUMN_NAME) < 9 else "\t"
+            column_string += col_type
+            
+            if DATA_DEFAULT is not None:
+                column_string += " default '%s' " % DATA_DEFAULT   
+            
+            if NULLABLE == 'N':
+                #constr_string = self.get_notnull_constraint(owner,table,COLUMN_NAME)
+                #if constr_string is None:
+                #    column_string += " NOT NULL "
+                #else:
+                #    column_string += constr_string  
+                column_string += " NOT NULL "
+            column_string += "\n"
+        return column_string                
     
     
     def get_sequences(self, owner):
-        sequence_query = """
-                SELECT SEQUENCE_NAME, INCREMENT_BY, MIN_VALUE, MAX_VALUE, CYCLE_FLAG, ORDER_FLAG, CACHE_SIZE, LAST_NUMBER, SCALE_FLAG FROM ALL_SEQUENCES
-                WHERE SEQUENCE_OWNER = '%s'  
-             """        
-        sequence_string = ""
-        query = sequence_query % (owner.upper())
-        #print (query)
-        with self.conn.cursor() as cur:
-            cur.execute(query)
-            res = cur.fetchall()
-        if res is None:
-            return None
-        else:
-            for SEQUENCE_NAME, INCREMENT_BY, MIN_VALUE, MAX_VALUE, CYCLE_FLAG, ORDER_FLAG, CACHE_SIZE, LAST_NUMBER, SCALE_FLAG in res:
-                sequence_string += "CREATE SEQUENCE  %s.%s INCREMENT BY  %s  MAXVALUE %s MINVALUE %s  " %(owner,SEQUENCE_NAME,INCREMENT_BY, MAX_VALUE,MIN_VALUE)
-                sequence_string += " NOCYCLE "  if CYCLE_FLAG == 'N' else  " CYCLE "
-                sequence_string += " NOCACHE "  if CACHE_SIZE == 0  else    " CACHE %s " % CACHE_SIZE 
-                sequence_string += " NOORDER "  if ORDER_FLAG == 'N' else  " ORDER "
-                sequence_string += ";\n"              
-                sequence_string += "ALTER SEQUENCE  %s.%s restart with %s ;\n" % (owner,SEQUENCE_NAME,LAST_NUMBER )       
-            return sequence_string
+        for SEQUENCE_NAME, INCREMENT_BY, MIN_VALUE, MAX_VALUE, CYCLE_FLAG, ORDER_FLAG, CACHE_SIZE, LAST_NUMBER, SCALE_FLAG in self.iter_owner_rows('SEQUENCES', owner):
+            sequence_string = "CREATE SEQUENCE  %s.%s INCREMENT BY  %s  MAXVALUE %s MINVALUE %s  " %(owner,SEQUENCE_NAME,INCREMENT_BY, MAX_VALUE,MIN_VALUE)
+            sequence_string += " NOCYCLE "  if CYCLE_FLAG == 'N' else  " CYCLE "
+            sequence_string += " NOCACHE "  if CACHE_SIZE == 0  else    " CACHE %s " % CACHE_SIZE 
+            sequence_string += " NOORDER "  if ORDER_FLAG == 'N' else  " ORDER "
+            sequence_string += ";\n"              
+            sequence_string += "ALTER SEQUENCE  %s.%s restart with %s ;\n" % (owner,SEQUENCE_NAME,LAST_NUMBER )       
+            yield SEQUENCE_NAME, sequence_string
         
     def get_synonyms(self, owner):
-        synonym_query = """
-                    SELECT SYNONYM_NAME, TABLE_OWNER, TABLE_NAME, DB_LINK, ORIGIN_CON_ID FROM ALL_SYNONYMS
-                    WHERE OWNER='%s'
-             """        
-        synonym_string = ""
-        query = synonym_query % (owner.upper())
-        #print (query)
-        with self.conn.cursor() as cur:
-            cur.execute(query)
-            res = cur.fetchall()
-        if res is None:
-            return None
-        else:
-            for SYNONYM_NAME, TABLE_OWNER, TABLE_NAME, DB_LINK, ORIGIN_CON_ID in res:
-                synonym_string += "CREATE SYNONYM  %s.%s FOR  %s.%s  ; " %(owner,SYNONYM_NAME,TABLE_OWNER,TABLE_NAME) 
-            return synonym_string
+        for SYNONYM_NAME, TABLE_OWNER, TABLE_NAME, DB_LINK, ORIGIN_CON_ID in self.iter_owner_rows('SYNONYMS', owner):
+            yield SYNONYM_NAME, "CREATE SYNONYM  %s.%s FOR  %s.%s  ;\n" %(owner,SYNONYM_NAME,TABLE_OWNER,TABLE_NAME) 
         
     def get_procedures(self, owner):
-        procedure_query = """
-                SELECT T1.OBJECT_NAME AS PROCEDURE_NAME,
-                LISTAGG(T2.TEXT,'') WITHIN GROUP (ORDER BY  T2.LINE ) AS SOURCE 
-                FROM ALL_OBJECTS T1, ALL_SOURCE T2 
-                WHERE T1.OBJECT_NAME = T2.NAME
-                AND T1.OBJECT_TYPE IN ('PROCEDURE', 'FUNCTION')
-                AND T1.OWNER = '%s'
-                GROUP BY T1.OBJECT_NAME
-             """        
-        procedure_string = ""
-        query = procedure_query % (owner.upper())
-        #print (query)
-        with self.conn.cursor() as cur:
-            cur.execute(query)
-            res = cur.fetchall()
-        if res is None:
-            return None
-        else:
-            for PROCEDURE_NAME, SOURCE  in res:
-                procedure_string += "CREATE OR REPLACE %s \n\n" %(SOURCE) 
-            return procedure_string   
+        """ Procedures, functions, packages and package bodies of owner joined from their ALL_SOURCE lines.
+            Without catalog the lines come from one ordered scan fetched in batches, only one source is held at a time """
+        lines = self.catalog_rows('procedures', owner, owner.upper())
+        if lines is None:
+            lines = self.stream_bulk('PROCEDURES', owner)
+        for TYPE, NAME, SOURCE in Oracle_Catalog.sources(lines):
+            yield NAME, "CREATE OR REPLACE %s \n\n" %(SOURCE) 
         
     def get_views(self, owner):
-        view_query = """
-                    SELECT A.VIEW_NAME, A.TEXT_VC,
-                            LISTAGG('"'||B.COLUMN_NAME||'"',',') WITHIN GROUP (ORDER BY  B.COLUMN_ID) AS COLUMNS 
-                    FROM ALL_VIEWS A, ALL_TAB_COLS B
-                    WHERE A.OWNER='%s'
-                        AND A.OWNER=B.OWNER
-                        AND A.VIEW_NAME = B.TABLE_NAME 
-                    GROUP BY A.VIEW_NAME, A.TEXT_VC
-             """        
-        view_string = ""
-        query = view_query % (owner.upper())
-        #print (query)
-        with self.conn.cursor() as cur:
-            cur.execute(query)
-            res = cur.fetchall()
-        if res is None:
-            return None
-        else:
-            for VIEW_NAME,TEXT_VC, COLUMNS  in res:
-                view_string += "CREATE OR REPLACE VIEW %s.%s (%s) AS \n%s\n\n" %(owner,VIEW_NAME,COLUMNS,TEXT_VC) 
-            return view_string      
+        for VIEW_NAME,TEXT_VC, COLUMNS in self.iter_owner_rows('VIEWS', owner):
+            yield VIEW_NAME, "CREATE OR REPLACE VIEW %s.%s (%s) AS \n%s\n\n" %(owner,VIEW_NAME,COLUMNS,TEXT_VC) 
     
     def get_tiggers(self, owner):
-        trigger_query = """
-                SELECT TRIGGER_NAME,
-                       STATUS,
-                       DESCRIPTION,
-                       TRIGGER_BODY 
-                 FROM ALL_TRIGGERS A
-                WHERE A.OWNER='%s' 
-             """        
-        trigger_string = ""
-        query = trigger_query % (owner.upper())
-        #print (query)
-        with self.conn.cursor() as cur:
-            cur.execute(query)
-            res = cur.fetchall()
-        if res is None:
-            return None
-        else:
-            for TRIGGER_NAME,STATUS, DESCRIPTION,TRIGGER_BODY  in res:
-                trigger_string += "CREATE OR REPLACE TRIGGER %s.%s%s\n\n" %(owner,DESCRIPTION,TRIGGER_BODY) 
-                if STATUS == 'DISABLED':
-                    trigger_string += "SET TRIGGER %s DISABLED;" % (TRIGGER_NAME.lower())
-            return trigger_string    
+        for TRIGGER_NAME,STATUS, DESCRIPTION,TRIGGER_BODY in self.iter_owner_rows('TRIGGERS', owner):
+            trigger_string = "CREATE OR REPLACE TRIGGER %s.%s%s\n\n" %(owner,DESCRIPTION,TRIGGER_BODY) 
+            if STATUS == 'DISABLED':
+                trigger_string += "SET TRIGGER %s DISABLED;\n" % (TRIGGER_NAME.lower())
+            yield TRIGGER_NAME, trigger_string
 
     def get_part_colname(self,owner,type,name):
-        column_query = """
-                    SELECT NAME,LISTAGG(COLUMN_NAME,',') WITHIN GROUP (ORDER BY COLUMN_POSITION) AS PARTCOLS 
-                      FROM ALL_PART_KEY_COLUMNS
-                     WHERE OWNER='%s' 
-                       AND OBJECT_TYPE = '%s'
-                       AND NAME = '%s'
-                     GROUP BY NAME
-             """        
         column_string = ""
-        query = column_query % (owner.upper(), type.upper(), name.upper())
-        with self.conn.cursor() as cur:
-            cur.execute(query)
-            res = cur.fetchone()
+        rows = self.catalog_rows('part_colname', owner, (type.upper(), name.upper()))
+        if rows is None:
+            res = self.fetch_one('part_colname', owner=owner.upper(), object_type=type.upper(), name=name.upper())
+        else:
+            res = rows[0] if rows else None
         if res is None:
             return None
         else:
@@ -576,42 +2173,81 @@ class Oracle_Source:
            return partcols
         
 
+    def get_key_histograms(self, owner):
+        """ { (TABLE_NAME, COLUMN_NAME): histogram rows } of the partition keys of owner from the catalog, None when not prefetched """
+        rows = self.catalog_rows('key_histograms', owner, owner.upper())
+        if rows is None:
+            return None
+        histograms = self.key_histograms.get(owner.upper())
+        if histograms is None:
+            histograms = {}
+            for TABLE_NAME, COLUMN_NAME, *row in rows:
+                histograms.setdefault((TABLE_NAME, COLUMN_NAME), []).append(tuple(row))
+            self.key_histograms[owner.upper()] = histograms
+        return histograms
+
+    def get_key_distribution(self, owner, table, column):
+        """ ( [ (value, rows) ], exact ) of a partition key column for the Fragment_Planner :
+            the ALL_TAB_HISTOGRAMS endpoints ( from the catalog when prefetched ), else NTILE buckets of a parallel
+            SAMPLE BLOCK of the table, a query per table only for the keys without histogram.
+            (None, False) when neither can be read, the sample needs a connection """
+        histograms = self.get_key_histograms(owner)
+        if histograms is not None:
+            histogram = histograms.get((table.upper(), column.upper()), [])
+        elif self.conn is None:
+            return None, False
+        else:
+            with self.conn.cursor() as cur:
+                histogram = self.fetch_rows(cur, 'key_histogram', { 'owner': owner.upper(), 'name': table.upper(), 'column_name': column.upper() })
+        distribution = []
+        previous = 0
+        exact = False
+        for HISTOGRAM, DATA_TYPE, ENDPOINT_NUMBER, ENDPOINT_VALUE, ENDPOINT_ACTUAL_VALUE in histogram:
+            exact = HISTOGRAM in ('FREQUENCY', 'TOP-FREQUENCY')
+            if DATA_TYPE in ('NUMBER', 'FLOAT'):
+                value = ENDPOINT_VALUE
+            elif DATA_TYPE == 'DATE' or DATA_TYPE.startswith('TIMESTAMP'):
+                # julian day number, the fraction is the time of day
+                value = datetime.datetime.fromordinal(int(ENDPOINT_VALUE) - 1721425) + datetime.timedelta(days=ENDPOINT_VALUE % 1)
+                value = value.replace(microsecond=0)
+            else:
+                value = ENDPOINT_ACTUAL_VALUE
+            if value is None:
+                distribution = []
+                break
+            distribution.append((value, ENDPOINT_NUMBER - previous))
+            previous = ENDPOINT_NUMBER
+        if len(distribution) > 1:
+            return Fragment_Planner.merge(distribution), exact
+
+        if self.conn is None:
+            return None, False
+        planner = self.fragment_planner
+        with self.conn.cursor() as cur:
+            try:
+                buckets = self.fetch_rows(cur, 'key_sample', query=self.TABLE_QUERIES['key_sample'] % (planner.parallel, column, planner.BUCKETS, column,
+                                                                                                      owner.upper(), table.upper(), planner.sample, column))
+            except Exception as error:
+                # the driver is imported only to tell its errors, a stand-in connection runs without it
+                import oracledb
+                if not isinstance(error, oracledb.Error):
+                    raise
+                print("%s.%s : %s not sampled, %s" % (owner, table, column, str(error).splitlines()[0]), file=sys.stderr)
+                return None, False
+        if not buckets:
+            return None, False
+        exact = all( MIN_VALUE == MAX_VALUE for MIN_VALUE, MAX_VALUE, ROWS in buckets )
+        return Fragment_Planner.merge( (MAX_VALUE, ROWS) for MIN_VALUE, MAX_VALUE, ROWS in buckets ), exact
+
     def get_table_partition(self, owner, table):
-        partition_query = """
-		SELECT B.TABLE_NAME,B.PARTITIONING_TYPE, B.PARTITION_COUNT,
-			LISTAGG(C.PARTITION_NAME,',') WITHIN GROUP (ORDER BY  C.PARTITION_POSITION) AS PARTITIONS,
-			LISTAGG(C.TABLESPACE_NAME,',') WITHIN GROUP (ORDER BY  C.PARTITION_POSITION) AS TABLSPACES,
-			LISTAGG( 
-				DECODE(B.PARTITIONING_TYPE,'LIST',
-					extractvalue(dbms_xmlgen.getxmltype(
-       		         			'SELECT HIGH_VALUE
-       		           		  FROM ALL_TAB_PARTITIONS 
-     							 WHERE TABLE_OWNER = '''||A.OWNER||''' AND TABLE_NAME = ''' ||A.TABLE_NAME ||  
-     							 ''' AND PARTITION_NAME = ''' || C.PARTITION_NAME || ''' AND PARTITION_POSITION = '''|| C.PARTITION_POSITION || ''''), '//text()' )
-     			,' ') ,',') WITHIN GROUP (ORDER BY  C.PARTITION_POSITION) AS HIGH_VALUES	
-		FROM ALL_TABLES A, ALL_PART_TABLES B, ALL_TAB_PARTITIONS C
-		WHERE A.OWNER='%s'
-                  AND A.TABLE_NAME = '%s'
-		  AND A.OWNER = B.OWNER 
-		  AND A.OWNER = C.TABLE_OWNER
-		  AND A.TABLE_NAME = B.TABLE_NAME 
-		  AND A.PARTITIONED ='YES'
-		  AND A.TABLE_NAME = C.TABLE_NAME
-		GROUP BY B.TABLE_NAME,B.PARTITIONING_TYPE,B.PARTITION_COUNT
-             """        
         partition_string = ""
-        query = partition_query % (owner.upper(), table.upper())
-        with self.conn.cursor() as cur:
-            cur.execute(query)
-            res = cur.fetchone()
+        rows = self.long_rows('table_partition', owner, table.upper())
+        res = rows[0] if rows else None
         if res is None:
             return None
         else:
             part_column = self.get_part_colname(owner,'TABLE',table)
-            (TABLE_NAME,PARTITIONING_TYPE,PARTITION_COUNT,PARTITIONS,TBLSPACES,HIGH_VALUES) = res	
-            partitions = re.split(r',',PARTITIONS)
-            tblspaces = re.split(r',',TBLSPACES)
-            hvalues = re.split(r',',HIGH_VALUES)
+            (TABLE_NAME,PARTITIONING_TYPE,PARTITION_COUNT,partitions,tblspaces,hvalues) = res	
 
             partition_string += "  fragment by "
             match PARTITIONING_TYPE:
@@ -623,73 +2259,23 @@ class Oracle_Source:
                            part_string += "partition  %s values (%s) in  %s  \n" % (partition, hvalue, tblspace)
                       partition_string += part_string
                       return partition_string
-                case 'HASH':
-                      #print("HASH %s " % part_column)
-                      match  part_column:
-                          case 'DEVICENUM':          # FOR TEST 
-                               partition_string += " expression  \n" 
-                               part_string = ""
-                               for (partition, tblspace, hvalue) in zip(self.DEVICE_PARTITIONS,self.DEVICE_TBLSPACES,self.DEVICE_HVALUES):
-                                   part_string += '    ' if part_string == "" else '   ,'
-                                   part_string += " partition  %s (%s) in  %s  \n" % (partition, hvalue, tblspace)
-                               partition_string += part_string
-                               return partition_string
-                          case  'GENDATETIME':
-                               partition_string += " LIST (GENDATETIME[1,4])  \n" 
-                               part_string = ""
-
-                               for (partition, tblspace, hvalue) in zip(self.GENDATE_PARTITIONS,self.GENDATE_TBLSPACES,self.GENDATE_HVALUES):
-                                   tblspace = 'datadbs' ## FOR TEST
-                                   part_string += '    ' if part_string == "" else '   ,'
-                                   part_string += " partition  %s " % (partition)
-                                   part_string += " VALUES " if hvalue != 'REMAINDER' else ' REMAINDER '
-                                   part_string += " (%s) " % hvalue if  hvalue != 'REMAINDER' else '      '
-                                   part_string += "in  %s  \n" % (tblspace)
-                               partition_string += part_string
-                               return partition_string
-
-                          case  _:
-                               return ""
+                case 'HASH' | 'RANGE':
+                      key_column = part_column.split(',')[0]
+                      distribution, exact = self.get_key_distribution(owner, table, key_column)
+                      return self.fragment_planner.fragment_clause(table, key_column, distribution, exact, tblspaces, len(partitions))
                 case _:
                     return ""
                 
 
-    def get_index_partition(self, owner, index):
-        partition_query = """
-		SELECT B.INDEX_NAME,B.PARTITIONING_TYPE, B.PARTITION_COUNT,
-			LISTAGG(C.PARTITION_NAME,',') WITHIN GROUP (ORDER BY  C.PARTITION_POSITION) AS PARTITIONS,
-			LISTAGG(C.TABLESPACE_NAME,',') WITHIN GROUP (ORDER BY  C.PARTITION_POSITION) AS TABLSPACES,
-			LISTAGG( 
-				DECODE(B.PARTITIONING_TYPE,'LIST',
-					extractvalue(dbms_xmlgen.getxmltype(
-       		         			'SELECT HIGH_VALUE
-       		           		  FROM ALL_IND_PARTITIONS 
-     							 WHERE INDEX_OWNER = '''||A.OWNER||''' AND INDEX_NAME = ''' ||A.INDEX_NAME ||  
-     							 ''' AND PARTITION_NAME = ''' || C.PARTITION_NAME || ''' AND PARTITION_POSITION = '''|| C.PARTITION_POSITION || ''''), '//text()' )
-     			,' ') ,',') WITHIN GROUP (ORDER BY  C.PARTITION_POSITION) AS HIGH_VALUES	
-		FROM ALL_INDEXES A, ALL_PART_INDEXES B, ALL_IND_PARTITIONS C
-		WHERE A.OWNER='%s'
-          AND A.INDEX_NAME = '%s'
-		  AND A.OWNER = B.OWNER 
-		  AND A.OWNER = C.INDEX_OWNER
-		  AND A.INDEX_NAME = B.INDEX_NAME 
-		  AND A.PARTITIONED ='YES'
-		  AND A.INDEX_NAME = C.INDEX_NAME
-		GROUP BY B.INDEX_NAME,B.PARTITIONING_TYPE,B.PARTITION_COUNT
-             """        
+    def get_index_partition(self, owner, index, table=None):
         partition_string = ""
-        query = partition_query % (owner.upper(), index.upper())
-        with self.conn.cursor() as cur:
-            cur.execute(query)
-            res = cur.fetchone()
+        rows = self.long_rows('index_partition', owner, index.upper())
+        res = rows[0] if rows else None
         if res is None:
             return None
         else:
             part_column = self.get_part_colname(owner,'INDEX',index)
-            (INDEX_NAME,PARTITIONING_TYPE,PARTITION_COUNT,PARTITIONS,TBLSPACES,HIGH_VALUES) = res	
-            partitions = re.split(r',',PARTITIONS)
-            tblspaces = re.split(r',',TBLSPACES)
-            hvalues = re.split(r',',HIGH_VALUES)
+            (INDEX_NAME,PARTITIONING_TYPE,PARTITION_COUNT,partitions,tblspaces,hvalues) = res	
 
             partition_string += "  fragment by "
             match PARTITIONING_TYPE:
@@ -702,41 +2288,10 @@ class Oracle_Source:
                            part_string += "partition  %s values (%s) in  %s  \n" % (partition, hvalue, tblspace)
                       partition_string += part_string
                       return partition_string
-                case 'HASH':
-                      #print("HASH %s " % part_column)
-                      match  part_column:
-                          case 'DEVICENUM':          # FOR TEST 
-                               partition_string += " expression  \n" 
-                               part_string = ""
-                               for (partition, tblspace, hvalue) in zip(self.DEVICE_PARTITIONS,self.DEVICE_TBLSPACES,self.DEVICE_HVALUES):
-                                   tblspace = 'datadbs' ## FOR TEST
-                                   part_string += '    ' if part_string == "" else '   ,'
-                                   part_string += " partition  %s (%s) in  %s  \n" % (partition, hvalue, tblspace)
-                               partition_string += part_string
-                               return partition_string
-                          case  'GENDATETIME':
-                               partition_string += " LIST (GENDATETIME[1,4])  \n" 
-                               part_string = ""
-
-                               for (partition, tblspace, hvalue) in zip(self.GENDATE_PARTITIONS,self.GENDATE_TBLSPACES,self.GENDATE_HVALUES):
-                                   tblspace = 'datadbs' ## FOR TEST
-                                   part_string += '    ' if part_string == "" else '   ,'
-                                   part_string += " partition  %s " % (partition)
-                                   part_string += " VALUES " if hvalue != 'REMAINDER' else ' REMAINDER '
-                                   part_string += " (%s) " % hvalue if  hvalue != 'REMAINDER' else '      '
-                                   part_string += "in  %s  \n" % (tblspace)
-                               partition_string += part_string
-                               return partition_string
-                          case  _:
-                               partition_string += " HASH ( %s )\n" % ( part_column )
-                               part_string = ""
-                               for (partition, tblspace, hvalue) in zip(partitions,tblspaces,hvalues):
-                                   tblspace = 'datadbs' ## FOR TEST
-                                   part_string += '    ' if part_string == "" else '   ,'
-                                   part_string += "partition  %s values (???) in  %s  \n" % (partition, tblspace)
-                               partition_string += part_string
-                               return partition_string
-                          
+                case 'HASH' | 'RANGE':
+                      key_column = part_column.split(',')[0]
+                      distribution, exact = (None, False) if table is None else self.get_key_distribution(owner, table, key_column)
+                      return self.fragment_planner.fragment_clause(index, key_column, distribution, exact, tblspaces, len(partitions), table=False)
                 case _:
                     return ""
 
@@ -805,158 +2360,1160 @@ class Oracle_Source:
 
 
     def get_index_cols(self,owner,index):
-        index_col_query = """
-            SELECT  CASE
-                     WHEN C.USER_GENERATED = 'YES' THEN B.COLUMN_NAME ||' '||DECODE(B.DESCEND,'ASC','',B.DESCEND)
-                     ELSE extractvalue(dbms_xmlgen.getxmltype(
-                           'SELECT DATA_DEFAULT
-                              FROM ALL_TAB_COLS
-                             WHERE TABLE_NAME = '''||B.TABLE_NAME||''' AND COLUMN_NAME = ''' ||  B.COLUMN_NAME || ''''), '//text()' ) ||' '||DECODE(B.DESCEND,'ASC','',B.DESCEND)
-                     END AS INDEX_COLNAME
-                FROM  ALL_IND_COLUMNS B, ALL_TAB_COLS C
-               WHERE B.INDEX_OWNER='%s'
-                 AND B.INDEX_NAME = '%s'
-                 AND B.TABLE_NAME = C.TABLE_NAME
-                 AND B.COLUMN_NAME = C.COLUMN_NAME
-            ORDER BY B.COLUMN_POSITION
-        """
         index_col_string = ""
-        query = index_col_query % (owner.upper(), index.upper())
-        #print (query)
-        with self.conn.cursor() as cur:
-            cur.execute(query)
-            res = cur.fetchall()
+        res = self.long_rows('index_cols', owner, index.upper())
         if res is None:
             return None
         else:
-            for INDEX_COLNAME in res:
+            for INDEX_COLNAME, in res:
                 index_col_string  += '' if index_col_string == '' else ','
                 index_col_string  += " %s"% INDEX_COLNAME
         return index_col_string
 
 
     def get_indexes(self, owner, table):
-        indexes_query = """
-                    SELECT A.INDEX_NAME AS INDEX_NAME,
-                           A.TABLESPACE_NAME AS TBLSPACE_NAME,
-                           A.PARTITIONED AS PARTITIONED,
-                           DECODE(A.UNIQUENESS,'NONUNIQUE',' ', A.UNIQUENESS) AS UNIQUENESS
-                      FROM ALL_INDEXES A
-                     WHERE A.OWNER='%s'
-                       AND A.TABLE_NAME = '%s'
-                       AND A.INDEX_NAME NOT IN
-                      (
-                          SELECT CONSTRAINT_NAME
-                            FROM ALL_CONSTRAINTS
-                           WHERE OWNER=A.OWNER
-                             AND TABLE_NAME='%s'
-                             AND CONSTRAINT_TYPE='U'
-                      )
-        """
-        indexes_string = ""
-        query = indexes_query % (owner.upper(), table.upper(),table.upper())
-        #print (query)
-        with self.conn.cursor() as cur:
-            cur.execute(query)
-            res = cur.fetchall()
-        if res is None:
-            return None
-        else:
-            for INDEX_NAME, UNIQUENESS,TBLSPACE_NAME,PARTITIONED in res:
-                TBLSPACE_NAME = 'datadbs' ## FOR TEST
-                indexes_string += "create "
-                if UNIQUENESS == "UNIQUE":
-                    indexes_string += "   unique "
-                else: 
-                    indexes_string += "   " 
+        for INDEX_NAME, TBLSPACE_NAME, PARTITIONED, UNIQUENESS in self.iter_rows('indexes', owner, table.upper(), name=table.upper()):
+            TBLSPACE_NAME = 'datadbs' ## FOR TEST
+            indexes_string = "create "
+            if UNIQUENESS == "UNIQUE":
+                indexes_string += "   unique "
+            else: 
+                indexes_string += "   " 
 
-                COLUMNS = self.get_index_cols(owner.upper(),INDEX_NAME)
+            COLUMNS = self.get_index_cols(owner.upper(),INDEX_NAME)
 
-                indexes_string += "index \"%s\".%s on \"%s\".%s ( %s ) " % ( owner.lower(), INDEX_NAME.lower(), owner.lower(),table.lower(), COLUMNS.lower())
-                if PARTITIONED != 'YES':
-                    indexes_string += "\n in  %s " % TBLSPACE_NAME
-                else:   
-                    indexes_string += "\n %s    " % self.get_index_partition(owner,INDEX_NAME)
-                indexes_string += ";\n"
-            return indexes_string   
+            indexes_string += "index \"%s\".%s on \"%s\".%s ( %s ) " % ( owner.lower(), INDEX_NAME.lower(), owner.lower(),table.lower(), COLUMNS.lower())
+            if PARTITIONED != 'YES':
+                indexes_string += "\n in  %s " % TBLSPACE_NAME
+            else:   
+                indexes_string += "\n %s    " % self.get_index_partition(owner,INDEX_NAME,table)
+            indexes_string += ";\n"
+            yield indexes_string
         
 
 
-    def make_user_schema(self,owner):
-        owner = owner.upper()
-        table_filter = "OWNER = '%s'  " % owner
-        res= self.get_tables(table_filter)
+    def table_schemas(self, tables):
+        """ make_table_schema of every get_tables row, always in the order of tables.
+            With the pool at most TABLE_WINDOW * workers tables are rendered ahead of the one written,
+            so a slow table holds back a bounded number of results instead of the whole schema """
+        if self.pool is None:
+            yield from map(self.make_table_schema, tables)
+            return
+        tables = iter(tables)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = collections.deque( executor.submit(self.make_pooled_table_schema, table_row)
+                                         for table_row in itertools.islice(tables, self.TABLE_WINDOW * self.workers) )
+            try:
+                while pending:
+                    statements = pending.popleft().result()
+                    for table_row in itertools.islice(tables, 1):
+                        pending.append(executor.submit(self.make_pooled_table_schema, table_row))
+                    yield statements
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def make_pooled_table_schema(self, table_row):
+        """ make_table_schema on a session of the pool, called from the worker threads """
+        with self.pool.acquire() as conn:
+            worker = copy.copy(self)
+            worker.conn = conn
+            return worker.make_table_schema(table_row)
+
+    def make_table_schema(self, table_row):
+        """ DDL of one get_tables row as a list of (Ddl_Writer kind, statement), timed into self.metrics """
+        OWNER, TABLE_NAME, *_ = table_row
+        with self.metrics.table(OWNER.upper(), TABLE_NAME) as entry:
+            statements = self.render_table_schema(table_row)
+            entry['fragments'] = self.table_sizes.get(OWNER.upper(), {}).get(TABLE_NAME, (0, 0, 0, 1))[3]
+            for kind, statement in statements:
+                entry['statements'][kind] = entry['statements'].get(kind, 0) + 1
+        return statements
+
+    def render_table_schema(self, table_row):
+        """ DDL of one get_tables row as a list of (Ddl_Writer kind, statement) """
+        OWNER, TABLE_NAME,TABLESPACE_NAME,STATUS, INITIAL_EXTENT, NEXT_EXTENT, PARTITIONED,READ_ONLY,AVG_ROW_LEN = table_row
+        owner = OWNER.upper()
+        TABLESPACE_NAME = 'datadbs' ## FOR TEST
+
+        res = self.get_column_rows(owner, TABLE_NAME)
+        col_types = self.get_column_types(owner, TABLE_NAME, res)
+        sizes = self.table_sizes.get(owner, {}).get(TABLE_NAME)
+        row_size = self.extent_advisor.row_size([ (col_type, AVG_COL_LEN) for (*_, AVG_COL_LEN, CHAR_LENGTH, IDENTITY_COLUMN), col_type in zip(res, col_types) ])
+        extents = None if sizes is None else self.extent_advisor.extents(*sizes, row_size)
+
         table_statement = ""
-        fk_string = ""
+        if extents is not None:
+            table_statement += "-- %s rows, row size %s, page size %sK\n" % (sizes[0], row_size, extents[0])
+        table_statement += "create table \"%s\".%s \n  ( \n" % (owner.lower(), TABLE_NAME.lower())
+        table_statement += self.get_columns(owner,TABLE_NAME,res,col_types)
+        table_statement += "  )\n"
+
+        if extents is None:
+            init_extent = INITIAL_EXTENT if INITIAL_EXTENT >  16  else 64;
+            next_extent = NEXT_EXTENT if NEXT_EXTENT >  16  else 64;
+        else:
+            page_size, init_extent, next_extent = extents
+
+        if PARTITIONED == 'YES':
+            table_statement += self.get_table_partition(OWNER,TABLE_NAME);
+        else:
+            table_statement += " in %s " %  (TABLESPACE_NAME)  
+
+        table_statement += "   extent size %s next size %s lock mode row;\n\n" % (init_extent, next_extent) 
+
+        statements = [ ('tables', table_statement) ]
+        statements += [ ('indexes', statement) for statement in self.get_indexes(owner,TABLE_NAME) ]
+        statements += [ ('constraints', statement) for statement in self.get_check_constraints(owner,TABLE_NAME) ]
+        statements += [ ('constraints', statement) for statement in self.get_unique_constraints(owner,TABLE_NAME) ]
+        statements += [ ('constraints', statement) for statement in self.get_primary_constraints(owner,TABLE_NAME) ]
+        with self.metrics.phase('foreignkeys'):
+            statements += [ ('foreignkeys', statement) for statement in self.get_foreignkey_constraints(owner,TABLE_NAME) ]
+        return statements
+
+    async def fetch_async(self, pool, semaphore, kind, query, binds=None):
+        """ fetchall of query on a session of the async pool with the fetch sizes of kind, at most semaphore queries in flight """
+        async with semaphore:
+            async with pool.acquire() as conn:
+                with conn.cursor() as cur:
+                    cur.arraysize, cur.prefetchrows = self.fetch_size(kind)
+                    started = time.perf_counter()
+                    await cur.execute(query, binds)
+                    rows = await cur.fetchall()
+                    self.metrics.query(kind, time.perf_counter() - started, len(rows), cur.arraysize, cur.prefetchrows)
+                    return rows
+
+    async def prefetch_catalog_async(self, owners, concurrency=32, optional=True):
+        """ Fill the catalogs of owners with the per-table queries of the get_* methods,
+            all issued at the same time on oracledb.create_pool_async sessions.
+            The owner level queries are read once for all owners, together with the table queries """
+        import oracledb
+
+        catalogs = { owner.upper(): Oracle_Catalog(owner) for owner in owners }
+        semaphore = asyncio.Semaphore(concurrency)
+        pool = oracledb.create_pool_async(user=self.username, password=self.password, dsn=self.conf['CONNECT_STRING'],
+                                          min=1, max=concurrency, increment=1, stmtcachesize=self.stmtcachesize)
+        try:
+            async def owner_rows(name, kind):
+                try:
+                    rows = await self.fetch_async(pool, semaphore, name, *Oracle_Catalog.bulk_query(name, catalogs))
+                except oracledb.Error as error:
+                    if name not in Oracle_Catalog.SEGMENT_FALLBACKS:
+                        raise
+                    print("%s : DBA_SEGMENTS not read, sizes from the statistics, %s" % (name, str(error).splitlines()[0]), file=sys.stderr)
+                    rows = await self.fetch_async(pool, semaphore, name, *Oracle_Catalog.bulk_query(name, catalogs, fallback=True))
+                for owner, catalog in catalogs.items():
+                    catalog.add(kind, owner, [ tuple(row[1:]) for row in rows if row[0] == owner ])
+
+            async def object_rows(catalog, kind, key, **binds):
+                rows = await self.fetch_async(pool, semaphore, kind, self.TABLE_QUERIES[kind], dict(binds, owner=catalog.owner))
+                catalog.add(kind, key, rows)
+                return rows
+
+            async def index_rows(catalog, table):
+                indexes = await object_rows(catalog, 'indexes', table, name=table)
+                await asyncio.gather(*[ partition_rows(catalog, 'INDEX', INDEX_NAME) for INDEX_NAME, _, PARTITIONED, _ in indexes if PARTITIONED == 'YES' ])
+
+            async def partition_rows(catalog, type, name):
+                await object_rows(catalog, 'part_colname', (type, name), object_type=type, name=name)
+
+            async def long_rows(name):
+                rows = await self.fetch_async(pool, semaphore, name, *Oracle_Catalog.bulk_query(name, catalogs))
+                for owner in catalogs:
+                    long_raw[owner][name] = [ tuple(row[1:]) for row in rows if row[0] == owner ]
+
+            async def expression_rows(owner):
+                rows = await self.fetch_async(pool, semaphore, 'index_expressions', self.TABLE_QUERIES['index_expressions'], { 'owner': owner })
+                expressions[owner] = { (TABLE_NAME, COLUMN_NAME): DATA_DEFAULT for TABLE_NAME, COLUMN_NAME, DATA_DEFAULT in rows }
+
+            long_raw = { owner: {} for owner in catalogs }
+            expressions = {}
+            owner_level = asyncio.gather(*[ owner_rows(name, kind) for name, kind in Oracle_Catalog.OWNER_KINDS.items()
+                                            if name != 'TABLES' and (optional or name not in Oracle_Catalog.OPTIONAL_BULK) ],
+                                         *[ long_rows(name) for name in Oracle_Catalog.LONG_VIEWS ],
+                                         *[ expression_rows(owner) for owner in catalogs ])
+            await owner_rows('TABLES', 'tables')
+
+            table_level = []
+            for owner, catalog in catalogs.items():
+                for OWNER, TABLE_NAME, TABLESPACE_NAME, STATUS, INITIAL_EXTENT, NEXT_EXTENT, PARTITIONED, READ_ONLY, AVG_ROW_LEN in catalog.get('tables', owner):
+                    for kind in ('columns','checks','uniques','primaries','foreignkeys'):
+                        table_level.append(object_rows(catalog, kind, TABLE_NAME, name=TABLE_NAME))
+                    table_level.append(index_rows(catalog, TABLE_NAME))
+                    if PARTITIONED == 'YES':
+                        table_level.append(partition_rows(catalog, 'TABLE', TABLE_NAME))
+            await asyncio.gather(owner_level, *table_level)
+        finally:
+            await pool.close()
+
+        for owner, catalog in catalogs.items():
+            catalog.groups.update(Oracle_Catalog.long_groups(long_raw[owner], expressions[owner]))
+
+        self.catalogs.update(catalogs)
+        return catalogs
+
+    def get_table_sizes(self, owner):
+        """ { TABLE_NAME: (NUM_ROWS, AVG_ROW_LEN, SEGMENT_KB, FRAGMENTS) } of owner for the Extent_Advisor """
+        return { TABLE_NAME: tuple(sizes) for TABLE_NAME, *sizes in self.iter_owner_rows('TABLE_SIZES', owner) }
+
+    def get_index_sizes(self, owner):
+        """ { INDEX_NAME: (TABLE_NAME, TABLESPACE_NAME, INDEX_KB) } of owner for the Post_Load_Writer """
+        return { INDEX_NAME: tuple(sizes) for INDEX_NAME, *sizes in self.iter_owner_rows('INDEX_SIZES', owner) }
+
+    def get_ddl_versions(self, owner):
+        """ {(OBJECT_TYPE, OBJECT_NAME): version} from ALL_OBJECTS, a table version also covers its indexes """
+        versions = {}
+        index_counts = {}
+        for OBJECT_TYPE, OBJECT_NAME, DDL_VERSION in self.iter_owner_rows('DDL_VERSIONS', owner):
+            key = (OBJECT_TYPE, OBJECT_NAME)
+            if key in versions and DDL_VERSION is not None:
+                DDL_VERSION = max(versions[key], DDL_VERSION)
+            versions[key] = DDL_VERSION
+            index_counts[key] = index_counts.get(key, -1) + 1
+        for key, count in index_counts.items():
+            if key[0] == 'TABLE' and versions[key] is not None:
+                versions[key] = "%s#%s" % (versions[key], count)
+        return versions
+
+    def conversion_inputs(self, owner):
+        """ Digest of everything besides the dictionary that shapes the DDL of owner : this module, the TYPE_CONV_FORCE_TABLE file,
+            the extent, fragment and profile options and the profiles of owner. A cached object rendered with another digest is stale """
+        inputs = hashlib.sha256()
+        for file_name in (__file__, self.conf['TYPE_CONV_FORCE_TABLE']):
+            with open(file_name, 'rb') as input_file:
+                inputs.update(hashlib.sha256(input_file.read()).digest())
+        options = { 'extent': vars(self.extent_advisor),
+                    'fragment': (self.fragment_planner.dbspaces, self.fragment_planner.fragments, self.fragment_planner.sample),
+                    'profile': self.profile_options,
+                    'profiles': sorted( (TABLE_NAME, profile) for (OWNER, TABLE_NAME), profile in self.profiles.items() if OWNER == owner.upper() ) }
+        inputs.update(json.dumps(options, sort_keys=True, default=str).encode('utf-8'))
+        return inputs.hexdigest()
+
+    def stale_objects(self, owner, cache, versions, inputs=None):
+        """ Objects whose cached DDL can not be used, the changes since the last run are reported on stderr.
+            A cached object of other conversion inputs is changed as well """
+        cached = cache.versions(owner)
+        added   = sorted( key for key in versions if key not in cached )
+        changed = sorted( key for key in versions if key in cached and (cached[key] != (versions[key], inputs) or versions[key] is None) )
+        dropped = sorted( key for key in cached if key not in versions )
+        if any( cached_inputs != inputs for key, (_, cached_inputs) in cached.items() if key in versions ):
+            print("%s : conversion inputs changed since the cached run, the objects rendered with them are converted again" % owner, file=sys.stderr)
+        for state, keys in (('added', added), ('changed', changed), ('dropped', dropped)):
+            for object_type, object_name in keys:
+                print("%-8s %-10s %s.%s" % (state, object_type, owner, object_name), file=sys.stderr)
+        print("%s : %d added, %d changed, %d dropped, %d unchanged" % (owner, len(added), len(changed), len(dropped),
+              len(versions) - len(added) - len(changed)), file=sys.stderr)
+        for object_type, object_name in dropped:
+            cache.delete(owner, object_type, object_name)
+        return set(added) | set(changed)
+
+    def schema_offsets(self, owner):
+        """ Ddl_Writer offsets of owner in the journal, None when its files start over """
+        if self.journal is None:
+            return None
+        return self.journal.offsets.get(('schema', owner.upper()))
+
+    def make_user_schema(self,owner,writer=None,cache=None,post_load=None):
+        """ Convert every object of owner and stream the statements to writer ( Ddl_Writer, stdout by default ).
+            With a Ddl_Cache only the objects changed since the last run are queried and rendered,
+            with a Post_Load_Writer the indexes and constraints go to its post-load batches instead of writer.
+            With a journal every finished table and phase is recorded after writer.checkpoint()
+            and the ones finished by an earlier run are skipped ( writer is opened with schema_offsets ) """
+        owner = owner.upper()
+        own_writer = writer is None
+        writer = Ddl_Writer() if own_writer else writer
+        journal = self.journal
+        if journal is not None and journal.count('schema', owner):
+            print("%s : resuming after %d finished tables and phases" % (owner, journal.count('schema', owner)), file=sys.stderr)
+        if cache is not None:
+            versions = self.get_ddl_versions(owner)
+            inputs = self.conversion_inputs(owner)
+            stale = self.stale_objects(owner, cache, versions, inputs)
+
+        self.table_sizes[owner] = self.get_table_sizes(owner)
+        index_sizes = {} if post_load is None else self.get_index_sizes(owner)
+
+        res = self.catalog_rows('tables', owner, owner)
         if res is None:
+            res= self.get_tables(owner)
+        if not res:
             print ("No table found !!!\n")
+        if cache is None:
+            tables = res
+        else:
+            tables = [ table_row for table_row in res if ('TABLE', table_row[1]) not in versions or ('TABLE', table_row[1]) in stale ]
+        if journal is not None:
+            tables = [ table_row for table_row in tables if not journal.done('schema', owner, 'table', table_row[1]) ]
+        with self.metrics.phase('tables'):
+            rendered = self.table_schemas(tables)
+            for table_row in res:
+                TABLE_NAME = table_row[1]
+                if journal is not None and journal.done('schema', owner, 'table', TABLE_NAME):
+                    for kind, statement in journal.result('schema', owner, 'table', TABLE_NAME) if post_load is not None else []:
+                        post_load.add(owner, TABLE_NAME, kind, statement, index_sizes)
+                    continue
+                if cache is not None and ('TABLE', TABLE_NAME) in versions and ('TABLE', TABLE_NAME) not in stale:
+                    statements = cache.statements(owner, 'TABLE', TABLE_NAME)
+                else:
+                    statements = next(rendered)
+                    if cache is not None and ('TABLE', TABLE_NAME) in versions:
+                        cache.put(owner, 'TABLE', TABLE_NAME, versions[('TABLE', TABLE_NAME)], statements, inputs)
+                for kind, statement in statements:
+                    if post_load is not None and kind in post_load.KINDS:
+                        post_load.add(owner, TABLE_NAME, kind, statement, index_sizes)
+                    else:
+                        writer.write(kind, statement)
+                writer.write('tables', "\n")
+                if journal is not None:
+                    post_load_statements = [ (kind, statement) for kind, statement in statements if post_load is not None and kind in post_load.KINDS ]
+                    journal.record('schema', owner, 'table', TABLE_NAME, writer.checkpoint(), post_load_statements)
+
+        for kind, object_type, get_statements in (('sequences', 'SEQUENCE', self.get_sequences), ('synonyms', 'SYNONYM', self.get_synonyms),
+                                                  ('procedures', 'PROCEDURE', self.get_procedures), ('views', 'VIEW', self.get_views),
+                                                  ('triggers', 'TRIGGER', self.get_tiggers)):
+            if journal is not None and journal.done('schema', owner, 'phase', kind):
+                continue
+            with self.metrics.phase(kind):
+                if cache is None:
+                    for name, statement in get_statements(owner):
+                        writer.write(kind, statement)
+                else:
+                    names = sorted( name for (version_type, name) in versions if version_type == object_type )
+                    rendered = {}
+                    if any( (object_type, name) in stale for name in names ):
+                        for name, statement in get_statements(owner):
+                            if (object_type, name) in stale:
+                                rendered.setdefault(name, []).append((kind, statement))
+                    for name in names:
+                        if (object_type, name) in stale:
+                            statements = rendered.get(name, [])
+                            cache.put(owner, object_type, name, versions[(object_type, name)], statements, inputs)
+                        else:
+                            statements = cache.statements(owner, object_type, name)
+                        for statement_kind, statement in statements:
+                            writer.write(statement_kind, statement)
+            if journal is not None:
+                journal.record('schema', owner, 'phase', kind, writer.checkpoint())
+
+        if own_writer:
+            writer.close()
+
+    def get_unl_columns(self, owner, table, hex_bytes=True):
+        """ (select expression, column name, data type, formatter) of every column of get_columns for unload.
+            Dates and numbers are made Informix literals by TO_CHAR and fetched as str ( formatter None ),
+            the formatter turns any other fetched value into the text of the UNL field.
+            Without hex_bytes binary columns are kept as bytes, for the parameters of load """
+        def lob_text(value):
+            return value.read()
+
+        def lob_bytes(value):
+            return value.read().hex() if hex_bytes else value.read()
+
+        def raw_bytes(value):
+            return value.hex() if hex_bytes else value
+
+        def interval_day(value):
+            seconds = value.seconds
+            return "%d %02d:%02d:%02d.%05d" % (value.days, seconds // 3600, seconds % 3600 // 60, seconds % 60, value.microseconds // 10)
+
+        columns = []
+        for COLUMN_ID, COLUMN_NAME, DATA_TYPE, DATA_LENGTH, DATA_PRECISION, DATA_SCALE, NULLABLE, DEFAULT_ON_NULL, DEFAULT_LENGTH, DATA_DEFAULT, AVG_COL_LEN, CHAR_LENGTH, IDENTITY_COLUMN in self.get_column_rows(owner, table):
+            column = '"%s"' % COLUMN_NAME
+            if DATA_TYPE == 'DATE':
+                columns.append(("TO_CHAR(%s, 'YYYY-MM-DD HH24:MI:SS')" % column, COLUMN_NAME, DATA_TYPE, None))
+            elif DATA_TYPE.startswith('TIMESTAMP'):
+                fraction = min(DATA_SCALE or 0, 5)
+                columns.append(("TO_CHAR(%s, 'YYYY-MM-DD HH24:MI:SS%s')" % (column, ".FF%d" % fraction if fraction else ''), COLUMN_NAME, DATA_TYPE, None))
+            elif DATA_TYPE in ('NUMBER', 'FLOAT', 'BINARY_FLOAT', 'BINARY_DOUBLE'):
+                columns.append(("TO_CHAR(%s, 'TM9')" % column, COLUMN_NAME, DATA_TYPE, None))
+            elif DATA_TYPE.startswith('INTERVAL YEAR'):
+                columns.append(("EXTRACT(YEAR FROM %s) || '-' || EXTRACT(MONTH FROM %s)" % (column, column), COLUMN_NAME, DATA_TYPE, None))
+            elif DATA_TYPE.startswith('INTERVAL DAY'):
+                columns.append((column, COLUMN_NAME, DATA_TYPE, interval_day))
+            elif DATA_TYPE in ('CLOB', 'NCLOB'):
+                columns.append((column, COLUMN_NAME, DATA_TYPE, lob_text))
+            elif DATA_TYPE in ('BLOB', 'BFILE'):
+                columns.append((column, COLUMN_NAME, DATA_TYPE, lob_bytes))
+            elif DATA_TYPE in ('RAW', 'LONG RAW'):
+                columns.append((column, COLUMN_NAME, DATA_TYPE, raw_bytes))
+            elif DATA_TYPE == 'XMLTYPE':
+                columns.append(("XMLSERIALIZE(CONTENT %s AS CLOB)" % column, COLUMN_NAME, DATA_TYPE, lob_text))
+            elif DATA_TYPE == 'MDSYS.SDO_GEOMETRY':
+                columns.append(("SDO_UTIL.TO_WKTGEOMETRY(%s)" % column, COLUMN_NAME, DATA_TYPE, lob_text))
+            elif DATA_TYPE in ('CHAR', 'NCHAR', 'VARCHAR', 'VARCHAR2', 'NVARCHAR2', 'LONG'):
+                columns.append((column, COLUMN_NAME, DATA_TYPE, None))
+            else:
+                columns.append((column, COLUMN_NAME, DATA_TYPE, str))
+        return columns
+
+    def iter_batches(self, cur):
+        """ fetchmany batches of cur, at most cur.arraysize rows are held at a time """
+        while True:
+            rows = cur.fetchmany()
+            if not rows:
+                break
+            yield rows
+
+    def unl_chunks(self, batches, formatters, delimiter='|', escape='\\'):
+        """ One UNL text chunk and its row count per batch.
+            Fields are joined with \\x00 and rows with \\x01 so a whole batch is escaped by a few str.replace,
+            a batch whose data already holds these characters is escaped field by field """
+        converts = [ (position, formatter) for position, formatter in enumerate(formatters) if formatter is not None ]
+        separators = len(formatters) - 1
+
+        def escaped(text):
+            return text.replace(escape, escape + escape).replace(delimiter, escape + delimiter).replace("\n", escape + "\n")
+
+        for rows in batches:
+            if converts:
+                rows = [ list(row) for row in rows ]
+                for row in rows:
+                    for position, formatter in converts:
+                        if row[position] is not None:
+                            row[position] = formatter(row[position])
+            chunk = "\x01".join([ "\x00".join(row) if None not in row else "\x00".join([ '' if value is None else value for value in row ])
+                                   for row in rows ]) + "\x01"
+            if chunk.count("\x00") == len(rows) * separators and chunk.count("\x01") == len(rows):
+                chunk = escaped(chunk).replace("\x00", delimiter).replace("\x01", delimiter + "\n")
+            else:
+                chunk = "".join( delimiter.join([ '' if value is None else escaped(value) for value in row ]) + delimiter + "\n"
+                                 for row in rows )
+            yield chunk, len(rows)
+
+    def lob_fields(self, batches, lob_columns, width, lob_reader):
+        """ Rows of the unload query with the LOB columns resolved : the inline value of a small LOB
+            ( hex for BLOB ) or the side file reference of a large one, read in parallel by lob_reader.
+            Every lob column adds a ROWID column after the width UNL fields, set only for large LOBs """
+        for rows in batches:
+            rows = [ list(row) for row in rows ]
+            pending = []
+            for row in rows:
+                for rowid_position, (position, query, binary) in enumerate(lob_columns, width):
+                    if row[rowid_position] is not None:
+                        pending.append((row, position, lob_reader.submit(query, row[rowid_position])))
+                    elif binary and row[position] is not None:
+                        row[position] = row[position].hex()
+                del row[width:]
+            for row, position, reference in pending:
+                row[position] = reference.result()
+            yield rows
+
+    def unload_table(self, table_row, output_dir, options, subset=None):
+        """ Stream the rows of one get_tables row into UNL files of output_dir,
+            returns the LOAD statement of every file written.
+            CLOB/BLOB values up to options['lob_inline'] are fetched with the row, larger ones go through a Lob_Reader.
+            subset (name suffix, where, binds) unloads only the rows of a verify chunk or a delta into <name><suffix> files """
+        import oracledb
+
+        OWNER, TABLE_NAME, *_ = table_row
+        delimiter = options['delimiter']
+        name = "%s.%s" % (OWNER.lower(), TABLE_NAME.lower())
+        if subset is not None:
+            name += subset[0]
+        columns = self.get_unl_columns(OWNER, TABLE_NAME)
+        expressions = [ expression for expression, _, _, _ in columns ]
+        formatters = [ formatter for _, _, _, formatter in columns ]
+        lob_columns = []
+        for position, (expression, COLUMN_NAME, DATA_TYPE, formatter) in enumerate(columns):
+            if DATA_TYPE in ('CLOB', 'NCLOB', 'BLOB'):
+                expressions[position] = "CASE WHEN DBMS_LOB.GETLENGTH(%s) <= %d THEN %s END AS \"LOB_INLINE_%d\"" % (expression, options['lob_inline'], expression, position)
+                expressions.append("CASE WHEN DBMS_LOB.GETLENGTH(%s) > %d THEN ROWIDTOCHAR(ROWID) END" % (expression, options['lob_inline']))
+                formatters[position] = None
+                lob_columns.append((position, "SELECT %s FROM \"%s\".\"%s\" WHERE ROWID = CHARTOROWID(:rid)" % (expression, OWNER, TABLE_NAME), DATA_TYPE == 'BLOB'))
+        query = 'SELECT %s FROM "%s"."%s"' % (", ".join(expressions), OWNER, TABLE_NAME)
+        if subset is not None:
+            query += " WHERE %s" % subset[1]
+
+        def inline_lobs(cursor, metadata):
+            if metadata.name.startswith('LOB_INLINE_'):
+                if metadata.type_code in (oracledb.DB_TYPE_CLOB, oracledb.DB_TYPE_NCLOB):
+                    return cursor.var(oracledb.DB_TYPE_LONG, arraysize=cursor.arraysize)
+                if metadata.type_code is oracledb.DB_TYPE_BLOB:
+                    return cursor.var(oracledb.DB_TYPE_LONG_RAW, arraysize=cursor.arraysize)
+
+        if self.lob_pool is not None:
+            acquire, readers = self.lob_pool.acquire, options['lob_readers']
+        else:
+            acquire, readers = lambda: contextlib.nullcontext(self.conn), 1
+        sync = self.journal is not None and subset is None
+        with Unl_Writer(output_dir, name, options['max_bytes'], sync=sync) as writer, \
+             Lob_Reader(acquire, output_dir, name, readers, options['lob_chunk'], sync=sync) as lob_reader:
+            with self.conn.cursor() as cur:
+                cur.arraysize = options['arraysize']
+                cur.prefetchrows = options['arraysize']
+                cur.outputtypehandler = inline_lobs
+                cur.execute(query, {} if subset is None else subset[2])
+                batches = self.iter_batches(cur)
+                if lob_columns:
+                    batches = self.lob_fields(batches, lob_columns, len(columns), lob_reader)
+                for data, rows in self.unl_chunks(batches, formatters, delimiter, options['escape']):
+                    writer.write(data, rows)
+        print("%s.%s : %d rows, %d files, %d lob files" % (OWNER, TABLE_NAME, writer.rows, len(writer.files), len(lob_reader.side_files)), file=sys.stderr)
+        column_list = ", ".join( name.lower() for _, name, _, _ in columns )
+        statements = [ "LOAD FROM '%s' DELIMITER '%s' INSERT INTO \"%s\".%s (%s);\n" % (file_name, delimiter, OWNER.lower(), TABLE_NAME.lower(), column_list)
+                       for file_name in writer.files ]
+        if sync:
+            self.journal.record('unload', OWNER.upper(), 'table', TABLE_NAME, result=statements)
+        return statements
+
+    def map_tables(self, method, tables, *args):
+        """ method(table_row, *args) of every get_tables row, on the session pool with --workers, always in the order of tables """
+        if self.pool is None:
+            yield from map(lambda table_row: method(table_row, *args), tables)
         else:
-            for  OWNER, TABLE_NAME,TABLESPACE_NAME,STATUS, INITIAL_EXTENT, NEXT_EXTENT, PARTITIONED,READ_ONLY,AVG_ROW_LEN in res:
-                TABLESPACE_NAME = 'datadbs' ## FOR TEST
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                yield from executor.map(lambda table_row: self.pooled_call(method.__name__, table_row, *args), tables)
+
+    def pooled_call(self, method_name, *args):
+        """ method_name(*args) on a session of the pool, called from the worker threads.
+            The worker copy has no pool, so what it maps runs on its own session without another executor """
+        with self.pool.acquire() as conn:
+            worker = copy.copy(self)
+            worker.conn = conn
+            worker.pool = None
+            return getattr(worker, method_name)(*args)
 
-                table_statement = "create table \"%s\".%s \n  ( \n" % (owner.lower(), TABLE_NAME.lower())
-                table_statement += self.get_columns(owner,TABLE_NAME)           
-                table_statement += "  )\n"
+    def user_tables(self, owner):
+        """ get_tables rows of owner, from the catalog when prefetched """
+        owner = owner.upper()
+        tables = self.catalog_rows('tables', owner, owner)
+        if tables is None:
+            tables = self.get_tables(owner)
+        if self.only_tables is not None:
+            tables = [ table_row for table_row in tables if table_row[1] in self.only_tables ]
+        return tables
+
+    def get_references(self, owner, tables):
+        """ { TABLE_NAME: set of the tables its foreign keys reference } of get_tables rows, OWNER.TABLE for other owners """
+        references = {}
+        for OWNER, TABLE_NAME, *_ in tables:
+            for CONSTRAINT_NAME, REF_NAME, FK_COLUMNS, REF_TABLE, REF_COLUMNS in self.iter_rows('foreignkeys', owner, TABLE_NAME, name=TABLE_NAME):
+                references.setdefault(TABLE_NAME, set()).add(REF_TABLE)
+        return references
 
-                init_extent = INITIAL_EXTENT if INITIAL_EXTENT >  16  else 64;
-                next_extent = NEXT_EXTENT if NEXT_EXTENT >  16  else 64;
+    def make_load_plan(self, owner, output_dir):
+        """ Load_Waves of the tables of owner written to output_dir, the largest tables of a wave first """
+        owner = owner.upper()
+        tables = self.user_tables(owner)
+        sizes = { TABLE_NAME: NUM_ROWS * AVG_ROW_LEN for TABLE_NAME, (NUM_ROWS, AVG_ROW_LEN, SEGMENT_KB, FRAGMENTS) in self.get_table_sizes(owner).items() }
+        waves = Load_Waves([ table_row[1] for table_row in tables ], self.get_references(owner, tables))
+        for number, wave in enumerate(waves.write(owner, output_dir, sizes), 1):
+            print("%s wave %d : %d tables" % (owner, number, len(wave)), file=sys.stderr)
+        for cycle in waves.cycles():
+            print("%s reference cycle : %s" % (owner, ', '.join(cycle)), file=sys.stderr)
 
-                if PARTITIONED == 'YES':
-                    table_statement += self.get_table_partition(OWNER,TABLE_NAME);
+    def unload_user_data(self, owner, output_dir, options):
+        """ Unload every table of owner to output_dir and write load.sql with the LOAD statements in table order.
+            The tables a journal records as unloaded by an earlier run are not read again, their LOAD statements come from it """
+        owner = owner.upper()
+        os.makedirs(output_dir, exist_ok=True)
+        tables = self.user_tables(owner)
+        journal = self.journal
+        finished = set()
+        if journal is not None:
+            finished = { TABLE_NAME for OWNER, TABLE_NAME, *_ in tables if journal.done('unload', owner, 'table', TABLE_NAME) }
+        if finished:
+            print("%s : resuming, %d of %d tables already unloaded" % (owner, len(finished), len(tables)), file=sys.stderr)
+        unloaded = self.map_tables(self.unload_table, [ table_row for table_row in tables if table_row[1] not in finished ], output_dir, options)
+        with open(os.path.join(output_dir, 'load.sql'), 'w', encoding='utf-8') as load_file:
+            for OWNER, TABLE_NAME, *_ in tables:
+                if TABLE_NAME in finished:
+                    load_file.writelines(journal.result('unload', owner, 'table', TABLE_NAME))
                 else:
-                    table_statement += " in %s " %  (TABLESPACE_NAME)  
-
-                table_statement += "   extent size %s next size %s lock mode row;\n\n" % (init_extent, next_extent) 
-
-                table_statement += self.get_indexes(owner,TABLE_NAME) 
-                table_statement += "\n"                     
-
-                table_statement += self.get_check_constraints(owner,TABLE_NAME)       
-                table_statement += "\n"                     
-                table_statement += self.get_unique_constraints(owner,TABLE_NAME)                            
-                table_statement += "\n"                     
-                table_statement += self.get_primary_constraints(owner,TABLE_NAME)                            
-                table_statement += "\n"                     
-                fk_string += self.get_foreignkey_constraints(owner,TABLE_NAME)                           
-                fk_string += "\n"                     
-                print(table_statement)
-        
-        print("\n")
-        print(fk_string)
-        print("\n")
+                    load_file.writelines(next(unloaded))
+
+    def plan_verify(self, table_row, options):
+        """ Verify chunks of one get_tables row : ranges of the leading primary key column holding about
+            options['chunk_rows'] rows each, bounded by NTILE of a SAMPLE BLOCK, a single chunk for a smaller table
+            or without a usable key. Only the UNL fields Oracle writes as text are hashed ( no LOB, LONG, INTERVAL DAY ... ) """
+        import oracledb
+
+        OWNER, TABLE_NAME, *_ = table_row
+        columns = self.get_unl_columns(OWNER, TABLE_NAME)
+        hashed = []
+        for position, (expression, COLUMN_NAME, DATA_TYPE, formatter) in enumerate(columns):
+            if DATA_TYPE == 'RAW':
+                hashed.append((position, "LOWER(RAWTOHEX(%s))" % expression))
+            elif formatter is None and DATA_TYPE != 'LONG':
+                hashed.append((position, "TO_CHAR(%s)" % expression if DATA_TYPE in ('NCHAR', 'NVARCHAR2') else expression))
+        plan = { 'table_row': table_row, 'columns': len(columns), 'positions': [ position for position, _ in hashed ],
+                 'digest': Unl_Digest.sql([ expression for _, expression in hashed ]),
+                 'key': None, 'key_type': None, 'key_position': None, 'kind': None, 'bounds': [] }
+
+        primaries = self.iter_rows('primaries', OWNER, TABLE_NAME, name=TABLE_NAME)
+        key = next(iter(primaries), (None, None))[1]
+        key = key.split(',')[0] if key else None
+        NUM_ROWS = self.table_sizes.get(OWNER.upper(), {}).get(TABLE_NAME, (0, 0, 0, 1))[0]
+        for position, (expression, COLUMN_NAME, DATA_TYPE, formatter) in enumerate(columns):
+            if COLUMN_NAME == key and DATA_TYPE in self.CHUNK_KEYS and NUM_ROWS > options['chunk_rows']:
+                plan.update(key=key, key_type=DATA_TYPE, key_position=position, kind='number' if DATA_TYPE in ('NUMBER', 'FLOAT') else 'text')
+        if plan['key'] is None:
+            return plan
+
+        buckets = math.ceil(NUM_ROWS / options['chunk_rows'])
+        query = self.TABLE_QUERIES['chunk_bounds'] % (self.CHUNK_KEYS[plan['key_type']][0], key, buckets, key,
+                                                      OWNER, TABLE_NAME, options['sample'], key)
+        try:
+            with self.conn.cursor() as cur:
+                bounds = [ BOUND for BOUND, in self.fetch_rows(cur, 'chunk_bounds', query=query) ]
+        except oracledb.Error as error:
+            print("%s.%s : not chunked, %s" % (OWNER, TABLE_NAME, str(error).splitlines()[0]), file=sys.stderr)
+            bounds = []
+        plan['bounds'] = list(dict.fromkeys(bounds[:-1]))
+        return plan
+
+    def chunk_range(self, plan, number):
+        """ WHERE condition and binds of chunk number of a plan_verify plan : key above bound number-1 up to bound number """
+        conditions, binds = [], {}
+        if number > 0:
+            conditions.append('"%s" > %s' % (plan['key'], self.CHUNK_KEYS[plan['key_type']][1] % 'low'))
+            binds['low'] = plan['bounds'][number - 1]
+        if number < len(plan['bounds']):
+            conditions.append('"%s" <= %s' % (plan['key'], self.CHUNK_KEYS[plan['key_type']][1] % 'high'))
+            binds['high'] = plan['bounds'][number]
+        return " AND ".join(conditions) or "1 = 1", binds
+
+    def verify_chunk(self, chunk):
+        """ [rows, digest] of one (plan, number) chunk computed by Oracle, called on the session pool """
+        plan, number = chunk
+        OWNER, TABLE_NAME, *_ = plan['table_row']
+        where, binds = self.chunk_range(plan, number)
+        with self.conn.cursor() as cur:
+            ROWS, DIGEST = self.fetch_rows(cur, 'verify_chunk', binds, query=self.TABLE_QUERIES['verify_chunk'] % (plan['digest'], OWNER, TABLE_NAME, where), one=True)
+        return [ ROWS, int(DIGEST or 0) ]
+
+    def read_load_statements(self, output_dir):
+        """ { TABLE_NAME: [(UNL file, delimiter)] } of the load.sql of an unload into output_dir """
+        unl_files = {}
+        with open(os.path.join(output_dir, 'load.sql'), encoding='utf-8') as load_file:
+            for line in load_file:
+                match = re.match(r"LOAD FROM '(.*)' DELIMITER '(.*)' INSERT INTO \"[^\"]*\"\.(\S+) \(", line)
+                if match:
+                    unl_files.setdefault(match.group(3).upper(), []).append((match.group(1), match.group(2)))
+        return unl_files
+
+    def verify_user_data(self, owner, output_dir, options):
+        """ Compare the rows and digests of every chunk of every table of owner between Oracle and the unload in output_dir.
+            Oracle computes the chunks on the session pool while worker processes read the UNL files.
+            The mismatched chunks are reported in verify.json, with options['reextract'] their rows are unloaded again
+            into <name>.chunk_NNN files and reload.sql deletes and loads them. Returns the number of mismatched chunks """
+        owner = owner.upper()
+        self.table_sizes[owner] = self.get_table_sizes(owner)
+        unl_files = self.read_load_statements(output_dir)
+        plans = list(self.map_tables(self.plan_verify, self.user_tables(owner), options))
+
+        with ProcessPoolExecutor(max_workers=options['processes']) as processes:
+            unl_reads = [ [ processes.submit(Unl_Digest.read, os.path.join(output_dir, file_name), delimiter, options['escape'],
+                                             plan['positions'], plan['key_position'], plan['kind'], plan['bounds'])
+                            for file_name, delimiter in unl_files.get(plan['table_row'][1], []) ] for plan in plans ]
+            chunks = [ (plan, number) for plan in plans for number in range(len(plan['bounds']) + 1) ]
+            oracle_digests = iter(list(self.map_tables(self.verify_chunk, chunks)))
+            unl_digests = []
+            for plan, reads in zip(plans, unl_reads):
+                file_chunks = [ read.result() for read in reads ] or [ [ [0, 0] for number in range(len(plan['bounds']) + 1) ] ]
+                unl_digests += [ [ sum(column) for column in zip(*chunk) ] for chunk in zip(*file_chunks) ]
+
+        report = { 'owner': owner, 'tables': {} }
+        mismatched = []
+        unl_digests = iter(unl_digests)
+        for plan in plans:
+            OWNER, TABLE_NAME, *_ = plan['table_row']
+            table = { 'chunks': len(plan['bounds']) + 1, 'rows': 0, 'key': plan['key'], 'hashed_columns': len(plan['positions']),
+                      'columns': plan['columns'], 'mismatched': [] }
+            for number in range(len(plan['bounds']) + 1):
+                (oracle_rows, oracle_digest), (unl_rows, unl_digest) = next(oracle_digests), next(unl_digests)
+                table['rows'] += oracle_rows
+                if (oracle_rows, oracle_digest) != (unl_rows, unl_digest):
+                    bounds = [ None ] + plan['bounds'] + [ None ]
+                    table['mismatched'].append({ 'chunk': number, 'low': bounds[number], 'high': bounds[number + 1],
+                                                 'oracle_rows': oracle_rows, 'unl_rows': unl_rows,
+                                                 'oracle_digest': str(oracle_digest), 'unl_digest': str(unl_digest) })
+                    mismatched.append((plan, number))
+                    print("%s.%s chunk %d%s : %d rows in Oracle, %d in the UNL files%s" %
+                          (OWNER, TABLE_NAME, number, " (%s, %s]" % (bounds[number], bounds[number + 1]) if plan['bounds'] else '', oracle_rows, unl_rows,
+                           '' if oracle_digest == unl_digest or oracle_rows != unl_rows else ', other values'), file=sys.stderr)
+            print("%s.%s : %d rows, %d chunks, %d mismatched" % (OWNER, TABLE_NAME, table['rows'], table['chunks'], len(table['mismatched'])), file=sys.stderr)
+            report['tables'][TABLE_NAME] = table
+        with open(os.path.join(output_dir, 'verify.json'), 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=1)
+
+        if options['reextract'] and mismatched:
+            with open(os.path.join(output_dir, 'reload.sql'), 'w', encoding='utf-8') as reload_file:
+                for plan, number in mismatched:
+                    OWNER, TABLE_NAME, *_ = plan['table_row']
+                    where, binds = self.chunk_range(plan, number)
+                    delimiter = unl_files.get(TABLE_NAME, [ ('', options['delimiter']) ])[0][1]
+                    reload_file.write("DELETE FROM \"%s\".%s%s;\n" % (OWNER.lower(), TABLE_NAME.lower(), self.informix_range(plan, number)))
+                    reload_file.writelines(self.unload_table(plan['table_row'], output_dir, dict(options, delimiter=delimiter), (".chunk_%03d" % number, where, binds)))
+        return len(mismatched)
+
+    def informix_range(self, plan, number):
+        """ WHERE clause of chunk number of a plan_verify plan in Informix SQL, empty for a whole table """
+        def literal(bound):
+            return bound if plan['kind'] == 'number' else "'%s'" % bound.replace("'", "''")
+        conditions = []
+        if number > 0:
+            conditions.append("%s > %s" % (plan['key'].lower(), literal(plan['bounds'][number - 1])))
+        if number < len(plan['bounds']):
+            conditions.append("%s <= %s" % (plan['key'].lower(), literal(plan['bounds'][number])))
+        return " WHERE " + " AND ".join(conditions) if conditions else ""
+
+    def insert_batches(self, target, insert, batches, state, options, delete=None):
+        """ Consumer of load_table : executemany of every batch taken from batches ( a queue, None ends it ),
+            commit every options['commit_rows'] rows. delete (statement, key positions) first removes the rows of the batch by key.
+            After an error in state the queue is still drained so the producer never blocks """
+        target_conn = None
+        try:
+            target_conn = target.connect()
+            cur = target_conn.cursor()
+        except Exception as error:
+            state['error'] = error
+        uncommitted = 0
+        while (rows := batches.get()) is not None:
+            if state['error'] is not None:
+                continue
+            try:
+                if delete is not None:
+                    cur.executemany(delete[0], [ [ row[position] for position in delete[1] ] for row in rows ])
+                cur.executemany(insert, rows)
+                state['rows'] += len(rows)
+                uncommitted += len(rows)
+                if uncommitted >= options['commit_rows']:
+                    target_conn.commit()
+                    uncommitted = 0
+            except Exception as error:
+                state['error'] = error
+        if target_conn is not None:
+            try:
+                if state['error'] is None:
+                    target_conn.commit()
+            finally:
+                target_conn.close()
+
+    def load_table(self, table_row, target, options, subset=None, keys=None):
+        """ Insert the rows of one get_tables row into target. This thread fetches options['batch_size'] rows at a time
+            and an insert thread runs executemany, at most options['queue_size'] batches wait between the two.
+            subset (where, binds) loads only these rows, with the key columns keys the target rows of the same key are deleted first """
+        OWNER, TABLE_NAME, *_ = table_row
+        columns = self.get_unl_columns(OWNER, TABLE_NAME, hex_bytes=False)
+        names = [ name for _, name, _, _ in columns ]
+        insert = target.insert_statement(OWNER, TABLE_NAME, names)
+        delete = None
+        if keys:
+            delete = (target.delete_statement(OWNER, TABLE_NAME, keys), [ names.index(key) for key in keys ])
+        converts = [ (position, formatter) for position, (_, _, _, formatter) in enumerate(columns) if formatter is not None ]
+        query = 'SELECT %s FROM "%s"."%s"' % (", ".join( expression for expression, _, _, _ in columns ), OWNER, TABLE_NAME)
+        if subset is not None:
+            query += " WHERE %s" % subset[0]
+
+        batches = queue.Queue(maxsize=options['queue_size'])
+        state = { 'rows': 0, 'error': None }
+        with ThreadPoolExecutor(max_workers=1) as inserter:
+            inserted = inserter.submit(self.insert_batches, target, insert, batches, state, options, delete)
+            try:
+                with self.conn.cursor() as cur:
+                    cur.arraysize = options['batch_size']
+                    cur.prefetchrows = options['batch_size']
+                    cur.execute(query, {} if subset is None else subset[1])
+                    for rows in self.iter_batches(cur):
+                        if state['error'] is not None:
+                            break
+                        if converts:
+                            rows = [ list(row) for row in rows ]
+                            for row in rows:
+                                for position, formatter in converts:
+                                    if row[position] is not None:
+                                        row[position] = formatter(row[position])
+                        batches.put(rows)
+            finally:
+                batches.put(None)
+            inserted.result()
+        if state['error'] is not None:
+            raise state['error']
+        print("%s.%s : %d rows loaded" % (OWNER, TABLE_NAME, state['rows']), file=sys.stderr)
+        return state['rows']
+
+    def load_user_data(self, owner, target, options):
+        """ Insert every table of owner into target, returns the number of rows """
+        return sum(self.map_tables(self.load_table, self.user_tables(owner), target, options))
+
+    def delta_column(self, owner, table):
+        """ Watermark column of a table : --delta-columns OWNER.TABLE=COLUMN or TABLE=COLUMN, ORA_ROWSCN by default """
+        return self.delta_columns.get((owner, table)) or self.delta_columns.get((None, table)) or 'ORA_ROWSCN'
+
+    def delta_table(self, table_row, state, output_dir, target, options):
+        """ Rows of one get_tables row changed since its watermark in state : loaded into target
+            ( delete by primary key then insert ) or unloaded into <name>.delta files of output_dir, returns the
+            Informix statements merging these files. The new watermark is read before the rows and saved after them,
+            so a row changed meanwhile comes again in the next run. The first run of a table only saves its watermark.
+            ORA_ROWSCN is the SCN of the block without ROWDEPENDENCIES, unchanged rows of the block come along. Deleted rows are not seen """
+        OWNER, TABLE_NAME, *_ = table_row
+        column = self.delta_column(OWNER, TABLE_NAME)
+        primaries = self.iter_rows('primaries', OWNER, TABLE_NAME, name=TABLE_NAME)
+        keys = next(iter(primaries), (None, None))[1]
+        if not keys:
+            print("%s.%s : no primary key, skipped" % (OWNER, TABLE_NAME), file=sys.stderr)
+            return []
+        keys = keys.split(',')
+
+        with self.conn.cursor() as cur:
+            if column == 'ORA_ROWSCN':
+                condition = "ORA_ROWSCN > TO_NUMBER(:watermark)"
+                MARK, = self.fetch_rows(cur, 'current_scn', one=True)
+            else:
+                DATA_TYPE = next(( DATA_TYPE for COLUMN_ID, COLUMN_NAME, DATA_TYPE, *_ in self.get_column_rows(OWNER, TABLE_NAME) if COLUMN_NAME == column ), '')
+                DATA_TYPE = DATA_TYPE.split('(')[0]
+                if DATA_TYPE not in self.WATERMARKS:
+                    print("%s.%s : no NUMBER, DATE or TIMESTAMP column %s, skipped" % (OWNER, TABLE_NAME, column), file=sys.stderr)
+                    return []
+                mark, condition = self.WATERMARKS[DATA_TYPE]
+                condition = condition % ('"%s"' % column)
+                MARK, = self.fetch_rows(cur, 'delta_mark', query=self.TABLE_QUERIES['delta_mark'] % (mark % ('"%s"' % column), OWNER, TABLE_NAME), one=True)
+
+        previous = state.get(OWNER, TABLE_NAME)
+        if previous is None or previous[0] != column:
+            state.put(OWNER, TABLE_NAME, column, MARK)
+            print("%s.%s : %s watermark %s saved" % (OWNER, TABLE_NAME, column, MARK), file=sys.stderr)
+            return []
+        where, binds = (condition, { 'watermark': previous[1] }) if previous[1] is not None else ("1 = 1", {})
+
+        statements = []
+        if target is not None:
+            self.load_table(table_row, target, options, (where, binds), keys)
+        else:
+            loads = self.unload_table(table_row, output_dir, options, (".delta", where, binds))
+            names = [ name.lower() for _, name, _, _ in self.get_unl_columns(OWNER, TABLE_NAME) ]
+            table = '"%s".%s' % (OWNER.lower(), TABLE_NAME.lower())
+            temp = "delta_%s" % TABLE_NAME.lower()
+            updates = [ name for name in names if name.upper() not in keys ]
+            statements.append("SELECT %s FROM %s WHERE 1 = 0 INTO TEMP %s WITH NO LOG;\n" % (", ".join(names), table, temp))
+            statements += [ load.replace(" INSERT INTO %s (" % table, " INSERT INTO %s (" % temp) for load in loads ]
+            statements.append("MERGE INTO %s t USING %s d ON %s%s WHEN NOT MATCHED THEN INSERT (%s) VALUES (%s);\n" %
+                              (table, temp, " AND ".join( "t.%s = d.%s" % (key.lower(), key.lower()) for key in keys ),
+                               " WHEN MATCHED THEN UPDATE SET %s" % ", ".join( "t.%s = d.%s" % (name, name) for name in updates ) if updates else '',
+                               ", ".join(names), ", ".join( "d.%s" % name for name in names )))
+            statements.append("DROP TABLE %s;\n" % temp)
+        state.put(OWNER, TABLE_NAME, column, MARK)
+        return statements
+
+    def delta_user_data(self, owner, state, output_dir, target, options):
+        """ delta_table of every table of owner. Without target the files of the run go to a new delta_YYYYmmdd_HHMMSS
+            directory of output_dir with upsert.sql merging them in table order, returns that directory """
         owner = owner.upper()
-        sequence_string = self.get_sequences(owner)
-        print(sequence_string)
-        print("\n")
-        synonym_string = self.get_synonyms(owner) 
-        print("\n")
-        print(synonym_string)
-        print("\n")
-        procedure_string = self.get_procedures(owner) 
-        print(procedure_string)
-        print("\n")
-        view_string = self.get_views(owner) 
-        print(view_string)
-        print("\n")
-        trigger_string = self.get_tiggers(owner) 
-        print(trigger_string)
-        print("\n")
-        print('-------------------------------------')
+        run_dir = None
+        if target is None:
+            run_dir = os.path.join(output_dir, time.strftime('delta_%Y%m%d_%H%M%S'))
+            os.makedirs(run_dir, exist_ok=True)
+        upserts = list(self.map_tables(self.delta_table, self.user_tables(owner), state, run_dir, target, options))
+        if target is None:
+            with open(os.path.join(run_dir, 'upsert.sql'), 'w', encoding='utf-8') as upsert_file:
+                for statements in upserts:
+                    upsert_file.writelines(statements)
+        return run_dir
+
+    def profile_table(self, table_row, options):
+        """ Sample one get_tables row ( SAMPLE BLOCK of options['sample'] percent, options['budget'] seconds at most )
+            and keep the max lengths of its VARCHAR2 columns and the ranges of its NUMBER columns
+            without precision or above 18 digits in self.profiles.
+            A sample without rows is read again in full, a query over the budget leaves the declared types """
+        import oracledb
+
+        OWNER, TABLE_NAME, *_ = table_row
+        columns = [ (COLUMN_NAME, DATA_TYPE) for COLUMN_ID, COLUMN_NAME, DATA_TYPE, DATA_LENGTH, DATA_PRECISION, DATA_SCALE, *_ in self.get_column_rows(OWNER, TABLE_NAME)
+                    if DATA_TYPE in ('VARCHAR', 'VARCHAR2', 'NVARCHAR2')
+                       or DATA_TYPE == 'NUMBER' and (DATA_PRECISION is None or DATA_PRECISION > 18) ]
+        if not columns:
+            return None
+        expressions = []
+        for COLUMN_NAME, DATA_TYPE in columns:
+            column = '"%s"' % COLUMN_NAME
+            if DATA_TYPE == 'NUMBER':
+                expressions += [ "MIN(%s)" % column, "MAX(%s)" % column,
+                                 "MAX(CASE WHEN %s <> TRUNC(%s) THEN LENGTH(TO_CHAR(ABS(%s - TRUNC(%s)), 'TM9')) - 1 ELSE 0 END)" % ((column,) * 4) ]
+            else:
+                expressions += [ "MAX(LENGTHB(%s))" % column, "MAX(LENGTH(%s))" % column ]
+        query = 'SELECT COUNT(*), %s FROM "%s"."%s"' % (", ".join(expressions), OWNER, TABLE_NAME)
+
+        started = time.time()
+        call_timeout = self.conn.call_timeout
+        self.conn.call_timeout = int(options['budget'] * 1000)
+        try:
+            with self.conn.cursor() as cur:
+                sample = options['sample'] < 100
+                cur.execute(query + (" SAMPLE BLOCK (%s)" % options['sample'] if sample else ''))
+                row = cur.fetchone()
+                if sample and row[0] == 0:
+                    sample = False
+                    cur.execute(query)
+                    row = cur.fetchone()
+        except oracledb.Error as error:
+            sys.stderr.write("%s.%s : not profiled, %s\n" % (OWNER, TABLE_NAME, str(error).splitlines()[0]))
+            return None
+        finally:
+            self.conn.call_timeout = call_timeout
+
+        profile = {}
+        values = iter(row[1:])
+        for COLUMN_NAME, DATA_TYPE in columns:
+            if DATA_TYPE == 'NUMBER':
+                profile[COLUMN_NAME] = { 'min_value': next(values), 'max_value': next(values), 'fraction_digits': next(values) }
+            else:
+                profile[COLUMN_NAME] = { 'max_bytes': next(values), 'max_chars': next(values) }
+        self.profiles[(OWNER.upper(), TABLE_NAME.upper())] = profile
+        sys.stderr.write("%s.%s : %d rows profiled (%s), %.1fs\n" % (OWNER, TABLE_NAME, row[0], "%s%% sample" % options['sample'] if sample else 'full',
+                         time.time() - started))
+        return profile
+
+    def profile_user_data(self, owner, options):
+        """ profile_table of every table of owner, in parallel on the session pool with --workers.
+            The DDL of get_columns uses the profiles afterwards ( see cnv_profiled_type ) """
+        self.profile_options = options
+        with self.metrics.phase('profile'):
+            for profile in self.map_tables(self.profile_table, self.user_tables(owner), options):
+                pass
+
+    def make_users_schema(self, owners, output_dir, cache=None, post_load=None):
+        """ make_owner_schema of every owner, each owner into output_dir/<owner>.
+            With --workers up to workers owners at the same time, each one on its own session of the pool
+            ( pooled_call, its tables are rendered one after the other ), else one owner after the other on self.conn.
+            The owners should be prefetched together so cross owner references are read from the catalogs """
+        if self.pool is None:
+            for owner in owners:
+                self.make_owner_schema(owner, output_dir, cache, post_load)
+            return
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(owners))) as executor:
+            list(executor.map(lambda owner: self.pooled_call('make_owner_schema', owner, output_dir, cache, post_load), owners))
+
+    def make_owner_schema(self, owner, output_dir, cache=None, post_load=None):
+        """ make_user_schema of owner into output_dir/<owner>,
+            post_load are the Post_Load_Writer arguments, its output_dir also gets an <owner> directory """
+        with Ddl_Writer(os.path.join(output_dir, owner.lower()), self.schema_offsets(owner)) as writer:
+            if post_load is None:
+                self.make_user_schema(owner, writer, cache)
+                return
+            with Post_Load_Writer(**dict(post_load, output_dir=os.path.join(post_load['output_dir'], owner.lower()))) as post_load_writer:
+                self.make_user_schema(owner, writer, cache, post_load_writer)
 
 def main(argv, args):
     """main"""
     oracle = Oracle_Source()
-    oracle.connect()
+    oracle.extent_advisor = Extent_Advisor(args['extent_growth'], args['next_extent_ratio'], args['page_size'])
+    oracle.fragment_planner = Fragment_Planner(args['dbspaces'].split(',') if args['dbspaces'] else None, args['fragments'],
+                                               args['fragment_sample'], args['fragment_parallel'])
+    oracle.stmtcachesize = args['stmtcachesize']
+    oracle.metrics = Run_Metrics(args['metrics_slowest'])
+    if args['journal']:
+        if args['output_dir'] is None:
+            print("--journal needs --output-dir DIR")
+            sys.exit(-1)
+        oracle.journal = Run_Journal(args['journal'])
+    for item in (args['fetch_sizes'] or '').split(','):
+        if item:
+            fetch, sizes = item.split('=')
+            arraysize, _, prefetchrows = sizes.partition(':')
+            oracle.fetch_sizes[fetch.strip()] = (int(arraysize), int(prefetchrows or arraysize))
     owner=args['u']
+    command=args['command']
+
+    if command == 'extract':
+        if args['snapshot'] is None:
+            print("extract needs --snapshot FILE")
+            sys.exit(-1)
+        oracle.connect()
+        oracle.extract_snapshot(oracle.resolve_owners(owner), args['snapshot'])
+        return
+
+    if args['tables']:
+        oracle.only_tables = set( table.strip().upper() for table in args['tables'].split(',') )
+
+    if command == 'plan':
+        if args['output_dir'] is None:
+            print("plan needs --output-dir DIR")
+            sys.exit(-1)
+        if args['snapshot'] is not None:
+            catalogs = oracle.load_snapshot(args['snapshot'])
+            owners = list(catalogs) if owner is None else oracle.resolve_owners(owner)
+        else:
+            oracle.connect()
+            owners = oracle.resolve_owners(owner)
+            oracle.prefetch_catalog(owners, optional=False)
+        for owner in owners:
+            oracle.make_load_plan(owner, args['output_dir'] if len(owners) == 1 else os.path.join(args['output_dir'], owner.lower()))
+        return
+
+    if command in ('unload', 'verify'):
+        if args['output_dir'] is None:
+            print("%s needs --output-dir DIR" % command)
+            sys.exit(-1)
+        oracle.connect(args['workers'], args['lob_readers'])
+        owners = oracle.resolve_owners(owner)
+        options = { 'delimiter': args['unl_delimiter'], 'escape': args['unl_escape'],
+                    'max_bytes': args['unl_max_bytes'], 'arraysize': args['arraysize'],
+                    'lob_inline': args['lob_inline'], 'lob_readers': args['lob_readers'], 'lob_chunk': args['lob_chunk'] }
+        if command == 'verify':
+            options.update(chunk_rows=args['verify_chunk_rows'], sample=args['verify_sample'],
+                           processes=args['verify_processes'], reextract=args['reextract'])
+            mismatched = sum( oracle.verify_user_data(owner, args['output_dir'] if len(owners) == 1 else os.path.join(args['output_dir'], owner.lower()), options)
+                              for owner in owners )
+            if mismatched:
+                print("%d chunks do not match" % mismatched, file=sys.stderr)
+                sys.exit(1)
+            return
+        for owner in owners:
+            oracle.unload_user_data(owner, args['output_dir'] if len(owners) == 1 else os.path.join(args['output_dir'], owner.lower()), options)
+        if oracle.journal is not None:
+            oracle.journal.close()
+        return
+
+    if command == 'delta':
+        if args['delta_state'] is None or (args['output_dir'] is None) == (args['target'] is None):
+            print("delta needs --delta-state FILE and either --output-dir DIR or --target MODULE:DSN")
+            sys.exit(-1)
+        for item in (args['delta_columns'] or '').split(','):
+            if item:
+                table, column = item.split('=')
+                owner_name, _, table = table.strip().upper().rpartition('.')
+                oracle.delta_columns[(owner_name or None, table)] = column.strip().upper()
+        target = Load_Target(args['target'], args['target_table']) if args['target'] else None
+        oracle.connect(args['workers'], args['lob_readers'] if target is None else 0)
+        owners = oracle.resolve_owners(owner)
+        options = { 'delimiter': args['unl_delimiter'], 'escape': args['unl_escape'],
+                    'max_bytes': args['unl_max_bytes'], 'arraysize': args['arraysize'],
+                    'lob_inline': args['lob_inline'], 'lob_readers': args['lob_readers'], 'lob_chunk': args['lob_chunk'],
+                    'batch_size': args['batch_size'], 'commit_rows': args['commit_rows'], 'queue_size': args['queue_size'] }
+        with Delta_State(args['delta_state']) as state:
+            for owner in owners:
+                output_dir = args['output_dir']
+                if output_dir is not None and len(owners) > 1:
+                    output_dir = os.path.join(output_dir, owner.lower())
+                run_dir = oracle.delta_user_data(owner, state, output_dir, target, options)
+                if run_dir is not None:
+                    print("%s : delta written to %s" % (owner, run_dir), file=sys.stderr)
+        return
+
+    if command == 'load':
+        if args['target'] is None:
+            print("load needs --target MODULE:DSN")
+            sys.exit(-1)
+        target = Load_Target(args['target'], args['target_table'])
+        oracle.connect(args['workers'])
+        options = { 'batch_size': args['batch_size'], 'commit_rows': args['commit_rows'], 'queue_size': args['queue_size'] }
+        for owner in oracle.resolve_owners(owner):
+            oracle.load_user_data(owner, target, options)
+        return
+
+    if command == 'convert':
+        if args['snapshot'] is None:
+            print("convert needs --snapshot FILE")
+            sys.exit(-1)
+        if args['profile_data']:
+            print("--profile-data samples the tables in the database, convert has no connection")
+            sys.exit(-1)
+        catalogs = oracle.load_snapshot(args['snapshot'])
+        owners = list(catalogs) if owner is None else oracle.resolve_owners(owner)
+    elif args['async']:
+        if args['profile_data']:
+            oracle.connect(args['workers'])
+        elif '%' in owner:
+            oracle.connect()
+        owners = oracle.resolve_owners(owner)
+        with oracle.metrics.phase('prefetch'):
+            asyncio.run(oracle.prefetch_catalog_async(owners, args['concurrency'], optional=args['post_load_dir'] is not None))
+    else:
+        oracle.connect(args['workers'])
+        owners = oracle.resolve_owners(owner)
+        if args['prefetch'] or len(owners) > 1:
+            oracle.prefetch_catalog(owners, optional=args['post_load_dir'] is not None)
+    if command != 'convert' and args['profile_data']:
+        options = { 'sample': args['sample_percent'], 'budget': args['profile_budget'],
+                    'headroom': args['profile_headroom'], 'min_varchar': args['profile_min_varchar'] }
+        for owner in owners:
+            oracle.profile_user_data(owner, options)
+
+    if not owners:
+        print("No user found for %s" % owner)
+        sys.exit(-1)
+    if len(owners) > 1 and args['output_dir'] is None:
+        print("%d users found, --output-dir is needed to convert them" % len(owners))
+        sys.exit(-1)
 
-    res=oracle.make_user_schema(owner)
+    cache = Ddl_Cache(args['ddl_cache']) if args['ddl_cache'] else None
+    post_load = None
+    if args['post_load_dir']:
+        post_load = { 'output_dir': args['post_load_dir'], 'sessions': args['post_load_sessions'],
+                      'pdqpriority': args['pdqpriority'], 'per_dbspace': args['post_load_per_dbspace'] }
+    if len(owners) > 1:
+        oracle.make_users_schema(owners, args['output_dir'], cache, post_load)
+    elif post_load is None:
+        with Ddl_Writer(args['output_dir'], oracle.schema_offsets(owners[0])) as writer:
+            oracle.make_user_schema(owners[0], writer, cache)
+    else:
+        with Ddl_Writer(args['output_dir'], oracle.schema_offsets(owners[0])) as writer, Post_Load_Writer(**post_load) as post_load_writer:
+            oracle.make_user_schema(owners[0], writer, cache, post_load_writer)
+    if cache is not None:
+        cache.close()
+    if oracle.journal is not None:
+        oracle.journal.close()
+    if args['metrics']:
+        prom_file = oracle.metrics.write(args['metrics'])
+        sys.stderr.write(oracle.metrics.summary())
+        print("metrics written to %s and %s" % (args['metrics'], prom_file), file=sys.stderr)
        
         
 if '--version' in sys.argv:
 	print(__version__)
 elif __name__ == '__main__':
     parser = argparse.ArgumentParser()
-    parser.add_argument('-u', help=' : Please set the user name')
+    parser.add_argument('command', nargs='?', default='schema', choices=['schema','extract','convert','unload','load','plan','verify','delta'],
+                        help=' : schema (default) converts from the database, extract saves a snapshot, convert reads it, unload writes UNL data files, load inserts the data into --target, plan writes the foreign key load waves, verify compares the unloaded data with Oracle, delta extracts the rows changed since the last run')
+    parser.add_argument('-u', help=' : Please set the user name, a comma separated list or a LIKE pattern ( APP_%% )')
+    parser.add_argument('--tables', help=' : Comma separated tables of the user for unload, load and plan, all tables by default')
+    parser.add_argument('--workers', type=int, default=1, help=' : Number of sessions converting tables in parallel')
+    parser.add_argument('--async', action='store_true', help=' : Issue the catalog queries concurrently with the oracledb async API')
+    parser.add_argument('--concurrency', type=int, default=32, help=' : Catalog queries in flight with --async')
+    parser.add_argument('--output-dir', help=' : Write one DDL file per object type into this directory instead of stdout')
+    parser.add_argument('--ddl-cache', help=' : sqlite file of rendered DDL, only objects changed since the last run are converted')
+    parser.add_argument('--journal', help=' : Progress file of schema/convert and unload, a run restarted with it skips the tables and phases already done')
+    parser.add_argument('--snapshot', help=' : Catalog snapshot file (gzip JSON-lines) for extract/convert')
+    parser.add_argument('--prefetch', action='store_true', help=' : Read the dictionary of the user in bulk before converting')
+    parser.add_argument('--extent-growth', type=float, default=0.2, help=' : Growth allowance of the first extent over the projected table size')
+    parser.add_argument('--next-extent-ratio', type=float, default=0.1, help=' : Next extent size as a part of the first extent')
+    parser.add_argument('--page-size', type=int, default=2, choices=Extent_Advisor.PAGE_SIZES, help=' : Default Informix page size (KB), larger ones are recommended per table')
+    parser.add_argument('--post-load-dir', help=' : Write indexes and constraints as parallel post-load batches into this directory')
+    parser.add_argument('--post-load-sessions', type=int, default=4, help=' : Sessions of a post-load batch')
+    parser.add_argument('--post-load-per-dbspace', type=int, default=1, help=' : Indexes built at the same time in one dbspace')
+    parser.add_argument('--pdqpriority', type=int, default=50, help=' : PDQPRIORITY of the post-load sessions')
+    parser.add_argument('--dbspaces', help=' : Comma separated dbspaces of the fragments planned for HASH and RANGE partitioned tables')
+    parser.add_argument('--fragments', type=int, help=' : Number of planned fragments, the number of --dbspaces or Oracle partitions by default')
+    parser.add_argument('--fragment-sample', type=float, default=1, help=' : SAMPLE BLOCK percent read for a partition key without histogram')
+    parser.add_argument('--fragment-parallel', type=int, default=4, help=' : PARALLEL degree of the partition key sample')
+    parser.add_argument('--profile-data', action='store_true', help=' : Size VARCHAR2 and NUMBER columns without precision from a sample of the data')
+    parser.add_argument('--sample-percent', type=float, default=1, help=' : SAMPLE BLOCK percent of --profile-data, 100 reads every row')
+    parser.add_argument('--profile-budget', type=float, default=30, help=' : Seconds a table may be sampled by --profile-data')
+    parser.add_argument('--profile-headroom', type=float, default=1.25, help=' : Factor applied to the sampled max length of a column')
+    parser.add_argument('--profile-min-varchar', type=int, default=10, help=' : Smallest varchar size chosen by --profile-data')
+    parser.add_argument('--metrics', help=' : Write query, table and phase timings of schema/convert to this JSON file and a .prom Prometheus textfile beside it')
+    parser.add_argument('--metrics-slowest', type=int, default=20, help=' : Slowest tables listed by --metrics')
+    parser.add_argument('--stmtcachesize', type=int, default=Oracle_Source.STMT_CACHE_SIZE, help=' : Statements cached per Oracle session')
+    parser.add_argument('--fetch-sizes', help=' : arraysize[:prefetchrows] of the dictionary query classes, e.g. single=1:2,table=100,bulk=10000')
+    parser.add_argument('--unl-delimiter', default='|', help=' : Field delimiter of the UNL files (default |)')
+    parser.add_argument('--unl-escape', default='\\', help=' : Escape character of the UNL files (default \\)')
+    parser.add_argument('--unl-max-bytes', type=int, help=' : Start a new UNL file of the table after this many bytes')
+    parser.add_argument('--arraysize', type=int, default=10000, help=' : Rows fetched per round trip by unload')
+    parser.add_argument('--lob-inline', type=int, default=8192, help=' : CLOB/BLOB up to this length are fetched with the row by unload')
+    parser.add_argument('--lob-readers', type=int, default=4, help=' : Sessions reading the larger LOBs into side files in parallel')
+    parser.add_argument('--lob-chunk', type=int, default=1024 * 1024, help=' : Bytes ( characters for CLOB ) read by one LOB read call')
+    parser.add_argument('--verify-chunk-rows', type=int, default=1000000, help=' : Rows of a verify chunk, larger tables are split by primary key ranges')
+    parser.add_argument('--verify-sample', type=float, default=1, help=' : SAMPLE BLOCK percent read for the verify chunk bounds')
+    parser.add_argument('--verify-processes', type=int, default=os.cpu_count(), help=' : Processes reading the UNL files in verify')
+    parser.add_argument('--reextract', action='store_true', help=' : Unload the mismatched verify chunks again and write reload.sql')
+    parser.add_argument('--delta-state', help=' : sqlite file of the watermarks of delta, the first run of a table only saves its watermark')
+    parser.add_argument('--delta-columns', help=' : Comma separated [OWNER.]TABLE=COLUMN last-modified columns of delta, ORA_ROWSCN by default')
+    parser.add_argument('--target', help=' : DB-API module and dsn load and delta insert into, e.g. sqlite3:stage.db or IfxPyDbi:<connection string>')
+    parser.add_argument('--target-table', default='"%(owner)s".%(table)s', help=' : Target table name with %%(owner)s and %%(table)s')
+    parser.add_argument('--batch-size', type=int, default=1000, help=' : Rows fetched and inserted by one executemany in load')
+    parser.add_argument('--commit-rows', type=int, default=10000, help=' : Commit the target after this many rows in load')
+    parser.add_argument('--queue-size', type=int, default=4, help=' : Batches waiting between the fetch and insert threads in load')
     args = vars(parser.parse_args())
     argv = sys.argv
     main(argv,args)